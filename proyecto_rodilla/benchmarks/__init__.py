@@ -0,0 +1,7 @@
+"""
+Benchmarks de rendimiento.
+
+Ejecutar desde ``proyecto_rodilla``, por ejemplo::
+
+    python -m benchmarks.bench_orientation
+"""
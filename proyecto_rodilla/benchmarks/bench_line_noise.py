@@ -0,0 +1,77 @@
+"""Costo de CPU y atenuación de red: notch IIR frente al cancelador LMS."""
+import time
+
+import numpy as np
+from scipy import signal
+
+from config import settings as cfg
+from core.line_noise import LineNoiseCanceller
+
+
+def _synthetic_emg(n: int, fs: float, mains: float):
+    """Ruido tipo EMG (20-450 Hz) más red desplazada 0.4 Hz con dos armónicos."""
+    rng = np.random.default_rng(0)
+    t = np.arange(n) / fs
+    sos = signal.butter(4, [20.0, min(450.0, 0.45 * fs)], btype="bandpass", fs=fs, output="sos")
+    emg = signal.sosfilt(sos, rng.normal(0.0, 1.0, n))
+    freq = mains + 0.4
+    hum = (2.0 * np.sin(2 * np.pi * freq * t + 0.3)
+           + 0.8 * np.sin(2 * np.pi * 2 * freq * t + 1.1)
+           + 0.4 * np.sin(2 * np.pi * 3 * freq * t + 2.0))
+    return emg, emg + hum
+
+
+def _residual_db(clean: np.ndarray, output: np.ndarray, fs: float) -> float:
+    """Potencia residual del error respecto al EMG limpio, tras el transitorio."""
+    skip = int(fs)
+    error = output[skip:] - clean[skip:]
+    return 10.0 * np.log10(np.mean(error ** 2) / np.mean(clean[skip:] ** 2))
+
+
+def _notch(samples: np.ndarray, fs: float):
+    b, a = signal.iirnotch(cfg.EMG_NOTCH_FREQ, cfg.EMG_NOTCH_Q, fs)
+    zi = signal.lfilter_zi(b, a) * 0.0
+    values = samples.tolist()
+    out = np.empty(len(values))
+    start = time.perf_counter()
+    for i, value in enumerate(values):
+        y, zi = signal.lfilter(b, a, [value], zi=zi)
+        out[i] = y[0]
+    return time.perf_counter() - start, out
+
+
+def _lms_per_sample(samples: np.ndarray, fs: float):
+    canceller = LineNoiseCanceller(fs=fs)
+    values = samples.tolist()
+    out = np.empty(len(values))
+    start = time.perf_counter()
+    for i, value in enumerate(values):
+        out[i] = canceller.process_sample(value)
+    return time.perf_counter() - start, out
+
+
+def _lms_block(samples: np.ndarray, fs: float, block: int):
+    canceller = LineNoiseCanceller(fs=fs)
+    out = np.empty_like(samples)
+    start = time.perf_counter()
+    for i in range(0, samples.size, block):
+        out[i:i + block] = canceller.process_block(samples[i:i + block])
+    return time.perf_counter() - start, out
+
+
+def main(seconds: float = 20.0, block: int = 100) -> None:
+    fs = float(cfg.EMG_FS)
+    n = int(seconds * fs)
+    clean, noisy = _synthetic_emg(n, fs, cfg.EMG_NOTCH_FREQ)
+    print(f"{n} muestras por canal ({seconds:.0f} s a {fs:.0f} Hz), bloque de {block}")
+    print(f"{'método':<22}{'µs/muestra':>12}{'error (dB)':>12}")
+    for label, (elapsed, out) in (
+        ("iirnotch", _notch(noisy, fs)),
+        ("LMS por muestra", _lms_per_sample(noisy, fs)),
+        ("LMS por bloque", _lms_block(noisy, fs, block)),
+    ):
+        print(f"{label:<22}{elapsed / n * 1e6:>12.2f}{_residual_db(clean, out, fs):>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
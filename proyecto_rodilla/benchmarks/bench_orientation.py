@@ -0,0 +1,56 @@
+"""Costo de CPU por muestra de los backends de orientación."""
+import time
+
+import numpy as np
+
+from config import settings as cfg
+from core.signal_processing import AngleCalculator
+
+
+def _synthetic_imu(n: int, fs: float):
+    """Flexo-extensión de 0.5 Hz con sesgo de giroscopio y ruido."""
+    rng = np.random.default_rng(0)
+    t = np.arange(n) / fs
+    theta = np.radians(45.0 + 40.0 * np.sin(2 * np.pi * 0.5 * t))
+    rate = np.degrees(np.gradient(theta, t))
+    ax = rng.normal(0.0, 0.01, n)
+    ay = np.cos(theta) + rng.normal(0.0, 0.01, n)
+    az = -np.sin(theta) + rng.normal(0.0, 0.01, n)
+    gx = -rate + 1.5 + rng.normal(0.0, 0.3, n)
+    zeros = np.zeros(n)
+    timestamps = (t * 1e6).astype(np.uint64)
+    return ax, ay, az, gx, zeros, zeros, timestamps
+
+
+def _per_sample(backend: str, data) -> float:
+    calc = AngleCalculator(backend=backend)
+    ax, ay, az, gx, gy, gz, ts = (arr.tolist() for arr in data)
+    start = time.perf_counter()
+    for i in range(len(ts)):
+        calc.update(ax[i], ay[i], az[i], gx[i], gy[i], gz[i], ts[i])
+    return time.perf_counter() - start
+
+
+def _block(backend: str, data, block: int) -> float:
+    calc = AngleCalculator(backend=backend)
+    n = len(data[0])
+    start = time.perf_counter()
+    for i in range(0, n, block):
+        calc.update_block(*(arr[i:i + block] for arr in data))
+    return time.perf_counter() - start
+
+
+def main(seconds: float = 120.0, block: int = 50) -> None:
+    fs = float(cfg.IMU_FS)
+    n = int(seconds * fs)
+    data = _synthetic_imu(n, fs)
+    print(f"{n} muestras IMU ({seconds:.0f} s a {fs:.0f} Hz), bloque de {block}")
+    print(f"{'backend':<15}{'µs/muestra':>14}{'µs/muestra (bloque)':>22}")
+    for backend in ("complementary", "kalman", "mahony"):
+        single = _per_sample(backend, data) / n * 1e6
+        batched = _block(backend, data, block) / n * 1e6
+        print(f"{backend:<15}{single:>14.2f}{batched:>22.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Costo de preparar los datos de un refresco de gráficas según la longitud del buffer."""
+import time
+
+import numpy as np
+
+from config import settings as cfg
+from core.ring_buffer import RingBuffer
+
+
+def _legacy_refresh(times, values, idx, x_min, x_max):
+    """Camino anterior: np.roll de cada arreglo y máscaras booleanas."""
+    t_data = np.roll(times, -idx)
+    out = []
+    for series in values:
+        rolled = np.roll(series, -idx)
+        mask = (t_data >= x_min) & (t_data <= x_max) & (t_data > 0)
+        out.append((t_data[mask], rolled[mask]))
+    return out
+
+
+def _ring_refresh(ring, x_min, x_max):
+    window = ring.window(x_min, x_max)
+    return [(window[0], window[row]) for row in range(1, window.shape[0])]
+
+
+def _time_per_call(func, repeats):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        func()
+    return (time.perf_counter() - start) / repeats
+
+
+def main(window_seconds=(5.0, 10.0, 30.0, 60.0, 120.0), repeats: int = 200) -> None:
+    fs = float(cfg.EMG_FS)
+    print(f"EMG a {fs:.0f} Hz, 4 series por refresco (filtrada y RMS de 2 canales)")
+    print(f"{'ventana (s)':>12}{'muestras':>10}{'np.roll (ms)':>15}{'RingBuffer (ms)':>18}")
+    for seconds in window_seconds:
+        n = int(fs * seconds)
+        rng = np.random.default_rng(0)
+        times = np.arange(n) / fs + 1.0
+        values = [rng.normal(size=n) for _ in range(4)]
+        idx = n // 3
+        legacy_times = np.roll(times, idx)
+        legacy_values = [np.roll(v, idx) for v in values]
+
+        ring = RingBuffer(n, ("time", "a", "b", "c", "d"))
+        ring.extend(np.vstack([times] + values))
+
+        x_max = times[-1]
+        x_min = x_max - seconds
+        legacy = _time_per_call(lambda: _legacy_refresh(legacy_times, legacy_values, idx, x_min, x_max), repeats)
+        mirrored = _time_per_call(lambda: _ring_refresh(ring, x_min, x_max), repeats)
+        print(f"{seconds:>12.0f}{n:>10}{legacy * 1e3:>15.3f}{mirrored * 1e3:>18.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Memoria del grabador para una sesión de 60 minutos: tuplas de Python frente a columnas tipadas."""
+import shutil
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+from config import settings as cfg
+from core.session_recorder import SessionRecorder
+
+
+def _batches(seconds: float, batch: int = 16):
+    """Lotes EMG sintéticos como los que entrega el motor de adquisición."""
+    fs = float(cfg.EMG_FS)
+    total = int(fs * seconds)
+    rng = np.random.default_rng(0)
+    template = rng.normal(scale=1e-3, size=(6, batch))
+    for start in range(0, total, batch):
+        n = min(batch, total - start)
+        index = np.arange(start, start + n)
+        timestamps = (index * (1e6 / fs)).astype(np.int64)
+        yield timestamps, index % 65536, template[0:2, :n], template[2:4, :n], np.abs(template[4:6, :n])
+
+
+def _legacy_bytes(seconds: float) -> int:
+    """Camino anterior: una tupla de 8 valores de Python por muestra (medido con tracemalloc)."""
+    records = []
+    tracemalloc.start()
+    for timestamps, sequence, raw, filtered, rms in _batches(seconds):
+        records.extend(zip(
+            timestamps.tolist(), sequence.tolist(), raw[0].tolist(), raw[1].tolist(),
+            filtered[0].tolist(), filtered[1].tolist(), rms[0].tolist(), rms[1].tolist(),
+        ))
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current
+
+
+def main(minutes: float = 60.0, legacy_seconds: float = 60.0) -> None:
+    seconds = minutes * 60
+    samples = int(cfg.EMG_FS * seconds)
+    print(f"Sesión de {minutes:.0f} min a {cfg.EMG_FS:.0f} Hz: {samples:,} muestras EMG")
+
+    legacy = _legacy_bytes(legacy_seconds) * seconds / legacy_seconds
+    print(f"Lista de tuplas (extrapolado de {legacy_seconds:.0f} s): {legacy / 2**20:10.1f} MB")
+
+    base_dir = Path(tempfile.mkdtemp())
+    try:
+        recorder = SessionRecorder("bench", 1, "bench_session", base_dir=base_dir)
+        started = time.perf_counter()
+        for timestamps, sequence, raw, filtered, rms in _batches(seconds):
+            recorder.record_emg_block(timestamps, sequence, raw, filtered, rms)
+        ingest = time.perf_counter() - started
+        print(f"Columnas tipadas (reservado):          {recorder.memory_bytes / 2**20:10.1f} MB"
+              f"  ({ingest / samples * 1e9:.0f} ns/muestra)")
+
+        tracemalloc.start()
+        started = time.perf_counter()
+        recorder._write_raw_data_h5()
+        write = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"Pico adicional al escribir raw_data:   {peak / 2**20:10.1f} MB  ({write:.1f} s)")
+    finally:
+        shutil.rmtree(base_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
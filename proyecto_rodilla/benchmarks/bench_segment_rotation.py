@@ -0,0 +1,72 @@
+"""Rotación de segmentos con el orden de llamadas de la ventana de grabación (EMG, luego IMU y derivadas)."""
+import math
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from config import settings as cfg
+from core.session_recorder import SessionRecorder
+from utils import load_json
+
+
+def _batches(seconds: float, batch_sec: float = 0.01, imu_lag_us: int = 3000):
+    """Lotes de ``batch_sec`` como los de ``_on_batch_received``: la IMU llega algo más antigua que el EMG."""
+    emg_period = 1e6 / float(cfg.EMG_FS)
+    imu_period = 1e6 / float(cfg.IMU_FS)
+    emg_index = imu_index = 0
+    for k in range(int(seconds / batch_sec)):
+        end_us = (k + 1) * batch_sec * 1e6
+        emg_stop = int(end_us / emg_period)
+        imu_stop = int((end_us - imu_lag_us) / imu_period)
+        emg = np.arange(emg_index, emg_stop)
+        imu = np.arange(imu_index, max(imu_index, imu_stop))
+        emg_index, imu_index = emg_stop, imu_index + len(imu)
+        yield k * batch_sec, (emg * emg_period).astype(np.int64), emg, (imu * imu_period).astype(np.int64), imu
+
+
+def main(minutes: float = 2.0, segment_minutes: float = 0.5) -> None:
+    seconds = minutes * 60
+    flush_sec = float(cfg.RECORDING_FLUSH_SEC)
+    expected = math.ceil(minutes / segment_minutes)
+    print(f"Sesión de {minutes:g} min, segmentos de {segment_minutes:g} min, vaciado cada {flush_sec:g} s")
+
+    saved = cfg.SEGMENT_MINUTES
+    cfg.SEGMENT_MINUTES = segment_minutes
+    base_dir = Path(tempfile.mkdtemp())
+    try:
+        recorder = SessionRecorder("bench", 1, "bench_session", base_dir=base_dir)
+        recorder.start(emg_start_us=0)
+        last_flush = 0.0
+        started = time.perf_counter()
+        for now, emg_ts, emg_seq, imu_ts, imu_seq in _batches(seconds):
+            # Reloj simulado: el vaciado periódico sigue el tiempo de la sesión, no el de la CPU
+            if now - last_flush >= flush_sec:
+                recorder._last_flush = -math.inf
+                last_flush = now
+            zeros = np.zeros((2, len(emg_ts)))
+            recorder.record_emg_block(emg_ts, emg_seq % 65536, zeros, zeros, zeros)
+            if len(imu_ts):
+                recorder.record_imu_block(imu_ts, imu_seq % 65536, np.zeros((3, len(imu_ts))),
+                                          np.zeros((3, len(imu_ts))), np.zeros(len(imu_ts)))
+                recorder.record_derived_block(imu_ts, *np.zeros((3, len(imu_ts))), np.zeros(len(imu_ts), dtype=np.int8))
+        recorder.finalize({}, {}, "")
+        elapsed = time.perf_counter() - started
+
+        manifest = load_json(str(recorder.session_dir / "segments.json"))
+        segments = manifest["segments"]
+        for segment in segments:
+            spans = {stream: (info["end_us"] - info["start_us"]) / 1e6 for stream, info in segment["streams"].items()}
+            print(f"  {segment['file']}: " + ", ".join(f"{stream} {span:5.1f} s" for stream, span in spans.items()))
+        print(f"{len(segments)} segmentos (esperados {expected}) en {elapsed:.1f} s")
+        if len(segments) != expected:
+            raise SystemExit(f"Rotación incorrecta: {len(segments)} segmentos en lugar de {expected}")
+    finally:
+        cfg.SEGMENT_MINUTES = saved
+        shutil.rmtree(base_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
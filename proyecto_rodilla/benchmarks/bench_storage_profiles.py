@@ -0,0 +1,96 @@
+"""Tamaño y velocidad de escritura/lectura de raw_data.h5 por perfil de almacenamiento (floats y cuentas crudas)."""
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+import h5py
+import numpy as np
+from scipy import signal
+
+from config import settings as cfg
+from core.session_recorder import SessionRecorder
+from core.session_writer import STORAGE_PROFILES, StorageProfile
+
+
+def _fill(recorder: SessionRecorder, seconds: float) -> None:
+    """Sesión sintética: EMG cuantizado al paso del ADC con ráfagas, IMU con flexiones de 0.2 Hz."""
+    rng = np.random.default_rng(0)
+    fs = float(cfg.EMG_FS)
+    n = int(fs * seconds)
+    t = np.arange(n) / fs
+    envelope = 1.0 + 4.0 * (np.sin(2 * np.pi * 0.2 * t) > 0.5)
+    counts = np.round(rng.normal(0.0, 300.0, (2, n)) * envelope)
+    raw = counts / cfg.ADC_RESOLUTION * (cfg.VREF / cfg.PGA_GAIN)
+    sos = signal.butter(4, [20.0, 450.0], btype="bandpass", fs=fs, output="sos")
+    filtered = signal.sosfilt(sos, raw, axis=1)
+    window = int(fs * cfg.RMS_WINDOW_MS / 1000)
+    rms = np.sqrt(signal.lfilter(np.ones(window) / window, 1.0, filtered ** 2, axis=1))
+    timestamps = (np.arange(n) * (1e6 / fs)).astype(np.int64)
+    for start in range(0, n, 1 << 14):
+        stop = min(n, start + (1 << 14))
+        recorder.record_emg_block(timestamps[start:stop], np.arange(start, stop) % 65536,
+                                  raw[:, start:stop], filtered[:, start:stop], rms[:, start:stop],
+                                  counts[:, start:stop].astype(np.int32))
+
+    m = int(cfg.IMU_FS * seconds)
+    ti = np.arange(m) / cfg.IMU_FS
+    angle = 45.0 - 45.0 * np.cos(2 * np.pi * 0.2 * ti) + rng.normal(0.0, 0.3, m)
+    accel = np.vstack((np.sin(np.radians(angle)), np.zeros(m), np.cos(np.radians(angle)))) + rng.normal(0.0, 0.01, (3, m))
+    gyro = np.vstack((np.gradient(angle, 1.0 / cfg.IMU_FS), np.zeros(m), np.zeros(m))) + rng.normal(0.0, 0.5, (3, m))
+    recorder.record_imu_block((np.arange(m) * (1e6 / cfg.IMU_FS)).astype(np.int64), np.arange(m) % 65536,
+                              accel, gyro, angle)
+
+
+def _read_windows(path: Path, seconds: float, window_sec: float = 5.0, count: int = 200) -> float:
+    """Tiempo medio de leer una ventana aleatoria de ``window_sec`` de un canal EMG (ms)."""
+    rng = np.random.default_rng(1)
+    rows = int(cfg.EMG_FS * window_sec)
+    starts = rng.integers(0, int(cfg.EMG_FS * (seconds - window_sec)), count)
+    with h5py.File(path, "r") as h5:
+        dataset = h5["emg/ch0/filtered"]
+        started = time.perf_counter()
+        for start in starts:
+            dataset[start:start + rows]
+        return (time.perf_counter() - started) / count * 1e3
+
+
+def main(minutes: float = 10.0) -> None:
+    seconds = minutes * 60
+    print(f"Sesión sintética de {minutes:.0f} min ({int(cfg.EMG_FS * seconds):,} muestras EMG)")
+    print(f"{'perfil':>17} {'crudo':>7} {'MB':>8} {'ratio':>6} {'escritura':>10} {'lectura':>9} {'ventana 5 s':>12} {'error máx':>10}")
+    base_dir = Path(tempfile.mkdtemp())
+    # Referencia: el formato anterior (sin filtros) con los mismos bloques
+    profiles = [StorageProfile("sin compresión", chunk_sec=4.0)] + list(STORAGE_PROFILES.values())
+    reference = None
+    baseline_mb = None
+    try:
+        for i, (profile, raw_counts) in enumerate((p, c) for p in profiles for c in (False, True)):
+            recorder = SessionRecorder("bench", 1, f"profile_{i}", base_dir=base_dir, raw_counts=raw_counts)
+            recorder.profile = profile
+            _fill(recorder, seconds)
+            started = time.perf_counter()
+            path = recorder._write_raw_data_h5()
+            write = time.perf_counter() - started
+            size_mb = path.stat().st_size / 2**20
+
+            started = time.perf_counter()
+            with h5py.File(path, "r") as h5:
+                values = h5["emg/ch0/filtered"][()]
+                for group in ("emg/ch1", "imu/accel", "imu/gyro"):
+                    for name in h5[group]:
+                        h5[group][name][()]
+            read = time.perf_counter() - started
+            window_ms = _read_windows(path, seconds)
+
+            if reference is None:
+                reference, baseline_mb = values, size_mb
+            error = float(np.max(np.abs(values.astype(np.float64) - reference)))
+            print(f"{profile.name:>17} {'cuentas' if raw_counts else 'float':>7} {size_mb:8.1f} {baseline_mb / size_mb:6.2f} {write:9.2f}s {read:8.2f}s"
+                  f" {window_ms:10.2f}ms {error * 1e6:8.3f}µV")
+    finally:
+        shutil.rmtree(base_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
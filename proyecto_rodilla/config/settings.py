@@ -33,6 +33,7 @@ DEFAULT_SETTINGS: Dict[str, Any] = {
 	# Conexión serial
 	"SERIAL_BAUD": 921600,
 	"SERIAL_TIMEOUT": 1.0,
+	"SERIAL_BATCH_MS": 10,
 
 	# Protocolo de comunicación
 	"PREAMBLE": [0xA5, 0x5A],  # Se almacena como lista para facilitar serialización JSON
@@ -46,11 +47,20 @@ DEFAULT_SETTINGS: Dict[str, Any] = {
 	"EMG_LOWPASS_CUTOFF": 500.0,
 	"EMG_NOTCH_FREQ": 60.0,
 	"EMG_NOTCH_Q": 30.0,
+	"EMG_LINE_FILTER": "notch",
+	"EMG_LINE_HARMONICS": 3,
+	"EMG_LINE_MU": 0.005,
 	"RMS_WINDOW_MS": 100,
 
 	# Parámetros IMU
 	"IMU_FS": 50,
 	"COMPLEMENTARY_FILTER_ALPHA": 0.02,
+	"ORIENTATION_FILTER": "complementary",
+	"GYRO_BIAS_TRACKING": True,
+	"STILLNESS_GYRO_THRESHOLD": 5.0,
+	"REP_HYSTERESIS_DEG": 10.0,
+	"REP_MIN_DURATION_SEC": 0.5,
+	"DERIVED_CUTOFF_HZ": 6.0,
 	"CALIBRATION_POINTS": 2,
 	"AUTO_CALIB_CAMERA_INDEX": 3,
 	"AUTO_CALIB_FPS": 20,
@@ -68,6 +78,15 @@ DEFAULT_SETTINGS: Dict[str, Any] = {
 	# Visualización
 	"WINDOW_TIME_SEC": 5.0,
 	"UPDATE_FPS": 25,
+	"PLOT_RMS_DECIMATION": 4,
+	"METRICS_REFRESH_HZ": 10,
+	"ADAPTIVE_FRAME_RATE": True,
+	"PLOT_CPU_BUDGET": 0.35,
+	"DIAGNOSTICS_OVERLAY": False,
+	"HISTORY_DURATION_MIN": 60,
+	"HISTORY_FULL_RES_SEC": 10,
+	"SPECTROGRAM_PANEL": False,
+	"SPECTROGRAM_NFFT": 256,
 	"COLOR_CH0": [31, 119, 180], 
 	"COLOR_CH1": [255, 127, 14],
 	"COLOR_RMS_CH0": [44, 160, 44],
@@ -77,6 +96,12 @@ DEFAULT_SETTINGS: Dict[str, Any] = {
 	# Archivos
 	"CONFIG_FILE": "system_config.json",
 	"CALIBRATION_FILE": "imu_calibration.json",
+	"RECORDING_FLUSH_SEC": 2.0,
+	"WRITER_QUEUE_SIZE": 32,
+	"STORAGE_PROFILE": "lossless-compact",
+	"RECORD_RAW_COUNTS": False,
+	"RECORDING_JOURNAL": True,
+	"SEGMENT_MINUTES": 0.0,
 }
 
 # Valores derivados que dependen de otros parámetros
@@ -107,6 +132,14 @@ SETTINGS_SCHEMA: Dict[str, Dict[str, Any]] = {
 		"step": 0.01,
 		"description": "Tiempo de espera para lecturas seriales.",
 	},
+	"SERIAL_BATCH_MS": {
+		"section": "Conexión Serial",
+		"label": "Agrupación de frames (ms)",
+		"type": "int",
+		"min": 1,
+		"max": 100,
+		"description": "Tiempo máximo que se acumulan frames decodificados antes de entregarlos como un lote.",
+	},
 	"PREAMBLE": {
 		"section": "Protocolo",
 		"label": "Preámbulo",
@@ -179,6 +212,30 @@ SETTINGS_SCHEMA: Dict[str, Dict[str, Any]] = {
 		"max": 100.0,
 		"step": 0.5,
 	},
+	"EMG_LINE_FILTER": {
+		"section": "EMG",
+		"label": "Filtro de red",
+		"type": "choice",
+		"options": ["notch", "adaptive"],
+		"description": "Notch IIR fijo o cancelador LMS adaptativo con armónicos.",
+	},
+	"EMG_LINE_HARMONICS": {
+		"section": "EMG",
+		"label": "Armónicos de red",
+		"type": "int",
+		"min": 1,
+		"max": 8,
+		"description": "Número de armónicos (incluida la fundamental) que cancela el filtro adaptativo.",
+	},
+	"EMG_LINE_MU": {
+		"section": "EMG",
+		"label": "Paso LMS filtro de red",
+		"type": "float",
+		"min": 0.0001,
+		"max": 0.05,
+		"step": 0.0005,
+		"description": "Velocidad de adaptación del cancelador; valores altos siguen más rápido pero atenúan más EMG.",
+	},
 	"RMS_WINDOW_MS": {
 		"section": "EMG",
 		"label": "Ventana RMS (ms)",
@@ -210,6 +267,56 @@ SETTINGS_SCHEMA: Dict[str, Dict[str, Any]] = {
 		"max": 1.0,
 		"step": 0.01,
 	},
+	"ORIENTATION_FILTER": {
+		"section": "IMU",
+		"label": "Filtro de orientación",
+		"type": "choice",
+		"options": ["complementary", "kalman", "mahony"],
+		"description": "Backend de fusión accel + gyro para el ángulo de flexión.",
+	},
+	"GYRO_BIAS_TRACKING": {
+		"section": "IMU",
+		"label": "Estimar sesgo del giroscopio",
+		"type": "choice",
+		"options": [True, False],
+		"description": "Corrige el sesgo del giroscopio durante los periodos de reposo detectados.",
+	},
+	"STILLNESS_GYRO_THRESHOLD": {
+		"section": "IMU",
+		"label": "Umbral de reposo (°/s)",
+		"type": "float",
+		"min": 0.5,
+		"max": 30.0,
+		"step": 0.5,
+		"description": "Velocidad angular máxima para considerar el segmento en reposo.",
+	},
+	"REP_HYSTERESIS_DEG": {
+		"section": "IMU",
+		"label": "Histéresis repeticiones (°)",
+		"type": "float",
+		"min": 1.0,
+		"max": 60.0,
+		"step": 0.5,
+		"description": "Cambio de ángulo necesario para confirmar un pico o valle de la flexo-extensión.",
+	},
+	"REP_MIN_DURATION_SEC": {
+		"section": "IMU",
+		"label": "Duración mínima repetición (s)",
+		"type": "float",
+		"min": 0.1,
+		"max": 10.0,
+		"step": 0.1,
+		"description": "Repeticiones más cortas se descartan como movimiento espurio.",
+	},
+	"DERIVED_CUTOFF_HZ": {
+		"section": "IMU",
+		"label": "Corte velocidad/aceleración (Hz)",
+		"type": "float",
+		"min": 1.0,
+		"max": 20.0,
+		"step": 0.5,
+		"description": "Pasa-bajas aplicado al ángulo y a la velocidad antes de derivarlos durante la grabación.",
+	},
 	"CALIBRATION_POINTS": {
 		"section": "IMU",
 		"label": "Puntos de calibración",
@@ -314,6 +421,74 @@ SETTINGS_SCHEMA: Dict[str, Dict[str, Any]] = {
 		"min": 1,
 		"max": 120,
 	},
+	"PLOT_RMS_DECIMATION": {
+		"section": "Visualización",
+		"label": "Decimación curva RMS",
+		"type": "choice",
+		"options": [1, 4, 16],
+		"description": "Nivel del decimador multi-tasa usado para dibujar la envolvente RMS en vivo.",
+	},
+	"METRICS_REFRESH_HZ": {
+		"section": "Visualización",
+		"label": "Refresco de métricas (Hz)",
+		"type": "int",
+		"min": 1,
+		"max": 60,
+		"description": "Frecuencia máxima con la que se reescriben las etiquetas de métricas en vivo.",
+	},
+	"ADAPTIVE_FRAME_RATE": {
+		"section": "Visualización",
+		"label": "FPS adaptativo",
+		"type": "choice",
+		"options": [True, False],
+		"description": "Ajusta el intervalo de refresco y la decimación de las gráficas según su costo medido.",
+	},
+	"PLOT_CPU_BUDGET": {
+		"section": "Visualización",
+		"label": "Presupuesto CPU gráficas",
+		"type": "float",
+		"min": 0.05,
+		"max": 0.9,
+		"step": 0.05,
+		"description": "Fracción máxima del hilo de interfaz que pueden ocupar los refrescos de gráficas.",
+	},
+	"DIAGNOSTICS_OVERLAY": {
+		"section": "Visualización",
+		"label": "Overlay de diagnóstico",
+		"type": "choice",
+		"options": [True, False],
+		"description": "Muestra al abrir las ventanas en vivo el panel de rendimiento (F3 lo alterna).",
+	},
+	"HISTORY_DURATION_MIN": {
+		"section": "Visualización",
+		"label": "Historial en vivo (min)",
+		"type": "int",
+		"min": 1,
+		"max": 240,
+		"description": "Tiempo que se puede revisar desplazando las gráficas en vivo (niveles min/máx/media).",
+	},
+	"HISTORY_FULL_RES_SEC": {
+		"section": "Visualización",
+		"label": "Historial a resolución completa (s)",
+		"type": "int",
+		"min": 1,
+		"max": 120,
+		"description": "Segundos recientes del historial que se conservan muestra a muestra.",
+	},
+	"SPECTROGRAM_PANEL": {
+		"section": "Visualización",
+		"label": "Espectrograma EMG",
+		"type": "choice",
+		"options": [True, False],
+		"description": "Muestra al abrir la vista en vivo el espectrograma de cada canal EMG.",
+	},
+	"SPECTROGRAM_NFFT": {
+		"section": "Visualización",
+		"label": "Ventana espectrograma (muestras)",
+		"type": "choice",
+		"options": [128, 256, 512],
+		"description": "Longitud de la STFT; el avance entre columnas es un cuarto de la ventana.",
+	},
 	"UPDATE_INTERVAL_MS": {
 		"section": "Visualización",
 		"label": "Intervalo de actualización (ms)",
@@ -369,10 +544,57 @@ SETTINGS_SCHEMA: Dict[str, Dict[str, Any]] = {
 		"label": "Archivo de calibración IMU",
 		"type": "str",
 	},
+	"RECORDING_FLUSH_SEC": {
+		"section": "Archivos",
+		"label": "Volcado a disco al grabar (s)",
+		"type": "float",
+		"min": 0.5,
+		"max": 30.0,
+		"step": 0.5,
+		"description": "Cada cuánto se escriben en raw_data.h5 las muestras pendientes durante la grabación.",
+	},
+	"WRITER_QUEUE_SIZE": {
+		"section": "Archivos",
+		"label": "Cola de escritura (bloques)",
+		"type": "int",
+		"min": 4,
+		"max": 1024,
+		"description": "Trabajos de escritura pendientes que admite el hilo de guardado antes de retener los datos en memoria.",
+	},
+	"STORAGE_PROFILE": {
+		"section": "Archivos",
+		"label": "Perfil de almacenamiento",
+		"type": "choice",
+		"options": ["fast", "lossless-compact", "archival"],
+		"description": "fast: LZF, bloques de 2 s; lossless-compact: shuffle + gzip 4, bloques de 4 s; archival: gzip 9 y redondeo por debajo de la resolución del sensor.",
+	},
+	"RECORD_RAW_COUNTS": {
+		"section": "Archivos",
+		"label": "Guardar cuentas crudas del ADC/IMU",
+		"type": "choice",
+		"options": [True, False],
+		"description": "Guarda las señales crudas como los códigos enteros del sensor (exactos y más compresibles); el análisis las convierte a V, g y °/s al leerlas.",
+	},
+	"RECORDING_JOURNAL": {
+		"section": "Archivos",
+		"label": "Journal de recuperación",
+		"type": "choice",
+		"options": [True, False],
+		"description": "Escribe journal.bin con sumas CRC32 durante la grabación para reconstruir la sesión si el programa o el equipo se detienen.",
+	},
+	"SEGMENT_MINUTES": {
+		"section": "Archivos",
+		"label": "Segmentos de grabación (min)",
+		"type": "float",
+		"min": 0.0,
+		"max": 60.0,
+		"step": 1.0,
+		"description": "Divide los datos de la sesión en archivos raw_data_NNN.h5 de esta duración listados en segments.json (0 = un solo archivo).",
+	},
 }
 
 SETTINGS_LAYOUT: List[Tuple[str, List[str]]] = [
-	("Conexión Serial", ["SERIAL_BAUD", "SERIAL_TIMEOUT"]),
+	("Conexión Serial", ["SERIAL_BAUD", "SERIAL_TIMEOUT", "SERIAL_BATCH_MS"]),
 	("Protocolo", ["PREAMBLE", "FRAME_TYPE_EMG", "FRAME_TYPE_IMU"]),
 	(
 		"EMG",
@@ -383,17 +605,29 @@ SETTINGS_LAYOUT: List[Tuple[str, List[str]]] = [
 			"EMG_LOWPASS_CUTOFF",
 			"EMG_NOTCH_FREQ",
 			"EMG_NOTCH_Q",
+			"EMG_LINE_FILTER",
+			"EMG_LINE_HARMONICS",
+			"EMG_LINE_MU",
 			"RMS_WINDOW_MS",
 			"RMS_WINDOW_SAMPLES",
 		],
 	),
-	("IMU", ["IMU_FS", "COMPLEMENTARY_FILTER_ALPHA", "CALIBRATION_POINTS", "AUTO_CALIB_CAMERA_INDEX", "AUTO_CALIB_FPS", "AUTO_CALIB_REFERENCE_EXT", "AUTO_CALIB_REFERENCE_FLEX", "AUTO_CALIB_TOLERANCE_DEG", "AUTO_CALIB_STABILITY_FRAMES", "AUTO_CALIB_VISIBILITY_THRESHOLD"]),
+	("IMU", ["IMU_FS", "COMPLEMENTARY_FILTER_ALPHA", "ORIENTATION_FILTER", "GYRO_BIAS_TRACKING", "STILLNESS_GYRO_THRESHOLD", "REP_HYSTERESIS_DEG", "REP_MIN_DURATION_SEC", "DERIVED_CUTOFF_HZ", "CALIBRATION_POINTS", "AUTO_CALIB_CAMERA_INDEX", "AUTO_CALIB_FPS", "AUTO_CALIB_REFERENCE_EXT", "AUTO_CALIB_REFERENCE_FLEX", "AUTO_CALIB_TOLERANCE_DEG", "AUTO_CALIB_STABILITY_FRAMES", "AUTO_CALIB_VISIBILITY_THRESHOLD"]),
 	("ADC", ["VREF", "PGA_GAIN", "ADC_RESOLUTION"]),
 	(
 		"Visualización",
 		[
 			"WINDOW_TIME_SEC",
 			"UPDATE_FPS",
+			"PLOT_RMS_DECIMATION",
+			"METRICS_REFRESH_HZ",
+			"ADAPTIVE_FRAME_RATE",
+			"PLOT_CPU_BUDGET",
+			"DIAGNOSTICS_OVERLAY",
+			"HISTORY_DURATION_MIN",
+			"HISTORY_FULL_RES_SEC",
+			"SPECTROGRAM_PANEL",
+			"SPECTROGRAM_NFFT",
 			"UPDATE_INTERVAL_MS",
 			"EMG_BUFFER_SIZE",
 			"IMU_BUFFER_SIZE",
@@ -404,7 +638,7 @@ SETTINGS_LAYOUT: List[Tuple[str, List[str]]] = [
 			"COLOR_ANGLE",
 		],
 	),
-	("Archivos", ["CONFIG_FILE", "CALIBRATION_FILE"]),
+	("Archivos", ["CONFIG_FILE", "CALIBRATION_FILE", "RECORDING_FLUSH_SEC", "WRITER_QUEUE_SIZE", "STORAGE_PROFILE", "RECORD_RAW_COUNTS", "RECORDING_JOURNAL", "SEGMENT_MINUTES"]),
 ]
 
 _runtime_settings: Dict[str, Any] = {}
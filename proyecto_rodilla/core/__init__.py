@@ -3,16 +3,67 @@ Paquete core: procesamiento de señales y comunicación
 """
 from .frame_decoder import FrameDecoder, crc16_ccitt
 from .signal_processing import EMGProcessor, AngleCalculator
+from .orientation import (
+    ComplementaryFilter,
+    KalmanAngleFilter,
+    MahonyFilter,
+    GyroBiasTracker,
+    create_orientation_filter,
+)
+from .line_noise import LineNoiseCanceller
+from .alignment import AlignedFrame, SessionClock, StreamAligner, align_streams
+from .repetitions import RepetitionDetector, RepetitionRecord, detect_repetitions
+from .derived_signals import DerivedSignalStage
+from .decimation import MinMaxDecimator, MultiRateDecimator, PolyphaseDecimator
+from .history import HistoryPyramid
+from .spectrogram import StreamingSpectrogram
+from .cocontraction import CoContractionAccumulator, cocontraction_series
+from .frame_rate import FrameRateController
+from .diagnostics import DiagnosticsCounters
+from .ring_buffer import RingBuffer
 from .serial_reader import SerialReaderThread, get_available_ports
+from .acquisition_engine import AcquisitionEngine, ProcessedBatch, shared_engine
 from .session_recorder import SessionRecorder, EventMarker
+from .session_worker import SessionRecoveryThread, SessionWriterThread, SummaryBackfillThread, shared_writer
 
 __all__ = [
     'FrameDecoder',
     'crc16_ccitt',
     'EMGProcessor',
     'AngleCalculator',
+    'ComplementaryFilter',
+    'KalmanAngleFilter',
+    'MahonyFilter',
+    'GyroBiasTracker',
+    'create_orientation_filter',
+    'LineNoiseCanceller',
+    'AlignedFrame',
+    'SessionClock',
+    'StreamAligner',
+    'align_streams',
+    'RepetitionDetector',
+    'RepetitionRecord',
+    'detect_repetitions',
+    'DerivedSignalStage',
+    'MinMaxDecimator',
+    'MultiRateDecimator',
+    'PolyphaseDecimator',
+    'HistoryPyramid',
+    'StreamingSpectrogram',
+    'CoContractionAccumulator',
+    'cocontraction_series',
+    'FrameRateController',
+    'DiagnosticsCounters',
+    'RingBuffer',
     'SerialReaderThread',
     'get_available_ports',
+    'AcquisitionEngine',
+    'ProcessedBatch',
+    'shared_engine',
     'SessionRecorder',
-    'EventMarker'
+    'EventMarker',
+    'SessionWriterThread',
+    'SessionRecoveryThread',
+    'SummaryBackfillThread',
+    'shared_writer'
 ]
\ No newline at end of file
@@ -0,0 +1,296 @@
+"""
+Motor de adquisición compartido por las vistas en vivo.
+
+Un único ``AcquisitionEngine`` abre el puerto serial, procesa cada lote de
+frames una sola vez (filtrado y RMS EMG por bloques, ángulo IMU, línea de
+tiempo común) y emite ``batch_ready`` con el resultado. Las ventanas y los
+diálogos se suscriben a esa señal; abrir una segunda vista no abre otro
+puerto ni repite el procesamiento.
+
+El puerto permanece abierto mientras alguna vista lo tenga adquirido
+(``acquire``/``release``). La calibración del IMU y las MVC también viven
+aquí, así que todas las vistas muestran los mismos valores.
+"""
+from dataclasses import dataclass
+import time
+import numpy as np
+from PyQt6.QtCore import QObject, pyqtSignal
+from typing import Dict, List, Optional
+from .alignment import SessionClock
+from .serial_reader import SerialReaderThread
+from .signal_processing import AngleCalculator, EMGProcessor
+
+
+@dataclass
+class EMGBatch:
+    """Muestras EMG procesadas de un lote (canales × n) y los códigos del ADC."""
+
+    timestamps_us: np.ndarray
+    sequence: np.ndarray
+    time: np.ndarray
+    raw: np.ndarray
+    filtered: np.ndarray
+    rms: np.ndarray
+    counts: np.ndarray
+
+    def __len__(self) -> int:
+        return int(self.time.size)
+
+    @classmethod
+    def empty(cls) -> "EMGBatch":
+        return cls(np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), np.empty(0),
+                   np.empty((2, 0)), np.empty((2, 0)), np.empty((2, 0)), np.empty((2, 0), dtype=np.int32))
+
+
+@dataclass
+class IMUBatch:
+    """Muestras IMU de un lote: aceleración (g) y giro (°/s) como ejes × n, ángulo y cuentas crudas."""
+
+    timestamps_us: np.ndarray
+    sequence: np.ndarray
+    time: np.ndarray
+    accel: np.ndarray
+    gyro: np.ndarray
+    angle: np.ndarray
+    counts: np.ndarray  # ax, ay, az, gx, gy, gz × n
+
+    def __len__(self) -> int:
+        return int(self.time.size)
+
+    @classmethod
+    def empty(cls) -> "IMUBatch":
+        return cls(np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), np.empty(0),
+                   np.empty((3, 0)), np.empty((3, 0)), np.empty(0), np.empty((6, 0), dtype=np.int16))
+
+
+@dataclass
+class ProcessedBatch:
+    """Resultado de procesar un lote de frames."""
+
+    emg: EMGBatch
+    imu: IMUBatch
+    dsp_sec: float = 0.0
+
+    def __len__(self) -> int:
+        return len(self.emg) + len(self.imu)
+
+
+# Atributos de ``AngleCalculator`` que definen la calibración
+_CALIBRATION_FIELDS = ("calibrated", "offset", "scale", "angle_ref1", "angle_ref2")
+
+
+def _column(frames: List[Dict], key: str, dtype=np.float64) -> np.ndarray:
+    return np.fromiter((frame[key] for frame in frames), dtype=dtype, count=len(frames))
+
+
+class AcquisitionEngine(QObject):
+    """Dueño único del puerto serial y del procesamiento EMG/IMU."""
+
+    batch_ready = pyqtSignal(object)  # ProcessedBatch
+    connection_status = pyqtSignal(bool, str)  # (conectado, mensaje)
+    mvc_changed = pyqtSignal(int, float)  # (canal, valor)
+    calibration_changed = pyqtSignal()
+
+    def __init__(self, parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self.emg_processors = (EMGProcessor(), EMGProcessor())
+        self.angle_calculator = AngleCalculator()
+        self.session_clock = SessionClock()
+        self.mvc_values: Dict[int, Optional[float]] = {0: None, 1: None}
+
+        self.serial_thread: Optional[SerialReaderThread] = None
+        self.port: Optional[str] = None
+        self.is_connected = False
+        self.status_message = "⚫ Desconectado"
+        self._owners: List[QObject] = []
+        self._reset_state()
+
+    def _reset_state(self):
+        self.t0_emg_us: Optional[int] = None
+        self.t0_imu_us: Optional[int] = None
+        self.current_time_emg = 0.0
+        self.current_time_imu = 0.0
+        self.current_rms: Dict[int, float] = {0: 0.0, 1: 0.0}
+        self.current_angle = 0.0
+        self.current_raw_angle = self.angle_calculator.last_uncalibrated_angle
+        self.emg_samples = 0
+        self.imu_samples = 0
+
+    # ------------------------------------------------------------------
+    # Conexión
+    # ------------------------------------------------------------------
+    @property
+    def decoder(self):
+        """Decodificador del hilo serial activo (para diagnóstico), o None."""
+        return self.serial_thread.decoder if self.serial_thread else None
+
+    def acquire(self, owner: QObject, port: str) -> bool:
+        """
+        Registra ``owner`` como usuario del puerto y lo abre si hace falta.
+
+        Returns:
+            False si ya hay otro puerto abierto.
+        """
+        if self.serial_thread is not None and port != self.port:
+            return False
+        if owner not in self._owners:
+            self._owners.append(owner)
+        if self.serial_thread is None:
+            self.reset_processing()
+            self.port = port
+            self.serial_thread = SerialReaderThread(port)
+            self.serial_thread.frames_received.connect(self._on_frames)
+            self.serial_thread.connection_status.connect(self._on_connection_status)
+            self.serial_thread.start()
+        return True
+
+    def release(self, owner: QObject):
+        """Quita a ``owner``; el puerto se cierra cuando ya nadie lo usa."""
+        if owner in self._owners:
+            self._owners.remove(owner)
+        if not self._owners:
+            self._stop_thread()
+
+    def _stop_thread(self):
+        thread, self.serial_thread = self.serial_thread, None
+        if thread is not None:
+            thread.stop()
+            thread.wait(2000)
+        self.port = None
+        self.is_connected = False
+
+    def _on_connection_status(self, connected: bool, message: str):
+        # Señales encoladas de un hilo anterior ya detenido no cuentan
+        if self.sender() is not self.serial_thread:
+            return
+        self.is_connected = connected
+        self.status_message = message
+        if not connected:
+            # El hilo terminó (error o desconexión): las vistas deben volver a adquirir
+            self._owners.clear()
+            self._stop_thread()
+        self.connection_status.emit(connected, message)
+
+    def reset_processing(self):
+        """Reinicia filtros, estado del ángulo y línea de tiempo.
+
+        Los procesadores se recrean para tomar la configuración vigente. La
+        calibración del IMU se conserva, igual que las MVC: depende del
+        montaje del sensor, no de la conexión.
+        """
+        previous = self.angle_calculator
+        self.emg_processors = (EMGProcessor(), EMGProcessor())
+        self.angle_calculator = AngleCalculator()
+        for name in _CALIBRATION_FIELDS:
+            setattr(self.angle_calculator, name, getattr(previous, name))
+        self.session_clock.reset()
+        self._reset_state()
+
+    # ------------------------------------------------------------------
+    # Procesamiento
+    # ------------------------------------------------------------------
+    def _on_frames(self, frames: List[Dict]):
+        if self.sender() is not self.serial_thread:
+            return
+        self.process_frames(frames)
+
+    def process_frames(self, frames: List[Dict]):
+        """Procesa un lote de frames decodificados y emite ``batch_ready``."""
+        started = time.perf_counter()
+        emg_frames = [frame for frame in frames if frame['type'] == 'EMG']
+        imu_frames = [frame for frame in frames if frame['type'] == 'IMU']
+        batch = ProcessedBatch(self._process_emg(emg_frames), self._process_imu(imu_frames))
+        batch.dsp_sec = time.perf_counter() - started
+        self.batch_ready.emit(batch)
+
+    def _process_emg(self, frames: List[Dict]) -> EMGBatch:
+        if not frames:
+            return EMGBatch.empty()
+        timestamps = _column(frames, 'timestamp_us', np.int64)
+        if self.t0_emg_us is None:
+            self.t0_emg_us = int(timestamps[0])
+        raw = np.vstack((_column(frames, 'ch0'), _column(frames, 'ch1')))
+        filtered = np.empty_like(raw)
+        rms = np.empty_like(raw)
+        for channel, processor in enumerate(self.emg_processors):
+            filtered[channel], rms[channel] = processor.process_block(raw[channel])
+        batch = EMGBatch(
+            timestamps_us=timestamps,
+            sequence=_column(frames, 'seq', np.int64),
+            time=self.session_clock.to_seconds_block(timestamps, 'emg'),
+            raw=raw,
+            filtered=filtered,
+            rms=rms,
+            counts=np.vstack((_column(frames, 'ch0_counts', np.int32), _column(frames, 'ch1_counts', np.int32))),
+        )
+        self.current_time_emg = float(batch.time[-1])
+        self.current_rms[0] = float(rms[0, -1])
+        self.current_rms[1] = float(rms[1, -1])
+        self.emg_samples += len(batch)
+        return batch
+
+    def _process_imu(self, frames: List[Dict]) -> IMUBatch:
+        if not frames:
+            return IMUBatch.empty()
+        timestamps = _column(frames, 'timestamp_us', np.int64)
+        if self.t0_imu_us is None:
+            self.t0_imu_us = int(timestamps[0])
+        accel = np.vstack([_column(frames, key) for key in ('ax', 'ay', 'az')])
+        gyro = np.vstack([_column(frames, key) for key in ('gx', 'gy', 'gz')])
+        angle = self.angle_calculator.update_block(accel[0], accel[1], accel[2],
+                                                   gyro[0], gyro[1], gyro[2], timestamps)
+        batch = IMUBatch(
+            timestamps_us=timestamps,
+            sequence=_column(frames, 'seq', np.int64),
+            time=self.session_clock.to_seconds_block(timestamps, 'imu'),
+            accel=accel,
+            gyro=gyro,
+            angle=angle,
+            counts=np.array([frame['counts'] for frame in frames], dtype=np.int16).T,
+        )
+        self.current_time_imu = float(batch.time[-1])
+        self.current_angle = float(angle[-1])
+        self.current_raw_angle = float(self.angle_calculator.last_uncalibrated_angle)
+        self.imu_samples += len(batch)
+        return batch
+
+    # ------------------------------------------------------------------
+    # Calibración y normalización compartidas
+    # ------------------------------------------------------------------
+    def set_mvc(self, channel: int, value: float):
+        self.mvc_values[channel] = value
+        self.mvc_changed.emit(channel, value)
+
+    def apply_calibration(self, calib_data: Dict) -> bool:
+        """Aplica el resultado de ``CalibrationDialog`` (1 o 2 puntos)."""
+        calculator = self.angle_calculator
+        mode = calib_data.get('mode')
+        if mode == 1:
+            raw_point = calib_data.get('angle_raw_point1')
+            if raw_point is not None:
+                calculator.angle = float(raw_point)
+                calculator.last_uncalibrated_angle = float(raw_point)
+            calculator.calibrate_one_point(float(calib_data.get('angle_ref_point1', 0.0)))
+        elif mode == 2:
+            calculator.calibrate_two_points(
+                float(calib_data.get('angle_raw_point1', 0.0)),
+                float(calib_data.get('angle_ref_point1', 0.0)),
+                float(calib_data.get('angle_raw_point2', 90.0)),
+                float(calib_data.get('angle_ref_point2', 90.0)),
+            )
+        else:
+            return False
+        self.current_raw_angle = float(calculator.last_uncalibrated_angle)
+        self.calibration_changed.emit()
+        return True
+
+
+_shared_engine: Optional[AcquisitionEngine] = None
+
+
+def shared_engine() -> AcquisitionEngine:
+    """Motor de adquisición único de la aplicación (se crea al primer uso)."""
+    global _shared_engine
+    if _shared_engine is None:
+        _shared_engine = AcquisitionEngine()
+    return _shared_engine
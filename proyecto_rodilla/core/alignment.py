@@ -0,0 +1,331 @@
+"""
+Alineación temporal de los flujos EMG (≈1636 Hz) e IMU (50 Hz).
+
+Ambos flujos llevan marcas de tiempo del mismo reloj del microcontrolador
+(µs, 32 bits). Este módulo las desenrolla, las lleva a un origen común de
+sesión y produce vistas conjuntas (``AlignedFrame``) sobre el eje de uno de
+los dos flujos:
+
+* ``target="emg"``: la IMU se interpola linealmente a la tasa EMG.
+* ``target="imu"``: las envolventes EMG se filtran paso-bajas (anti-aliasing)
+  y se remuestrean a los instantes IMU.
+
+Existe una forma offline por bloques (``align_streams``) y una forma en
+línea (``StreamAligner``).
+"""
+import numpy as np
+from scipy import signal
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from config import settings as cfg
+
+
+WRAP_US = 1 << 32
+
+
+def unwrap_timestamps(timestamps_us: np.ndarray, bits: int = 32) -> np.ndarray:
+    """Desenrolla marcas de tiempo de ``bits`` bits a un eje monótono (int64)."""
+    ts = np.asarray(timestamps_us)
+    if ts.ndim != 1 or ts.dtype == object:
+        return np.array([], dtype=np.int64)
+    ts = ts.astype(np.int64)
+    if ts.size < 2:
+        return ts
+    period = 1 << bits
+    jumps = np.diff(ts) < -(period // 2)
+    if not np.any(jumps):
+        return ts
+    offsets = np.concatenate(([0], np.cumsum(jumps))) * period
+    return ts + offsets
+
+
+def session_time_axes(emg_timestamps_us: Optional[np.ndarray],
+                      imu_timestamps_us: Optional[np.ndarray]) -> Tuple[np.ndarray, np.ndarray, int]:
+    """
+    Convierte ambos flujos a segundos desde un origen común.
+
+    Returns:
+        (t_emg, t_imu, t0_us) donde ``t0_us`` es la primera marca de la sesión.
+    """
+    unwrapped = []
+    for ts in (emg_timestamps_us, imu_timestamps_us):
+        unwrapped.append(unwrap_timestamps(ts) if ts is not None else np.array([], dtype=np.int64))
+    starts = [int(ts[0]) for ts in unwrapped if ts.size]
+    t0_us = min(starts) if starts else 0
+    axes = [(ts - t0_us).astype(np.float64) / 1e6 for ts in unwrapped]
+    return axes[0], axes[1], t0_us
+
+
+def estimate_rate(times: np.ndarray) -> float:
+    """Frecuencia de muestreo (Hz) a partir de la mediana de los intervalos."""
+    if times.size < 2:
+        return 0.0
+    step = float(np.median(np.diff(times)))
+    return 1.0 / step if step > 0 else 0.0
+
+
+def anti_alias_sos(source_fs: float, target_fs: float, cutoff_hz: Optional[float] = None,
+                   order: int = 4) -> Optional[np.ndarray]:
+    """Butterworth paso-bajas para bajar de ``source_fs`` a ``target_fs`` (None si no hace falta)."""
+    cutoff = cutoff_hz if cutoff_hz is not None else 0.4 * target_fs
+    if source_fs <= 0 or cutoff <= 0 or cutoff >= 0.5 * source_fs:
+        return None
+    return signal.butter(order, cutoff, btype="low", fs=source_fs, output="sos")
+
+
+class SessionClock:
+    """
+    Línea de tiempo común en línea para los frames EMG e IMU.
+
+    Cada fuente se desenrolla por separado (los frames llegan intercalados)
+    y el origen es la primera marca recibida de cualquiera de las dos.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.t0_us: Optional[int] = None
+        self._last: Dict[str, int] = {}
+        self._offset: Dict[str, int] = {}
+
+    def unwrap(self, timestamp_us: int, source: str) -> int:
+        """Marca de tiempo desenrollada (µs) para ``source``."""
+        last = self._last.get(source)
+        offset = self._offset.get(source, 0)
+        if last is not None and timestamp_us < last - WRAP_US // 2:
+            offset += WRAP_US
+            self._offset[source] = offset
+        self._last[source] = timestamp_us
+        return timestamp_us + offset
+
+    def to_seconds(self, timestamp_us: int, source: str) -> float:
+        """Segundos desde el origen común de la sesión."""
+        unwrapped = self.unwrap(timestamp_us, source)
+        if self.t0_us is None:
+            self.t0_us = unwrapped
+        return (unwrapped - self.t0_us) / 1e6
+
+    def to_seconds_block(self, timestamps_us: np.ndarray, source: str) -> np.ndarray:
+        """Versión por bloque de ``to_seconds`` (mismo estado de desenrollado)."""
+        ts = np.asarray(timestamps_us, dtype=np.int64)
+        if ts.size == 0:
+            return np.empty(0)
+        last = self._last.get(source)
+        offset = self._offset.get(source, 0)
+        previous = np.concatenate(([ts[0] if last is None else last], ts[:-1]))
+        wraps = np.cumsum(ts < previous - WRAP_US // 2)
+        unwrapped = ts + offset + wraps * WRAP_US
+        self._offset[source] = offset + int(wraps[-1]) * WRAP_US
+        self._last[source] = int(ts[-1])
+        if self.t0_us is None:
+            self.t0_us = int(unwrapped[0])
+        return (unwrapped - self.t0_us) / 1e6
+
+
+class AlignedFrame:
+    """
+    Vista conjunta de varias señales sobre un mismo eje temporal.
+
+    Las columnas se guardan en una sola matriz de solo lectura
+    (columnas × muestras), de modo que cada ``frame[nombre]`` es una vista
+    contigua que métricas y gráficas pueden compartir sin copiar.
+    """
+
+    def __init__(self, time: np.ndarray, data: np.ndarray, columns: Sequence[str], rate: float):
+        self.time = time
+        self.data = data
+        self.columns = tuple(columns)
+        self.rate = rate
+        self._index = {name: i for i, name in enumerate(self.columns)}
+        self.time.setflags(write=False)
+        self.data.setflags(write=False)
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.data[self._index[name]]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._index
+
+    def __len__(self) -> int:
+        return int(self.time.size)
+
+    def window(self, t_start: float, t_end: float) -> "AlignedFrame":
+        """Sub-vista (sin copia) de las muestras con ``t_start <= t < t_end``."""
+        lo, hi = np.searchsorted(self.time, [t_start, t_end])
+        return AlignedFrame(self.time[lo:hi], self.data[:, lo:hi], self.columns, self.rate)
+
+    @classmethod
+    def empty(cls, columns: Sequence[str] = ()) -> "AlignedFrame":
+        return cls(np.array([]), np.empty((len(columns), 0)), columns, 0.0)
+
+
+def _resample_chunked(t_src: np.ndarray, values: np.ndarray, t_dst: np.ndarray,
+                      out: np.ndarray, sos: Optional[np.ndarray], margin_s: float,
+                      chunk_size: int) -> None:
+    """Interpola ``values`` en ``t_dst`` por bloques, con filtro de fase cero opcional."""
+    for start in range(0, t_dst.size, chunk_size):
+        stop = min(t_dst.size, start + chunk_size)
+        lo = int(np.searchsorted(t_src, t_dst[start] - margin_s, side="left"))
+        hi = int(np.searchsorted(t_src, t_dst[stop - 1] + margin_s, side="right"))
+        lo = max(0, lo - 1)
+        hi = min(t_src.size, hi + 1)
+        segment = values[lo:hi]
+        if sos is not None and segment.size > 1:
+            padlen = min(3 * (2 * sos.shape[0] + 1), segment.size - 1)
+            segment = signal.sosfiltfilt(sos, segment, padlen=padlen)
+        out[start:stop] = np.interp(t_dst[start:stop], t_src[lo:hi], segment,
+                                    left=np.nan, right=np.nan)
+
+
+def align_streams(t_emg: np.ndarray, emg: Dict[str, np.ndarray],
+                  t_imu: np.ndarray, imu: Dict[str, np.ndarray],
+                  target: str = "imu", cutoff_hz: Optional[float] = None,
+                  chunk_size: int = 65536) -> AlignedFrame:
+    """
+    Alinea columnas EMG e IMU sobre el eje de ``target`` ("emg" o "imu").
+
+    Los tiempos deben estar en segundos sobre el origen común
+    (ver ``session_time_axes``). Al bajar EMG a la tasa IMU se aplica un
+    Butterworth de fase cero por bloques con solapamiento, por lo que el
+    resultado no depende de ``chunk_size``. Las muestras fuera del rango de
+    la otra fuente quedan en NaN.
+    """
+    if target not in ("emg", "imu"):
+        raise ValueError(f"Eje de alineación desconocido: {target}")
+    if target == "emg":
+        t_dst, own, t_src, other = t_emg, emg, t_imu, imu
+    else:
+        t_dst, own, t_src, other = t_imu, imu, t_emg, emg
+
+    columns = list(own) + list(other)
+    if t_dst.size == 0:
+        return AlignedFrame.empty(columns)
+
+    n = t_dst.size
+    data = np.full((len(columns), n), np.nan, dtype=np.float64)
+    for row, name in enumerate(own):
+        series = np.asarray(own[name], dtype=np.float64)
+        limit = min(n, series.size)
+        data[row, :limit] = series[:limit]
+
+    sos = None
+    margin_s = 0.0
+    if target == "imu" and t_src.size:
+        dst_fs = estimate_rate(t_dst)
+        sos = anti_alias_sos(estimate_rate(t_src), dst_fs, cutoff_hz)
+        if sos is not None:
+            # Margen suficiente para que el transitorio del filtro no alcance el bloque
+            margin_s = 10.0 / (cutoff_hz if cutoff_hz is not None else 0.4 * dst_fs)
+
+    chunk_size = max(1, int(chunk_size))
+    for offset, name in enumerate(other, start=len(own)):
+        series = np.asarray(other[name], dtype=np.float64)
+        limit = min(t_src.size, series.size)
+        if limit == 0:
+            continue
+        _resample_chunked(t_src[:limit], series[:limit], t_dst, data[offset], sos, margin_s, chunk_size)
+
+    return AlignedFrame(np.array(t_dst, dtype=np.float64), data, columns, estimate_rate(t_dst))
+
+
+class StreamAligner:
+    """
+    Alineación en línea de EMG e IMU.
+
+    Se alimenta con bloques de cada fuente (tiempos en segundos del
+    ``SessionClock``) y ``pop`` devuelve las filas del flujo objetivo cuya
+    posición ya está cubierta por la otra fuente. Con ``target="imu"`` las
+    columnas EMG pasan por un Butterworth causal continuo antes de
+    remuestrearse (introduce el retardo de grupo propio del filtro).
+    """
+
+    def __init__(self, emg_columns: Iterable[str] = ("rms_ch0", "rms_ch1"),
+                 imu_columns: Iterable[str] = ("angle",), target: str = "imu",
+                 cutoff_hz: Optional[float] = None, emg_fs: Optional[float] = None,
+                 imu_fs: Optional[float] = None):
+        if target not in ("emg", "imu"):
+            raise ValueError(f"Eje de alineación desconocido: {target}")
+        self.target = target
+        self.emg_columns = tuple(emg_columns)
+        self.imu_columns = tuple(imu_columns)
+        emg_fs = emg_fs if emg_fs is not None else cfg.EMG_FS
+        imu_fs = imu_fs if imu_fs is not None else cfg.IMU_FS
+        if target == "imu":
+            self.own_columns, self.other_columns = self.imu_columns, self.emg_columns
+            self.rate = float(imu_fs)
+            self._sos = anti_alias_sos(emg_fs, imu_fs, cutoff_hz)
+        else:
+            self.own_columns, self.other_columns = self.emg_columns, self.imu_columns
+            self.rate = float(emg_fs)
+            self._sos = None
+        self.columns = self.own_columns + self.other_columns
+        self._zi_base = signal.sosfilt_zi(self._sos) if self._sos is not None else None
+        self.reset()
+
+    def reset(self):
+        self._pending_t: List[np.ndarray] = []
+        self._pending_v: List[np.ndarray] = []
+        self._source_t = np.empty(0)
+        self._source_v = np.empty((len(self.other_columns), 0))
+        # Estado del filtro anti-aliasing por columna (se inicializa con la primera muestra)
+        self._zi: List[Optional[np.ndarray]] = [None] * len(self.other_columns)
+
+    def _block(self, times: np.ndarray, values: Dict[str, np.ndarray], names: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+        times = np.asarray(times, dtype=np.float64)
+        block = np.empty((len(names), times.size), dtype=np.float64)
+        for row, name in enumerate(names):
+            block[row] = np.asarray(values[name], dtype=np.float64)[:times.size]
+        return times, block
+
+    def _push_source(self, times, values):
+        times, block = self._block(times, values, self.other_columns)
+        if self._sos is not None and times.size:
+            for row in range(block.shape[0]):
+                if self._zi[row] is None:
+                    self._zi[row] = self._zi_base * block[row, 0]
+                block[row], self._zi[row] = signal.sosfilt(self._sos, block[row], zi=self._zi[row])
+        self._source_t = np.concatenate((self._source_t, times))
+        self._source_v = np.concatenate((self._source_v, block), axis=1)
+
+    def _push_target(self, times, values):
+        times, block = self._block(times, values, self.own_columns)
+        if times.size:
+            self._pending_t.append(times)
+            self._pending_v.append(block)
+
+    def push_emg(self, times: np.ndarray, values: Dict[str, np.ndarray]):
+        if self.target == "emg":
+            self._push_target(times, values)
+        else:
+            self._push_source(times, values)
+
+    def push_imu(self, times: np.ndarray, values: Dict[str, np.ndarray]):
+        if self.target == "imu":
+            self._push_target(times, values)
+        else:
+            self._push_source(times, values)
+
+    def pop(self) -> AlignedFrame:
+        """Filas listas (puede estar vacía); las demás quedan pendientes."""
+        if not self._pending_t or self._source_t.size == 0:
+            return AlignedFrame.empty(self.columns)
+        t_dst = np.concatenate(self._pending_t)
+        own = np.concatenate(self._pending_v, axis=1)
+        ready = int(np.searchsorted(t_dst, self._source_t[-1], side="right"))
+        if ready == 0:
+            self._pending_t, self._pending_v = [t_dst], [own]
+            return AlignedFrame.empty(self.columns)
+
+        data = np.empty((len(self.columns), ready), dtype=np.float64)
+        data[:own.shape[0]] = own[:, :ready]
+        for row in range(self._source_v.shape[0]):
+            data[own.shape[0] + row] = np.interp(t_dst[:ready], self._source_t, self._source_v[row],
+                                                 left=np.nan, right=np.nan)
+
+        self._pending_t = [t_dst[ready:]] if ready < t_dst.size else []
+        self._pending_v = [own[:, ready:]] if ready < t_dst.size else []
+        # Conservar solo la última muestra fuente anterior al siguiente objetivo
+        keep = max(0, int(np.searchsorted(self._source_t, t_dst[ready - 1], side="right")) - 1)
+        self._source_t = self._source_t[keep:]
+        self._source_v = self._source_v[:, keep:]
+        return AlignedFrame(t_dst[:ready].copy(), data, self.columns, self.rate)
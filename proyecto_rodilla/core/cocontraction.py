@@ -0,0 +1,153 @@
+"""
+Índice de co-contracción Q/H en ventana deslizante.
+
+El índice es ``∫min(s0, s1) dt / ∫max(s0, s1) dt × 100`` sobre los últimos
+``window_sec`` segundos, con ``s`` = RMS normalizada por MVC. En lugar de
+integrar toda la ventana en cada refresco, ``CoContractionAccumulator``
+guarda el área trapezoidal de cada segmento entre muestras y mantiene las
+dos integrales como sumas corrientes: agregar una muestra y desalojar los
+segmentos que salen de la ventana cuesta O(1) amortizado.
+
+``cocontraction_series`` aplica la misma definición a una sesión completa
+con sumas acumuladas, dando el índice en cada muestra.
+"""
+from collections import deque
+import numpy as np
+from typing import Deque, Optional, Tuple
+
+
+def _normalized_bounds(rms0: np.ndarray, rms1: np.ndarray, mvc0: float,
+                       mvc1: float) -> Tuple[np.ndarray, np.ndarray]:
+    s0 = np.abs(np.asarray(rms0, dtype=np.float64)) / mvc0
+    s1 = np.abs(np.asarray(rms1, dtype=np.float64)) / mvc1
+    return np.minimum(s0, s1), np.maximum(s0, s1)
+
+
+class CoContractionAccumulator:
+    """Integrales corrientes de solapamiento (mín) y envolvente (máx) en ventana deslizante."""
+
+    def __init__(self, window_sec: float, mvc0: Optional[float] = None, mvc1: Optional[float] = None):
+        self.window_sec = float(window_sec)
+        self.mvc0 = mvc0
+        self.mvc1 = mvc1
+        self.reset()
+
+    def reset(self):
+        """Vacía la ventana (la normalización se conserva)."""
+        # (inicio del segmento, área de solapamiento, área de envolvente)
+        self._segments: Deque[Tuple[float, float, float]] = deque()
+        self._overlap = 0.0
+        self._envelope = 0.0
+        self._prev: Optional[Tuple[float, float, float]] = None
+        self._evicted = 0
+
+    def set_mvc(self, mvc0: Optional[float], mvc1: Optional[float]):
+        """Cambia la normalización; las áreas acumuladas dejan de ser válidas."""
+        self.mvc0 = mvc0
+        self.mvc1 = mvc1
+        self.reset()
+
+    @property
+    def normalized(self) -> bool:
+        return bool(self.mvc0 and self.mvc0 > 0 and self.mvc1 and self.mvc1 > 0)
+
+    @property
+    def segments(self) -> int:
+        """Segmentos entre muestras dentro de la ventana."""
+        return len(self._segments)
+
+    @property
+    def envelope_area(self) -> float:
+        return self._envelope
+
+    @property
+    def value(self) -> Optional[float]:
+        """Índice en porcentaje (0-100), o None sin normalización o sin actividad."""
+        if not self._segments or self._envelope <= 0:
+            return None
+        return max(0.0, min(100.0, self._overlap / self._envelope * 100.0))
+
+    def update(self, t_sec: float, rms0: float, rms1: float) -> Optional[float]:
+        """Agrega una muestra RMS de ambos canales."""
+        if not self.normalized:
+            return None
+        s0 = abs(rms0) / self.mvc0
+        s1 = abs(rms1) / self.mvc1
+        low, high = (s0, s1) if s0 <= s1 else (s1, s0)
+        if self._prev is not None:
+            t_prev, low_prev, high_prev = self._prev
+            dt = t_sec - t_prev
+            overlap = 0.5 * (low + low_prev) * dt
+            envelope = 0.5 * (high + high_prev) * dt
+            self._segments.append((t_prev, overlap, envelope))
+            self._overlap += overlap
+            self._envelope += envelope
+        self._prev = (t_sec, low, high)
+        self._evict(t_sec)
+        return self.value
+
+    def update_block(self, times: np.ndarray, rms0: np.ndarray, rms1: np.ndarray) -> Optional[float]:
+        """Versión vectorizada de ``update`` para un bloque de muestras."""
+        times = np.asarray(times, dtype=np.float64)
+        if times.size == 0 or not self.normalized:
+            return self.value if self.normalized else None
+        low, high = _normalized_bounds(rms0, rms1, self.mvc0, self.mvc1)
+        if self._prev is not None:
+            times = np.concatenate(([self._prev[0]], times))
+            low = np.concatenate(([self._prev[1]], low))
+            high = np.concatenate(([self._prev[2]], high))
+        if times.size > 1:
+            dt = np.diff(times)
+            overlap = 0.5 * (low[1:] + low[:-1]) * dt
+            envelope = 0.5 * (high[1:] + high[:-1]) * dt
+            self._segments.extend(zip(times[:-1].tolist(), overlap.tolist(), envelope.tolist()))
+            self._overlap += float(overlap.sum())
+            self._envelope += float(envelope.sum())
+        self._prev = (float(times[-1]), float(low[-1]), float(high[-1]))
+        self._evict(self._prev[0])
+        return self.value
+
+    def _evict(self, t_now: float):
+        """Desaloja los segmentos que empiezan antes de ``t_now - window_sec``."""
+        limit = t_now - self.window_sec
+        segments = self._segments
+        while segments and segments[0][0] < limit:
+            _, overlap, envelope = segments.popleft()
+            self._overlap -= overlap
+            self._envelope -= envelope
+            self._evicted += 1
+        # Recalcular de vez en cuando evita que el error de redondeo de las
+        # restas se acumule en sesiones largas (costo amortizado O(1))
+        if self._evicted > max(1024, len(segments)):
+            self._overlap = float(sum(seg[1] for seg in segments))
+            self._envelope = float(sum(seg[2] for seg in segments))
+            self._evicted = 0
+
+
+def cocontraction_series(times: np.ndarray, rms0: np.ndarray, rms1: np.ndarray, window_sec: float,
+                         mvc0: float = 1.0, mvc1: float = 1.0) -> np.ndarray:
+    """
+    Índice de co-contracción (%) en cada muestra, sobre la ventana que termina en ella.
+
+    Da los mismos valores que ``CoContractionAccumulator`` muestra a muestra;
+    NaN donde la ventana aún no tiene segmentos o la envolvente es nula.
+    """
+    times = np.asarray(times, dtype=np.float64)
+    n = min(times.size, np.asarray(rms0).size, np.asarray(rms1).size)
+    result = np.full(n, np.nan)
+    if n < 2 or not (mvc0 and mvc0 > 0 and mvc1 and mvc1 > 0):
+        return result
+    times = times[:n]
+    low, high = _normalized_bounds(np.asarray(rms0)[:n], np.asarray(rms1)[:n], mvc0, mvc1)
+
+    dt = np.diff(times)
+    overlap_cum = np.concatenate(([0.0], np.cumsum(0.5 * (low[1:] + low[:-1]) * dt)))
+    envelope_cum = np.concatenate(([0.0], np.cumsum(0.5 * (high[1:] + high[:-1]) * dt)))
+
+    # Primer inicio de segmento dentro de la ventana de cada muestra
+    first = np.searchsorted(times, times - window_sec, side="left")
+    overlap = overlap_cum - overlap_cum[first]
+    envelope = envelope_cum - envelope_cum[first]
+    valid = (first < np.arange(n)) & (envelope > 0)
+    result[valid] = np.clip(overlap[valid] / envelope[valid] * 100.0, 0.0, 100.0)
+    return result
@@ -0,0 +1,185 @@
+"""
+Decimación multi-tasa en flujo continuo para visualización y almacenamiento.
+
+``PolyphaseDecimator`` aplica un FIR anti-aliasing y conserva solo una de
+cada ``factor`` salidas; calcula únicamente las salidas retenidas (forma
+polifásica) usando ventanas deslizantes sobre el historial persistente, por
+lo que procesar por bloques da el mismo resultado sin importar su tamaño.
+
+``MultiRateDecimator`` encadena etapas para producir los niveles 1×, 1/4 y
+1/16 de varias señales a la vez (filtrada y RMS de cada canal).
+
+``MinMaxDecimator`` reduce señales crudas a un par mínimo/máximo por columna
+de píxel para dibujarlas sin ocultar picos.
+"""
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy import signal
+from typing import List, Optional, Sequence, Tuple
+
+from .ring_buffer import RingBuffer
+
+
+class PolyphaseDecimator:
+    """Decimador FIR de fase lineal con estado entre bloques."""
+
+    def __init__(self, factor: int, numtaps: Optional[int] = None, cutoff: Optional[float] = None):
+        self.factor = max(1, int(factor))
+        numtaps = numtaps if numtaps is not None else 8 * self.factor + 1
+        # Longitud impar para que el retardo de grupo sea un número entero de muestras
+        self.numtaps = numtaps + 1 if numtaps % 2 == 0 else numtaps
+        # Corte relativo a Nyquist, con margen para la banda de transición
+        cutoff = cutoff if cutoff is not None else 0.8 / self.factor
+        self.taps = signal.firwin(self.numtaps, cutoff)
+        self._kernel = self.taps[::-1].copy()
+        self.reset()
+
+    @property
+    def delay(self) -> int:
+        """Retardo de grupo en muestras de entrada."""
+        return (self.numtaps - 1) // 2
+
+    def reset(self):
+        self._history: Optional[np.ndarray] = None
+        self._time_history: Optional[np.ndarray] = None
+        self._next = 0
+
+    def process(self, times: np.ndarray, data: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Decima un bloque.
+
+        Args:
+            times: Tiempos de las muestras (n,)
+            data: Señales a decimar (canales, n) o (n,)
+
+        Returns:
+            (tiempos, datos) decimados; los tiempos compensan el retardo del FIR.
+        """
+        times = np.asarray(times, dtype=np.float64)
+        data = np.asarray(data, dtype=np.float64)
+        single = data.ndim == 1
+        if single:
+            data = data[np.newaxis, :]
+        n = times.size
+        if n == 0:
+            empty = np.empty((data.shape[0], 0))
+            return np.empty(0), (empty[0] if single else empty)
+
+        span = self.numtaps - 1
+        if self._history is None:
+            # Arranque sin transitorio: se extiende la primera muestra
+            self._history = np.repeat(data[:, :1], span, axis=1)
+            self._time_history = np.full(span, times[0])
+
+        buffer = np.concatenate((self._history, data), axis=1)
+        time_buffer = np.concatenate((self._time_history, times))
+
+        # Salidas retenidas: índices de bloque next, next + factor, ...
+        count = 0 if self._next >= n else (n - 1 - self._next) // self.factor + 1
+        if count:
+            windows = sliding_window_view(buffer, self.numtaps, axis=1)
+            picked = windows[:, self._next:self._next + self.factor * count:self.factor, :]
+            out = picked @ self._kernel
+            out_times = time_buffer[self._next + span - self.delay:
+                                    self._next + span - self.delay + self.factor * count:self.factor]
+            self._next = self._next + self.factor * count - n
+        else:
+            out = np.empty((data.shape[0], 0))
+            out_times = np.empty(0)
+            self._next -= n
+
+        self._history = buffer[:, -span:] if span else buffer[:, :0]
+        self._time_history = time_buffer[-span:] if span else time_buffer[:0]
+        return out_times, (out[0] if single else out)
+
+
+class MultiRateDecimator:
+    """
+    Cascada de decimadores: nivel 0 = tasa completa, luego ÷4, ÷16...
+
+    ``process`` recibe un bloque de todas las señales y devuelve, por nivel,
+    las muestras nuevas (tiempos, datos) listas para anexar a cada buffer.
+    """
+
+    def __init__(self, factors: Sequence[int] = (4, 4), numtaps: Optional[int] = None):
+        self.stages = [PolyphaseDecimator(factor, numtaps) for factor in factors]
+        self.rates: List[int] = [1]
+        for stage in self.stages:
+            self.rates.append(self.rates[-1] * stage.factor)
+
+    def level_for(self, rate: int) -> int:
+        """Índice del nivel con factor ``rate`` (o el más cercano por debajo)."""
+        eligible = [i for i, value in enumerate(self.rates) if value <= max(1, int(rate))]
+        return eligible[-1] if eligible else 0
+
+    def reset(self):
+        for stage in self.stages:
+            stage.reset()
+
+    def process(self, times: np.ndarray, data: np.ndarray) -> List[Tuple[np.ndarray, np.ndarray]]:
+        times = np.asarray(times, dtype=np.float64)
+        data = np.asarray(data, dtype=np.float64)
+        levels = [(times, data)]
+        for stage in self.stages:
+            times, data = stage.process(times, data)
+            levels.append((times, data))
+        return levels
+
+
+class MinMaxDecimator:
+    """
+    Reducción mínimo/máximo por intervalo de tiempo (una columna de píxel).
+
+    Solo se reducen los intervalos completos; las muestras del intervalo en
+    curso esperan al siguiente bloque. La salida se acumula en un
+    ``RingBuffer`` con dos filas por intervalo (mínimo y máximo), lista para
+    pasarse a pyqtgraph como vista.
+    """
+
+    def __init__(self, bucket_sec: float, channels: int, capacity_buckets: int):
+        self.bucket_sec = float(bucket_sec)
+        self.channels = int(channels)
+        names = ("time",) + tuple(f"ch{i}" for i in range(self.channels))
+        self.output = RingBuffer(2 * max(1, int(capacity_buckets)), names)
+        self.reset()
+
+    def reset(self, bucket_sec: Optional[float] = None):
+        if bucket_sec is not None:
+            self.bucket_sec = float(bucket_sec)
+        self.output.clear()
+        self._pending_t = np.empty(0)
+        self._pending_v = np.empty((self.channels, 0))
+
+    def process(self, times: np.ndarray, data: np.ndarray) -> int:
+        """
+        Agrega muestras (tiempos crecientes) y reduce los intervalos cerrados.
+
+        Returns:
+            Número de intervalos agregados a ``output``.
+        """
+        times = np.concatenate((self._pending_t, np.asarray(times, dtype=np.float64)))
+        data = np.concatenate((self._pending_v, np.asarray(data, dtype=np.float64).reshape(self.channels, -1)), axis=1)
+        if times.size == 0:
+            return 0
+
+        ids = np.floor(times / self.bucket_sec).astype(np.int64)
+        cut = int(np.searchsorted(ids, ids[-1], side="left"))
+        self._pending_t = times[cut:]
+        self._pending_v = data[:, cut:]
+        if cut == 0:
+            return 0
+
+        closed = ids[:cut]
+        starts = np.flatnonzero(np.concatenate(([True], closed[1:] != closed[:-1])))
+        mins = np.minimum.reduceat(data[:, :cut], starts, axis=1)
+        maxs = np.maximum.reduceat(data[:, :cut], starts, axis=1)
+        centers = (closed[starts] + 0.5) * self.bucket_sec
+
+        count = starts.size
+        block = np.empty((self.channels + 1, 2 * count))
+        block[0, 0::2] = centers
+        block[0, 1::2] = centers
+        block[1:, 0::2] = mins
+        block[1:, 1::2] = maxs
+        self.output.extend(block)
+        return count
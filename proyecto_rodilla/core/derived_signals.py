@@ -0,0 +1,101 @@
+"""
+Señales derivadas del ángulo de rodilla calculadas durante la adquisición.
+
+``DerivedSignalStage`` recibe los lotes de ángulo de la IMU y entrega, por
+muestra, la velocidad angular suavizada, la aceleración angular, el ROM
+instantáneo de la repetición en curso y un marcador de repeticiones. Se
+graban en el grupo ``derived`` de la sesión para que el análisis posterior
+lea las series en lugar de volver a derivarlas.
+
+La velocidad es la diferencia finita del ángulo filtrado con un Butterworth
+pasa-bajas de 2° orden (``DERIVED_CUTOFF_HZ``); la aceleración deriva la
+velocidad filtrada otra vez con el mismo filtro. Los estados de los filtros
+se conservan entre lotes, así que el resultado no depende de su tamaño.
+
+El ROM instantáneo es el rango recorrido desde el último valle confirmado
+(antes del primer valle, desde el inicio). ``rep_marker`` vale el número de
+la repetición en la muestra que la cierra y 0 en las demás.
+"""
+import numpy as np
+from scipy import signal
+from typing import Optional, Tuple
+from config import settings as cfg
+from .repetitions import RepetitionDetector
+
+
+class DerivedSignalStage:
+    """Velocidad, aceleración, ROM instantáneo y marcadores de repetición por lotes."""
+
+    def __init__(self, fs: Optional[float] = None, cutoff_hz: Optional[float] = None,
+                 detector: Optional[RepetitionDetector] = None):
+        self.fs = float(fs if fs is not None else cfg.IMU_FS)
+        cutoff = float(cutoff_hz if cutoff_hz is not None else cfg.DERIVED_CUTOFF_HZ)
+        # El corte no puede llegar a Nyquist
+        cutoff = min(cutoff, 0.45 * self.fs)
+        self.sos = signal.butter(2, cutoff, 'lp', fs=self.fs, output='sos')
+        self.detector = detector if detector is not None else RepetitionDetector()
+        self.reset()
+
+    def reset(self):
+        """Reinicia filtros, derivadas y detector (nueva grabación)."""
+        self.detector.reset()
+        self._zi_angle: Optional[np.ndarray] = None
+        self._zi_velocity: Optional[np.ndarray] = None
+        self._prev_time: Optional[float] = None
+        self._prev_angle = 0.0
+        self._prev_velocity = 0.0
+        self._low: Optional[float] = None
+        self._high: Optional[float] = None
+        self._valley: Optional[float] = None
+
+    def _derivative(self, values: np.ndarray, times: np.ndarray, previous: float) -> np.ndarray:
+        """Diferencia finita contra la muestra anterior (0 donde el tiempo no avanza)."""
+        dv = np.diff(values, prepend=previous)
+        dt = np.diff(times, prepend=self._prev_time if self._prev_time is not None else times[0])
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(dt > 0, dv / dt, 0.0)
+
+    def process(self, times: np.ndarray, angle: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Procesa un lote de ángulo (°) con sus tiempos de sesión (s).
+
+        Returns:
+            (rom_instantáneo, velocidad °/s, aceleración °/s², marcador de repetición)
+        """
+        times = np.asarray(times, dtype=np.float64)
+        angle = np.asarray(angle, dtype=np.float64)
+        n = angle.size
+        if n == 0:
+            empty = np.empty(0)
+            return empty, empty, empty, np.zeros(0, dtype=np.uint16)
+
+        if self._zi_angle is None:
+            # Arranque sin transitorio: el filtro parte del primer ángulo en reposo
+            self._zi_angle = signal.sosfilt_zi(self.sos) * angle[0]
+            self._zi_velocity = np.zeros_like(self._zi_angle)
+            self._prev_angle = float(angle[0])
+        smooth, self._zi_angle = signal.sosfilt(self.sos, angle, zi=self._zi_angle)
+        velocity = self._derivative(smooth, times, self._prev_angle)
+        velocity, self._zi_velocity = signal.sosfilt(self.sos, velocity, zi=self._zi_velocity)
+        acceleration = self._derivative(velocity, times, self._prev_velocity)
+        self._prev_angle = float(smooth[-1])
+        self._prev_velocity = float(velocity[-1])
+        self._prev_time = float(times[-1])
+
+        rom = np.empty(n)
+        markers = np.zeros(n, dtype=np.uint16)
+        for i, (value, t_sec) in enumerate(zip(angle.tolist(), times.tolist())):
+            record = self.detector.update(value, t_sec)
+            if record is not None:
+                markers[i] = record.number
+            valley = self.detector.valley_angle
+            if valley != self._valley:
+                # Nueva repetición: el rango se mide desde el valle confirmado
+                self._valley = valley
+                self._low, self._high = valley, value
+            if self._low is None:
+                self._low = self._high = value
+            self._low = min(self._low, value)
+            self._high = max(self._high, value)
+            rom[i] = self._high - self._low
+        return rom, velocity, acceleration, markers
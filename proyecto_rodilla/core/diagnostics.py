@@ -0,0 +1,125 @@
+"""
+Contadores ligeros de rendimiento para las ventanas de adquisición.
+
+Las ventanas registran aquí tiempos y conteos en el camino caliente (solo
+sumas y comparaciones); el overlay de diagnóstico lee ``snapshot`` cuando
+está visible. Los contadores del decodificador (CRC, huecos de secuencia,
+bytes) y la memoria del grabador se leen directamente de esos objetos.
+"""
+import time
+from typing import Dict, Optional
+
+
+class TimingStat:
+    """Última duración, media móvil exponencial y pico (ms) de una etapa."""
+
+    __slots__ = ("alpha", "last", "mean", "peak", "count")
+
+    def __init__(self, alpha: float = 0.1):
+        self.alpha = float(alpha)
+        self.reset()
+
+    def reset(self):
+        self.last = 0.0
+        self.mean = 0.0
+        self.peak = 0.0
+        self.count = 0
+
+    def add(self, value_ms: float):
+        self.last = value_ms
+        self.mean = value_ms if self.count == 0 else self.mean + self.alpha * (value_ms - self.mean)
+        if value_ms > self.peak:
+            self.peak = value_ms
+        self.count += 1
+
+    def take_peak(self) -> float:
+        """Pico desde la lectura anterior (se reinicia al leerlo)."""
+        peak, self.peak = self.peak, 0.0
+        return peak
+
+
+class RateMeter:
+    """Tasa por segundo de un contador acumulado, medida entre lecturas."""
+
+    def __init__(self, min_interval_sec: float = 0.25):
+        self.min_interval_sec = float(min_interval_sec)
+        self.reset()
+
+    def reset(self):
+        self.rate = 0.0
+        self._last_total: Optional[int] = None
+        self._last_time = 0.0
+
+    def update(self, total: int) -> float:
+        now = time.monotonic()
+        if self._last_total is None or total < self._last_total:
+            self._last_total, self._last_time = total, now
+            return self.rate
+        elapsed = now - self._last_time
+        if elapsed >= self.min_interval_sec:
+            self.rate = (total - self._last_total) / elapsed
+            self._last_total, self._last_time = total, now
+        return self.rate
+
+
+class DiagnosticsCounters:
+    """Contadores de refresco, DSP y latencia del bucle de eventos de una ventana."""
+
+    def __init__(self):
+        self.refresh = TimingStat()
+        self.dsp = TimingStat()
+        self.event_lag = TimingStat()
+        self.serial_rate = RateMeter()
+        self.frames_per_refresh = 0.0
+        self._frames = 0
+        self._dsp_sec = 0.0
+
+    def reset(self):
+        self.refresh.reset()
+        self.dsp.reset()
+        self.event_lag.reset()
+        self.serial_rate.reset()
+        self.frames_per_refresh = 0.0
+        self._frames = 0
+        self._dsp_sec = 0.0
+
+    def add_frames(self, count: int, dsp_sec: float):
+        """Suma ``count`` frames procesados y su tiempo de procesamiento (s)."""
+        self._frames += count
+        self._dsp_sec += dsp_sec
+
+    def add_dsp(self, dsp_sec: float):
+        """Suma tiempo de procesamiento por bloques (s) al bloque en curso."""
+        self._dsp_sec += dsp_sec
+
+    def close_refresh(self, refresh_ms: float):
+        """Cierra el bloque entre dos refrescos: frames recibidos y DSP acumulado."""
+        self.refresh.add(refresh_ms)
+        self.frames_per_refresh = float(self._frames)
+        self.dsp.add(self._dsp_sec * 1000.0)
+        self._frames = 0
+        self._dsp_sec = 0.0
+
+    def snapshot(self, decoder=None, recorder=None) -> Dict[str, Optional[float]]:
+        """Valores actuales para mostrar; ``None`` donde la fuente no existe."""
+        values: Dict[str, Optional[float]] = {
+            "refresh_ms": self.refresh.mean,
+            "refresh_peak_ms": self.refresh.take_peak(),
+            "frames_per_refresh": self.frames_per_refresh,
+            "event_lag_ms": self.event_lag.mean,
+            "event_lag_peak_ms": self.event_lag.take_peak(),
+            "dsp_ms": self.dsp.mean,
+            "frames_decoded": None,
+            "crc_errors": None,
+            "sequence_gaps": None,
+            "serial_bytes_per_sec": None,
+            "recorder_bytes": None,
+        }
+        if decoder is not None:
+            values["frames_decoded"] = float(decoder.frames_decoded)
+            values["crc_errors"] = float(decoder.crc_errors)
+            values["sequence_gaps"] = float(decoder.sequence_gaps)
+            values["serial_bytes_per_sec"] = self.serial_rate.update(decoder.bytes_received)
+        if recorder is not None:
+            values["recorder_bytes"] = float(recorder.memory_bytes)
+        return values
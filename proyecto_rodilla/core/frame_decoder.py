@@ -5,6 +5,10 @@ import struct
 from typing import Optional, Dict, List
 from config import settings as cfg
 
+# Sensibilidad del MPU6050 en los rangos configurados (±2 g y ±250 °/s)
+ACCEL_LSB_PER_G = 16384.0
+GYRO_LSB_PER_DPS = 131.0
+
 
 def crc16_ccitt(data: bytes, initial_crc: int = 0xFFFF) -> int:
     """Calcula CRC16 CCITT-FALSE (polinomio 0x1021, inicial 0xFFFF)."""
@@ -25,6 +29,16 @@ class FrameDecoder:
     
     def __init__(self):
         self.buffer = bytearray()
+        self.reset_counters()
+
+    def reset_counters(self):
+        """Reinicia los contadores de diagnóstico."""
+        self.bytes_received = 0
+        self.frames_decoded = 0
+        self.crc_errors = 0
+        # Frames perdidos según el salto de SEQ (uint16) de cada tipo
+        self.sequence_gaps = 0
+        self._last_seq: Dict[str, int] = {}
     
     def feed(self, data: bytes) -> List[Dict]:
         """
@@ -34,6 +48,7 @@ class FrameDecoder:
             Lista de diccionarios con frames decodificados
         """
         self.buffer.extend(data)
+        self.bytes_received += len(data)
         frames = []
         
         while len(self.buffer) >= 7:  # Mínimo: preámbulo + tipo + CRC
@@ -77,12 +92,26 @@ class FrameDecoder:
                 decoded = self._decode_payload(frame_type, payload)
                 if decoded:
                     frames.append(decoded)
+                    self.frames_decoded += 1
+                    self._count_sequence(decoded)
+            else:
+                self.crc_errors += 1
             
             # Avanzar buffer
             self.buffer = self.buffer[total_frame_size:]
         
         return frames
     
+    def _count_sequence(self, frame: Dict):
+        seq = frame['seq']
+        last = self._last_seq.get(frame['type'])
+        self._last_seq[frame['type']] = seq
+        if last is not None:
+            gap = (seq - last - 1) & 0xFFFF
+            # Saltos hacia atrás (reinicio del dispositivo) no cuentan como pérdidas
+            if gap < 0x8000:
+                self.sequence_gaps += gap
+
     def _decode_payload(self, frame_type: int, payload: bytes) -> Optional[Dict]:
         """Decodifica el payload según el tipo de frame."""
         try:
@@ -99,7 +128,10 @@ class FrameDecoder:
                     'seq': seq,
                     'timestamp_us': ts,
                     'ch0': ch0_v,
-                    'ch1': ch1_v
+                    'ch1': ch1_v,
+                    # Códigos originales del ADC para almacenamiento exacto
+                    'ch0_counts': raw_a,
+                    'ch1_counts': raw_b
                 }
             
             elif frame_type == cfg.FRAME_TYPE_IMU:
@@ -112,12 +144,13 @@ class FrameDecoder:
                     'type': 'IMU',
                     'seq': seq,
                     'timestamp_us': ts,
-                    'ax': ax / 16384.0,  # en g
-                    'ay': ay / 16384.0,
-                    'az': az / 16384.0,
-                    'gx': gx / 131.0,    # en °/s
-                    'gy': gy / 131.0,
-                    'gz': gz / 131.0
+                    'ax': ax / ACCEL_LSB_PER_G,  # en g
+                    'ay': ay / ACCEL_LSB_PER_G,
+                    'az': az / ACCEL_LSB_PER_G,
+                    'gx': gx / GYRO_LSB_PER_DPS,    # en °/s
+                    'gy': gy / GYRO_LSB_PER_DPS,
+                    'gz': gz / GYRO_LSB_PER_DPS,
+                    'counts': (ax, ay, az, gx, gy, gz)
                 }
         except struct.error:
             return None
@@ -0,0 +1,106 @@
+"""
+Control adaptativo de la tasa de refresco de las gráficas en vivo.
+
+El temporizador de gráficas comparte el hilo de interfaz con la entrega de
+frames seriales; si un refresco tarda más que su intervalo, los frames se
+encolan y el procesamiento se retrasa. ``FrameRateController`` mide el
+costo de cada refresco (media móvil exponencial) y elige el intervalo para
+que los refrescos no ocupen más de ``budget`` del tiempo del hilo.
+
+El retraso de adquisición se estima comparando el tiempo de la última
+muestra procesada con el reloj de pared: si crece por encima de
+``backlog_limit_sec``, primero se baja la calidad de dibujo (más decimación)
+y solo después se alarga el intervalo.
+"""
+import time
+from typing import Optional
+from config import settings as cfg
+
+
+class FrameRateController:
+    """Ajusta intervalo y nivel de calidad de las gráficas a un presupuesto de CPU."""
+
+    def __init__(self, target_fps: Optional[float] = None, budget: Optional[float] = None,
+                 max_quality_level: int = 2, min_fps: float = 5.0, backlog_limit_sec: float = 0.25,
+                 enabled: Optional[bool] = None, hold_sec: float = 1.0):
+        target_fps = target_fps if target_fps is not None else cfg.UPDATE_FPS
+        self.target_interval_ms = 1000.0 / max(1.0, float(target_fps))
+        self.max_interval_ms = max(self.target_interval_ms, 1000.0 / max(1.0, float(min_fps)))
+        self.budget = float(budget if budget is not None else cfg.PLOT_CPU_BUDGET)
+        self.max_quality_level = max(0, int(max_quality_level))
+        self.backlog_limit_sec = float(backlog_limit_sec)
+        self.enabled = bool(cfg.ADAPTIVE_FRAME_RATE if enabled is None else enabled)
+        self.hold_sec = float(hold_sec)
+        self.reset()
+
+    def reset(self):
+        """Vuelve a la tasa objetivo y a calidad máxima."""
+        self.interval_ms = self.target_interval_ms
+        # 0 = calidad completa; cada nivel aumenta la decimación de dibujo
+        self.quality_level = 0
+        self.cost_ms = 0.0
+        self.last_cost_ms = 0.0
+        self.backlog_sec = 0.0
+        self._started: Optional[float] = None
+        self._stream_offset: Optional[float] = None
+        self._last_change = 0.0
+
+    def observe_stream(self, t_stream_sec: float):
+        """Registra el tiempo (s) de la última muestra procesada para estimar el retraso."""
+        offset = time.perf_counter() - t_stream_sec
+        # El menor desfase observado es la referencia sin cola (tolera deriva lenta)
+        if self._stream_offset is None or offset < self._stream_offset:
+            self._stream_offset = offset
+        self.backlog_sec = offset - self._stream_offset
+
+    def begin(self):
+        """Marca el inicio de un refresco."""
+        self._started = time.perf_counter()
+
+    def end(self) -> bool:
+        """
+        Cierra la medición del refresco y ajusta los parámetros.
+
+        Returns:
+            True si cambió el intervalo o el nivel de calidad.
+        """
+        if self._started is None:
+            return False
+        now = time.perf_counter()
+        cost = (now - self._started) * 1000.0
+        self._started = None
+        self.last_cost_ms = cost
+        self.cost_ms = cost if self.cost_ms == 0.0 else 0.8 * self.cost_ms + 0.2 * cost
+        if not self.enabled:
+            return False
+
+        interval, quality = self.interval_ms, self.quality_level
+        can_change_quality = now - self._last_change >= self.hold_sec
+        needed = self.cost_ms / max(self.budget, 1e-3)
+
+        if self.backlog_sec > self.backlog_limit_sec:
+            # Adquisición atrasada: primero menos calidad, luego menos refrescos
+            if quality < self.max_quality_level:
+                if can_change_quality:
+                    quality += 1
+            else:
+                interval = min(self.max_interval_ms, interval * 1.5)
+        elif needed > interval:
+            interval = min(self.max_interval_ms, needed * 1.1)
+            if interval >= self.max_interval_ms and quality < self.max_quality_level and can_change_quality:
+                quality += 1
+        elif needed < 0.5 * interval and interval > self.target_interval_ms:
+            interval = max(self.target_interval_ms, interval * 0.8)
+        elif (quality > 0 and interval <= self.target_interval_ms and needed < 0.5 * interval
+              and self.backlog_sec < 0.5 * self.backlog_limit_sec and can_change_quality):
+            quality -= 1
+
+        changed = quality != self.quality_level or abs(interval - self.interval_ms) >= 1.0
+        if quality != self.quality_level:
+            self._last_change = now
+        self.interval_ms, self.quality_level = interval, quality
+        return changed
+
+    @property
+    def fps(self) -> float:
+        return 1000.0 / self.interval_ms
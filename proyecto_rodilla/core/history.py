@@ -0,0 +1,173 @@
+"""
+Historial de memoria acotada para revisar señales en vivo.
+
+``HistoryPyramid`` conserva los últimos ``full_res_sec`` segundos muestra a
+muestra (nivel 0) y, encima, niveles con intervalos cada vez más anchos
+(×``factor``) que guardan mínimo, máximo y media por canal. Cada nivel es un
+``RingBuffer`` de ``capacity`` intervalos, así que la memoria no depende de
+la duración de la sesión; se agregan niveles hasta cubrir ``max_sec``.
+
+Las muestras se incorporan por bloques: solo se reducen los intervalos
+cerrados y cada nivel se construye a partir de los intervalos cerrados del
+nivel inferior. Las consultas eligen el nivel más fino que cubre el rango
+pedido con a lo sumo ``columns`` intervalos, de modo que el costo de dibujo
+es constante sin importar el zoom.
+"""
+import numpy as np
+from typing import List, Optional, Sequence, Tuple
+
+from .ring_buffer import RingBuffer
+
+
+class _Level:
+    """Un nivel de la pirámide: intervalos de ``width`` segundos."""
+
+    def __init__(self, width: float, channels: int, capacity: int):
+        self.width = float(width)
+        self.channels = int(channels)
+        # Filas: tiempo (centro), conteo, mínimos, máximos y medias por canal
+        names = ("time", "count") + tuple(
+            f"{stat}{i}" for stat in ("min", "max", "mean") for i in range(self.channels)
+        )
+        self.ring = RingBuffer(capacity, names)
+        self.reset()
+
+    def reset(self):
+        self.ring.clear()
+        self._pending = np.empty((2 + 3 * self.channels, 0))
+
+    def process(self, block: np.ndarray) -> np.ndarray:
+        """Agrega intervalos (o muestras) del nivel inferior y devuelve los intervalos cerrados."""
+        block = np.concatenate((self._pending, block), axis=1)
+        if block.shape[1] == 0:
+            return block
+        ids = np.floor(block[0] / self.width).astype(np.int64)
+        cut = int(np.searchsorted(ids, ids[-1], side="left"))
+        self._pending = block[:, cut:]
+        if cut == 0:
+            return block[:, :0]
+
+        c = self.channels
+        closed = block[:, :cut]
+        starts = np.flatnonzero(np.concatenate(([True], ids[1:cut] != ids[:cut - 1])))
+        counts = np.add.reduceat(closed[1], starts)
+        out = np.empty((closed.shape[0], starts.size))
+        out[0] = (ids[starts] + 0.5) * self.width
+        out[1] = counts
+        out[2:2 + c] = np.minimum.reduceat(closed[2:2 + c], starts, axis=1)
+        out[2 + c:2 + 2 * c] = np.maximum.reduceat(closed[2 + c:2 + 2 * c], starts, axis=1)
+        out[2 + 2 * c:] = np.add.reduceat(closed[2 + 2 * c:] * closed[1], starts, axis=1) / counts
+        self.ring.extend(out)
+        return out
+
+
+class HistoryPyramid:
+    """Historial multi-resolución (muestras recientes + niveles min/máx/media)."""
+
+    def __init__(self, names: Sequence[str], sample_rate: float, full_res_sec: float,
+                 max_sec: float, factor: int = 4, capacity: int = 4096):
+        self.names = tuple(names)
+        self._index = {name: i for i, name in enumerate(self.names)}
+        self.sample_rate = float(sample_rate)
+        self.factor = max(2, int(factor))
+        channels = len(self.names)
+
+        self.raw = RingBuffer(max(1, int(full_res_sec * self.sample_rate)), ("time",) + self.names)
+        self.levels: List[_Level] = []
+        width = self.factor / self.sample_rate
+        while True:
+            self.levels.append(_Level(width, channels, capacity))
+            if capacity * width >= max_sec:
+                break
+            width *= self.factor
+
+    def reset(self):
+        self.raw.clear()
+        for level in self.levels:
+            level.reset()
+
+    def __len__(self) -> int:
+        return len(self.raw)
+
+    @property
+    def memory_bytes(self) -> int:
+        return self.raw.nbytes + sum(level.ring.nbytes for level in self.levels)
+
+    def extend(self, times: np.ndarray, data: np.ndarray):
+        """Agrega muestras (tiempos crecientes; ``data`` es canales × n)."""
+        times = np.asarray(times, dtype=np.float64)
+        if times.size == 0:
+            return
+        data = np.asarray(data, dtype=np.float64).reshape(len(self.names), -1)
+        self.raw.extend(np.vstack((times, data)))
+        # Cada muestra entra como un intervalo de conteo 1
+        block = np.vstack((times, np.ones_like(times), data, data, data))
+        for level in self.levels:
+            block = level.process(block)
+            if block.shape[1] == 0:
+                break
+
+    def _raw_start(self) -> Optional[float]:
+        return float(self.raw.view()[0, 0]) if len(self.raw) else None
+
+    def select_level(self, t_start: float, t_end: float, columns: int) -> int:
+        """
+        Nivel para dibujar ``[t_start, t_end]`` en ``columns`` columnas.
+
+        Returns:
+            0 para muestras crudas, ``k`` para ``levels[k - 1]``.
+        """
+        span = max(0.0, t_end - t_start)
+        columns = max(1, int(columns))
+        raw_start = self._raw_start()
+        # Crudo: dos puntos por columna como máximo (lo mismo que min/máx)
+        if raw_start is not None and raw_start <= t_start and span * self.sample_rate <= 2 * columns:
+            return 0
+        for k, level in enumerate(self.levels, start=1):
+            if span / level.width > columns:
+                continue
+            ring = level.ring
+            # Si aún no se llenó, contiene todo lo recibido desde el inicio
+            if len(ring) < ring.capacity or float(ring.view()[0, 0]) - 0.5 * level.width <= t_start:
+                return k
+        return len(self.levels)
+
+    def _window(self, level: int, t_start: float, t_end: float) -> np.ndarray:
+        if level == 0:
+            return self.raw.window(t_start, t_end)
+        width = self.levels[level - 1].width
+        return self.levels[level - 1].ring.window(t_start - width, t_end + width)
+
+    def envelope(self, name: str, t_start: float, t_end: float, columns: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Pares mínimo/máximo por intervalo (o las muestras crudas) de ``name`` en el rango."""
+        level = self.select_level(t_start, t_end, columns)
+        data = self._window(level, t_start, t_end)
+        i = self._index[name]
+        if level == 0:
+            return data[0], data[1 + i]
+        c = len(self.names)
+        count = data.shape[1]
+        times = np.empty(2 * count)
+        values = np.empty(2 * count)
+        times[0::2] = data[0]
+        times[1::2] = data[0]
+        values[0::2] = data[2 + i]
+        values[1::2] = data[2 + c + i]
+        return times, values
+
+    def mean(self, name: str, t_start: float, t_end: float, columns: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Media por intervalo (o las muestras crudas) de ``name`` en el rango."""
+        level = self.select_level(t_start, t_end, columns)
+        data = self._window(level, t_start, t_end)
+        i = self._index[name]
+        if level == 0:
+            return data[0], data[1 + i]
+        return data[0], data[2 + 2 * len(self.names) + i]
+
+    @property
+    def start_time(self) -> Optional[float]:
+        """Tiempo más antiguo disponible en algún nivel."""
+        ring = self.levels[-1].ring
+        if len(ring):
+            return float(ring.view()[0, 0]) - 0.5 * self.levels[-1].width
+        return self._raw_start()
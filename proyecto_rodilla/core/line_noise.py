@@ -0,0 +1,120 @@
+"""
+Cancelador adaptativo de interferencia de red (50/60 Hz y armónicos).
+
+Implementa un cancelador LMS con sinusoides de referencia: para cada armónico
+se mantienen dos pesos (coseno/seno) que modelan amplitud y fase de la
+interferencia, y se resta la estimación de la señal. La frecuencia
+fundamental se sigue a partir de la rotación del fasor del primer armónico.
+"""
+import numpy as np
+from typing import Optional
+from config import settings as cfg
+
+
+class LineNoiseCanceller:
+    """Cancelador LMS de la fundamental de red y ``harmonics - 1`` armónicos."""
+
+    def __init__(self, fs: Optional[float] = None, fundamental: Optional[float] = None,
+                 harmonics: Optional[int] = None, mu: Optional[float] = None,
+                 track_frequency: bool = True, max_deviation_hz: float = 3.0,
+                 block_size: int = 32):
+        self.fs = fs if fs is not None else cfg.EMG_FS
+        self.nominal_freq = fundamental if fundamental is not None else cfg.EMG_NOTCH_FREQ
+        requested = harmonics if harmonics is not None else cfg.EMG_LINE_HARMONICS
+        # Solo armónicos por debajo de Nyquist
+        nyquist_limit = int((self.fs / 2.0) // self.nominal_freq)
+        self.harmonics = max(1, min(int(requested), nyquist_limit))
+        self.mu = mu if mu is not None else cfg.EMG_LINE_MU
+        self.track_frequency = track_frequency
+        self.max_deviation_hz = max_deviation_hz
+        self.block_size = max(1, int(block_size))
+
+        self._orders = np.arange(1, self.harmonics + 1, dtype=np.float64)
+        # Seguimiento de frecuencia: se evalúa cada ~100 ms
+        self._track_interval = max(1, int(self.fs * 0.1))
+        self._track_gain = 0.5
+        self.reset()
+
+    def reset(self):
+        """Reinicia pesos, fase y frecuencia."""
+        self.frequency = float(self.nominal_freq)
+        self.phase = 0.0
+        self.weights = np.zeros((2, self.harmonics), dtype=np.float64)
+        self._since_track = 0
+        self._ref_phasor = complex(0.0, 0.0)
+
+    @property
+    def amplitude(self) -> np.ndarray:
+        """Amplitud estimada de cada armónico (unidades de la señal)."""
+        return np.hypot(self.weights[0], self.weights[1])
+
+    def _phase_step(self) -> float:
+        return 2.0 * np.pi * self.frequency / self.fs
+
+    def _fundamental_phasor(self) -> complex:
+        return complex(self.weights[0, 0], -self.weights[1, 0])
+
+    def _track(self, elapsed: int):
+        """Corrige la frecuencia con la rotación del fasor fundamental."""
+        phasor = self._fundamental_phasor()
+        previous = self._ref_phasor
+        self._ref_phasor = phasor
+        self._since_track = 0
+        if not self.track_frequency or abs(previous) < 1e-12 or abs(phasor) < 1e-12:
+            return
+        rotation = np.angle(phasor * previous.conjugate())
+        offset_hz = rotation * self.fs / (2.0 * np.pi * elapsed)
+        low = self.nominal_freq - self.max_deviation_hz
+        high = self.nominal_freq + self.max_deviation_hz
+        self.frequency = float(np.clip(self.frequency + self._track_gain * offset_hz, low, high))
+
+    def process_sample(self, sample: float) -> float:
+        """Cancela la interferencia de una muestra (LMS muestra a muestra)."""
+        angles = self._orders * self.phase
+        cos_ref = np.cos(angles)
+        sin_ref = np.sin(angles)
+        estimate = float(self.weights[0] @ cos_ref + self.weights[1] @ sin_ref)
+        error = sample - estimate
+        step = 2.0 * self.mu * error
+        self.weights[0] += step * cos_ref
+        self.weights[1] += step * sin_ref
+
+        self.phase = (self.phase + self._phase_step()) % (2.0 * np.pi)
+        self._since_track += 1
+        if self._since_track >= self._track_interval:
+            self._track(self._since_track)
+        return error
+
+    def process_block(self, samples: np.ndarray) -> np.ndarray:
+        """
+        Versión vectorizada (LMS por bloques).
+
+        Los pesos se mantienen fijos dentro de sub-bloques de ``block_size``
+        muestras y se actualizan con el gradiente acumulado del sub-bloque.
+        """
+        samples = np.asarray(samples, dtype=np.float64)
+        out = np.empty_like(samples)
+        step_phase = self._phase_step()
+        n = samples.size
+        start = 0
+        while start < n:
+            stop = min(n, start + self.block_size)
+            count = stop - start
+            phases = self.phase + step_phase * np.arange(count)
+            angles = np.outer(phases, self._orders)
+            cos_ref = np.cos(angles)
+            sin_ref = np.sin(angles)
+            estimate = cos_ref @ self.weights[0] + sin_ref @ self.weights[1]
+            error = samples[start:stop] - estimate
+            out[start:stop] = error
+            scale = 2.0 * self.mu
+            self.weights[0] += scale * (error @ cos_ref)
+            self.weights[1] += scale * (error @ sin_ref)
+
+            self.phase = (self.phase + step_phase * count) % (2.0 * np.pi)
+            self._since_track += count
+            if self._since_track >= self._track_interval:
+                self._track(self._since_track)
+                step_phase = self._phase_step()
+            start = stop
+        return out
@@ -0,0 +1,244 @@
+"""
+Filtros de orientación para el ángulo de flexión en el plano sagital.
+
+Todos los backends fusionan el ángulo absoluto del acelerómetro con la
+velocidad angular del giroscopio. Cada uno ofrece una forma por muestra
+(``step``) y una forma por bloque (``step_block``) que produce exactamente
+la misma secuencia de ángulos.
+"""
+import numpy as np
+from scipy import signal
+from typing import Optional, Tuple
+from config import settings as cfg
+
+
+class GyroBiasTracker:
+    """
+    Estima el sesgo del giroscopio mientras el segmento está en reposo.
+
+    El reposo se detecta cuando la velocidad angular corregida y la norma del
+    acelerómetro (≈1 g) se mantienen estables durante ``min_still_samples``
+    muestras consecutivas. Durante el reposo el sesgo sigue una media móvil
+    exponencial de la lectura del giroscopio.
+    """
+
+    def __init__(self, gyro_threshold: Optional[float] = None, accel_tolerance: float = 0.05,
+                 min_still_samples: Optional[int] = None, rate: float = 0.02):
+        self.gyro_threshold = gyro_threshold if gyro_threshold is not None else cfg.STILLNESS_GYRO_THRESHOLD
+        self.accel_tolerance = accel_tolerance
+        # Medio segundo de reposo por defecto
+        self.min_still_samples = min_still_samples if min_still_samples is not None else max(1, int(cfg.IMU_FS * 0.5))
+        self.rate = rate
+
+        self.bias = 0.0
+        self.is_still = False
+        self._still_run = 0
+
+    def update(self, gyro_rate: float, accel_norm: float) -> float:
+        """Actualiza con una muestra y retorna el sesgo vigente (°/s)."""
+        quiet = (abs(gyro_rate - self.bias) < self.gyro_threshold
+                 and abs(accel_norm - 1.0) < self.accel_tolerance)
+        self._still_run = self._still_run + 1 if quiet else 0
+        self.is_still = self._still_run >= self.min_still_samples
+        if self.is_still:
+            self.bias += self.rate * (gyro_rate - self.bias)
+        return self.bias
+
+    def update_block(self, gyro_rate: np.ndarray, accel_norm: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Versión vectorizada de ``update``.
+
+        La detección de reposo usa el sesgo vigente al inicio del bloque.
+
+        Returns:
+            (sesgo por muestra, máscara de reposo)
+        """
+        gyro_rate = np.asarray(gyro_rate, dtype=np.float64)
+        quiet = ((np.abs(gyro_rate - self.bias) < self.gyro_threshold)
+                 & (np.abs(np.asarray(accel_norm, dtype=np.float64) - 1.0) < self.accel_tolerance))
+        if quiet.size == 0:
+            return np.empty(0), np.zeros(0, dtype=bool)
+
+        # Longitud de racha consecutiva, continuando la del bloque anterior
+        counts = np.cumsum(quiet)
+        last_reset = np.maximum.accumulate(np.where(~quiet, counts, 0))
+        run = counts - last_reset
+        leading = np.maximum.accumulate(~quiet) == 0
+        run[leading] += self._still_run
+        still = run >= self.min_still_samples
+
+        bias = np.full(gyro_rate.shape, self.bias)
+        if np.any(still):
+            # EMA sobre las muestras en reposo: b_k = (1 - r) b_{k-1} + r g_k
+            decay = 1.0 - self.rate
+            still_bias, _ = signal.lfilter([self.rate], [1.0, -decay], gyro_rate[still], zi=[decay * self.bias])
+            idx = np.flatnonzero(still)
+            fill = np.zeros(gyro_rate.shape, dtype=np.int64)
+            fill[idx] = np.arange(1, idx.size + 1)
+            fill = np.maximum.accumulate(fill)
+            values = np.concatenate(([self.bias], still_bias))
+            bias = values[fill]
+            self.bias = float(still_bias[-1])
+
+        self._still_run = int(run[-1]) if quiet[-1] else 0
+        self.is_still = bool(still[-1])
+        return bias, still
+
+    def reset(self):
+        """Olvida el sesgo estimado."""
+        self.bias = 0.0
+        self.is_still = False
+        self._still_run = 0
+
+
+class OrientationFilter:
+    """
+    Interfaz común de los backends de orientación.
+
+    El ángulo se pasa explícitamente para que ``AngleCalculator`` siga siendo
+    el dueño del estado angular (la calibración lo reescribe).
+    """
+
+    name = ""
+
+    def step(self, angle: float, angle_accel: float, gyro_rate: float, dt: float,
+             still: bool = False) -> float:
+        raise NotImplementedError
+
+    def step_block(self, angle: float, angle_accel: np.ndarray, gyro_rate: np.ndarray,
+                   dt: np.ndarray, still: Optional[np.ndarray] = None) -> np.ndarray:
+        """Forma por bloque genérica: itera ``step`` sobre los arreglos."""
+        out = np.empty(len(angle_accel), dtype=np.float64)
+        if still is None:
+            still = np.zeros(len(angle_accel), dtype=bool)
+        for i, (acc, rate, delta, quiet) in enumerate(zip(angle_accel.tolist(), gyro_rate.tolist(),
+                                                           dt.tolist(), still.tolist())):
+            angle = self.step(angle, acc, rate, delta, quiet)
+            out[i] = angle
+        return out
+
+    def reset(self):
+        pass
+
+
+class ComplementaryFilter(OrientationFilter):
+    """Filtro complementario de α fijo (comportamiento histórico)."""
+
+    name = "complementary"
+
+    def __init__(self, alpha: Optional[float] = None):
+        self.alpha = alpha if alpha is not None else cfg.COMPLEMENTARY_FILTER_ALPHA
+
+    def step(self, angle, angle_accel, gyro_rate, dt, still=False):
+        angle_gyro = angle + gyro_rate * dt
+        return self.alpha * angle_gyro + (1 - self.alpha) * angle_accel
+
+    def step_block(self, angle, angle_accel, gyro_rate, dt, still=None):
+        # y[n] = α y[n-1] + (α g[n] dt[n] + (1 - α) acc[n])  → IIR de primer orden
+        alpha = self.alpha
+        drive = alpha * gyro_rate * dt + (1 - alpha) * angle_accel
+        out, _ = signal.lfilter([1.0], [1.0, -alpha], drive, zi=[alpha * angle])
+        return out
+
+
+class KalmanAngleFilter(OrientationFilter):
+    """
+    Filtro de Kalman 1-D con estados [ángulo, sesgo del giroscopio].
+
+    En reposo se añade una pseudo-medición de velocidad nula que observa el
+    sesgo directamente.
+    """
+
+    name = "kalman"
+
+    def __init__(self, q_angle: float = 0.001, q_bias: float = 0.003,
+                 r_measure: float = 0.03, r_still: float = 0.1):
+        self.q_angle = q_angle
+        self.q_bias = q_bias
+        self.r_measure = r_measure
+        self.r_still = r_still
+        self.reset()
+
+    def reset(self):
+        self.bias = 0.0
+        self.P = [[0.0, 0.0], [0.0, 0.0]]
+
+    def step(self, angle, angle_accel, gyro_rate, dt, still=False):
+        (p00, p01), (p10, p11) = self.P
+        bias = self.bias
+
+        # Predicción
+        angle += dt * (gyro_rate - bias)
+        p00 += dt * (dt * p11 - p01 - p10 + self.q_angle)
+        p01 -= dt * p11
+        p10 -= dt * p11
+        p11 += self.q_bias * dt
+
+        # Corrección con el ángulo del acelerómetro (H = [1, 0])
+        s = p00 + self.r_measure
+        k0 = p00 / s
+        k1 = p10 / s
+        y = angle_accel - angle
+        angle += k0 * y
+        bias += k1 * y
+        p00, p01, p10, p11 = p00 - k0 * p00, p01 - k0 * p01, p10 - k1 * p00, p11 - k1 * p01
+
+        # Pseudo-medición de reposo (H = [0, 1], z = velocidad medida)
+        if still:
+            s = p11 + self.r_still
+            k0 = p01 / s
+            k1 = p11 / s
+            y = gyro_rate - bias
+            angle += k0 * y
+            bias += k1 * y
+            p00, p01, p10, p11 = p00 - k0 * p10, p01 - k0 * p11, p10 - k1 * p10, p11 - k1 * p11
+
+        self.P = [[p00, p01], [p10, p11]]
+        self.bias = bias
+        return angle
+
+
+class MahonyFilter(OrientationFilter):
+    """
+    Filtro de Mahony reducido al plano sagital (PI sobre el error de ángulo).
+
+    El término integral converge al sesgo del giroscopio.
+    """
+
+    name = "mahony"
+
+    def __init__(self, kp: float = 1.0, ki: float = 0.05):
+        self.kp = kp
+        self.ki = ki
+        self.reset()
+
+    def reset(self):
+        self.integral = 0.0
+
+    @property
+    def bias(self) -> float:
+        return -self.integral
+
+    def step(self, angle, angle_accel, gyro_rate, dt, still=False):
+        error = angle_accel - angle
+        gain = self.ki * (10.0 if still else 1.0)
+        self.integral += gain * error * dt
+        return angle + (gyro_rate + self.kp * error + self.integral) * dt
+
+
+ORIENTATION_FILTERS = {
+    ComplementaryFilter.name: ComplementaryFilter,
+    KalmanAngleFilter.name: KalmanAngleFilter,
+    MahonyFilter.name: MahonyFilter,
+}
+
+
+def create_orientation_filter(name: Optional[str] = None, alpha: Optional[float] = None) -> OrientationFilter:
+    """Construye el backend indicado (por defecto ``ORIENTATION_FILTER``)."""
+    key = (name or cfg.ORIENTATION_FILTER or ComplementaryFilter.name).lower()
+    if key == ComplementaryFilter.name:
+        return ComplementaryFilter(alpha)
+    filter_cls = ORIENTATION_FILTERS.get(key)
+    if filter_cls is None:
+        raise ValueError(f"Filtro de orientación desconocido: {name}")
+    return filter_cls()
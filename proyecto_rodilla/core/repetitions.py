@@ -0,0 +1,229 @@
+"""
+Segmentación de repeticiones de flexo-extensión a partir del ángulo de rodilla.
+
+Los picos y valles se confirman con histéresis (zig-zag): un extremo se
+acepta cuando el ángulo se aleja de él al menos ``hysteresis_deg``. Una
+repetición va de un valle al siguiente pasando por un pico.
+
+``RepetitionDetector`` trabaja muestra a muestra durante la adquisición y
+``detect_repetitions`` da el mismo resultado sobre una sesión completa
+recorriendo solo los puntos de inflexión.
+"""
+from dataclasses import asdict, dataclass
+import numpy as np
+from typing import Dict, List, Optional, Tuple
+from config import settings as cfg
+
+
+@dataclass
+class RepetitionRecord:
+    """Una repetición valle → pico → valle."""
+
+    number: int
+    start_time: float
+    peak_time: float
+    end_time: float
+    angle_min: float
+    angle_max: float
+    rom: float
+    peak_velocity: float
+    start_index: int
+    end_index: int
+
+    @property
+    def duration(self) -> float:
+        return self.end_time - self.start_time
+
+    def to_dict(self) -> Dict[str, float]:
+        payload = asdict(self)
+        payload["duration"] = self.duration
+        return payload
+
+
+# (ángulo, tiempo, índice de muestra)
+_Point = Tuple[float, float, int]
+
+
+class RepetitionDetector:
+    """Detector de repeticiones en línea con histéresis de picos y valles."""
+
+    def __init__(self, hysteresis_deg: Optional[float] = None, min_duration_sec: Optional[float] = None):
+        self.hysteresis_deg = hysteresis_deg if hysteresis_deg is not None else cfg.REP_HYSTERESIS_DEG
+        self.min_duration_sec = min_duration_sec if min_duration_sec is not None else cfg.REP_MIN_DURATION_SEC
+        self.reset()
+
+    def reset(self):
+        """Olvida las repeticiones y el estado del zig-zag."""
+        self.records: List[RepetitionRecord] = []
+        # 0: sin dirección, 1: buscando pico, -1: buscando valle
+        self._mode = 0
+        self._max: Optional[_Point] = None
+        self._min: Optional[_Point] = None
+        self._valley: Optional[_Point] = None
+        self._peak: Optional[_Point] = None
+        self._index = 0
+        self._prev: Optional[Tuple[float, float]] = None
+        # Velocidad pico en (último valle, valle candidato] y (valle candidato, ahora]
+        self._vel_rep = 0.0
+        self._vel_tail = 0.0
+
+    @property
+    def count(self) -> int:
+        return len(self.records)
+
+    @property
+    def last(self) -> Optional[RepetitionRecord]:
+        return self.records[-1] if self.records else None
+
+    @property
+    def valley_angle(self) -> Optional[float]:
+        """Ángulo del último valle confirmado (inicio de la repetición en curso)."""
+        return self._valley[0] if self._valley is not None else None
+
+    def _extremum(self, point: _Point) -> Optional[Tuple[int, _Point]]:
+        """Avanza el zig-zag; retorna (1 pico | -1 valle, extremo) al confirmarse uno."""
+        angle = point[0]
+        h = self.hysteresis_deg
+        if self._mode == 0:
+            if self._max is None:
+                self._max = self._min = point
+                return None
+            if angle > self._max[0]:
+                self._max = point
+            if angle < self._min[0]:
+                self._min = point
+            if angle - self._min[0] >= h:
+                self._mode = 1
+                valley, self._max = self._min, point
+                return -1, valley
+            if self._max[0] - angle >= h:
+                self._mode = -1
+                peak, self._min = self._max, point
+                return 1, peak
+            return None
+        if self._mode == 1:
+            if angle > self._max[0]:
+                self._max = point
+            elif self._max[0] - angle >= h:
+                self._mode = -1
+                peak, self._min = self._max, point
+                return 1, peak
+            return None
+        if angle < self._min[0]:
+            self._min = point
+        elif angle - self._min[0] >= h:
+            self._mode = 1
+            valley, self._max = self._min, point
+            return -1, valley
+        return None
+
+    def _on_extremum(self, kind: int, point: _Point, peak_velocity: float) -> Optional[RepetitionRecord]:
+        if kind == 1:
+            if self._valley is not None:
+                self._peak = point
+            return None
+        record = None
+        if self._valley is not None and self._peak is not None:
+            start, peak = self._valley, self._peak
+            if point[1] - start[1] >= self.min_duration_sec:
+                angle_min = min(start[0], point[0])
+                record = RepetitionRecord(
+                    number=len(self.records) + 1,
+                    start_time=float(start[1]),
+                    peak_time=float(peak[1]),
+                    end_time=float(point[1]),
+                    angle_min=float(angle_min),
+                    angle_max=float(peak[0]),
+                    rom=float(peak[0] - angle_min),
+                    peak_velocity=float(peak_velocity),
+                    start_index=int(start[2]),
+                    end_index=int(point[2]),
+                )
+                self.records.append(record)
+        self._valley = point
+        self._peak = None
+        return record
+
+    def update(self, angle: float, t_sec: float) -> Optional[RepetitionRecord]:
+        """
+        Procesa una muestra de ángulo.
+
+        Returns:
+            La repetición cerrada por esta muestra, o None.
+        """
+        velocity = 0.0
+        if self._prev is not None:
+            dt = t_sec - self._prev[1]
+            if dt > 0:
+                velocity = abs(angle - self._prev[0]) / dt
+        self._prev = (angle, t_sec)
+
+        point = (float(angle), float(t_sec), self._index)
+        self._index += 1
+        event = self._extremum(point)
+
+        record = None
+        if event is not None and event[0] == -1:
+            self._vel_tail = max(self._vel_tail, velocity)
+            record = self._on_extremum(-1, event[1], self._vel_rep)
+            self._vel_rep, self._vel_tail = self._vel_tail, 0.0
+            return record
+        if event is not None:
+            self._on_extremum(1, event[1], 0.0)
+
+        if self._mode == 1:
+            self._vel_rep = max(self._vel_rep, velocity)
+        elif self._min is point:
+            self._vel_rep = max(self._vel_rep, self._vel_tail, velocity)
+            self._vel_tail = 0.0
+        else:
+            self._vel_tail = max(self._vel_tail, velocity)
+        return record
+
+
+def detect_repetitions(angle: np.ndarray, times: np.ndarray, hysteresis_deg: Optional[float] = None,
+                       min_duration_sec: Optional[float] = None) -> List[RepetitionRecord]:
+    """
+    Versión por lotes de ``RepetitionDetector`` para una serie completa.
+
+    Entre dos puntos de inflexión el ángulo es monótono, así que basta con
+    alimentar el zig-zag con esos puntos; la velocidad pico de cada
+    repetición se obtiene con ``np.maximum.reduceat``.
+    """
+    angle = np.asarray(angle, dtype=np.float64)
+    times = np.asarray(times, dtype=np.float64)
+    n = min(angle.size, times.size)
+    if n < 3:
+        return []
+    angle = angle[:n]
+    times = times[:n]
+
+    diffs = np.diff(angle)
+    moving = np.flatnonzero(diffs)
+    turns = np.array([], dtype=np.int64)
+    if moving.size > 1:
+        signs = np.sign(diffs[moving])
+        changes = np.flatnonzero(signs[1:] != signs[:-1])
+        turns = moving[changes] + 1
+    candidates = np.unique(np.concatenate(([0], turns, [n - 1])))
+
+    detector = RepetitionDetector(hysteresis_deg, min_duration_sec)
+    for idx in candidates.tolist():
+        event = detector._extremum((float(angle[idx]), float(times[idx]), idx))
+        if event is not None:
+            detector._on_extremum(event[0], event[1], 0.0)
+    records = detector.records
+    if not records:
+        return records
+
+    dt = np.diff(times)
+    velocity = np.zeros(n)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        velocity[1:] = np.where(dt > 0, np.abs(diffs) / dt, 0.0)
+    bounds = np.empty(2 * len(records), dtype=np.int64)
+    bounds[0::2] = [rec.start_index + 1 for rec in records]
+    bounds[1::2] = [rec.end_index + 1 for rec in records]
+    peaks = np.maximum.reduceat(velocity, bounds)[0::2]
+    for rec, peak in zip(records, peaks.tolist()):
+        rec.peak_velocity = float(peak)
+    return records
@@ -0,0 +1,93 @@
+"""
+Buffer circular espejado para las gráficas en vivo.
+
+Cada muestra se escribe dos veces (en ``i`` y en ``i + tamaño``), de modo que
+las últimas ``capacity`` muestras siempre forman un bloque contiguo: leerlas
+no requiere ``np.roll`` ni copias. Las columnas se guardan por filas
+(columnas × muestras) para que cada serie sea una vista contigua.
+"""
+import numpy as np
+from typing import Optional, Sequence
+
+
+class RingBuffer:
+    """
+    Buffer circular de varias columnas con lecturas sin copia.
+
+    ``headroom`` reserva posiciones extra para que las vistas entregadas a
+    pyqtgraph no se sobrescriban con las siguientes ``headroom`` escrituras.
+    """
+
+    def __init__(self, capacity: int, columns: Sequence[str], headroom: Optional[int] = None,
+                 dtype=np.float64):
+        self.capacity = max(1, int(capacity))
+        self.headroom = max(1, int(headroom if headroom is not None else self.capacity // 4))
+        self.size = self.capacity + self.headroom
+        self.columns = tuple(columns)
+        self._index = {name: i for i, name in enumerate(self.columns)}
+        self._data = np.zeros((len(self.columns), 2 * self.size), dtype=dtype)
+        self._pos = 0
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def nbytes(self) -> int:
+        """Memoria reservada por el buffer (bytes)."""
+        return int(self._data.nbytes)
+
+    def clear(self):
+        self._pos = 0
+        self._count = 0
+
+    def append(self, values: Sequence[float]):
+        """Agrega una muestra (un valor por columna)."""
+        pos = self._pos
+        self._data[:, pos] = values
+        self._data[:, pos + self.size] = values
+        self._pos = pos + 1 if pos + 1 < self.size else 0
+        if self._count < self.capacity:
+            self._count += 1
+
+    def extend(self, block: np.ndarray):
+        """Agrega un bloque (columnas × n)."""
+        block = np.asarray(block)
+        n = block.shape[1]
+        if n == 0:
+            return
+        if n > self.capacity:
+            block = block[:, -self.capacity:]
+            n = self.capacity
+        positions = (self._pos + np.arange(n)) % self.size
+        self._data[:, positions] = block
+        self._data[:, positions + self.size] = block
+        self._pos = int((self._pos + n) % self.size)
+        self._count = min(self.capacity, self._count + n)
+
+    def view(self) -> np.ndarray:
+        """Todas las muestras vigentes en orden temporal (columnas × n, sin copia)."""
+        stop = self._pos + self.size
+        return self._data[:, stop - self._count:stop]
+
+    def latest(self, n: int) -> np.ndarray:
+        """Las últimas ``n`` muestras (columnas × n, sin copia)."""
+        n = max(0, min(int(n), self._count))
+        stop = self._pos + self.size
+        return self._data[:, stop - n:stop]
+
+    def column(self, name: str) -> np.ndarray:
+        return self.view()[self._index[name]]
+
+    def last(self, name: str, default: float = 0.0) -> float:
+        if self._count == 0:
+            return default
+        return float(self._data[self._index[name], self._pos + self.size - 1])
+
+    def window(self, t_start: float, t_end: float, time_column: str = "time") -> np.ndarray:
+        """Muestras con ``t_start <= t <= t_end`` (columnas × k, sin copia); el tiempo debe ser creciente."""
+        data = self.view()
+        times = data[self._index[time_column]]
+        lo = int(np.searchsorted(times, t_start, side="left"))
+        hi = int(np.searchsorted(times, t_end, side="right"))
+        return data[:, lo:hi]
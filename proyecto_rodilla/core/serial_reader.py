@@ -1,6 +1,7 @@
 """
 Thread de lectura serial asíncrona.
 """
+import time
 import serial
 import serial.tools.list_ports
 from PyQt6.QtCore import QThread, pyqtSignal
@@ -12,7 +13,7 @@ from config import settings as cfg
 class SerialReaderThread(QThread):
     """Thread para lectura asíncrona del puerto serial."""
     
-    frame_received = pyqtSignal(dict)  # Señal con frame decodificado
+    frames_received = pyqtSignal(list)  # Lote de frames decodificados (en orden de llegada)
     connection_status = pyqtSignal(bool, str)  # (conectado, mensaje)
     
     def __init__(self, port: str, baud: Optional[int] = None):
@@ -37,15 +38,21 @@ class SerialReaderThread(QThread):
             )
             self.connection_status.emit(True, f"✓ Conectado a {self.port}")
             
+            # Una señal por lote en lugar de una por frame: menos eventos en la cola de Qt
+            batch_sec = cfg.SERIAL_BATCH_MS / 1000.0
+            pending = []
+            last_emit = time.monotonic()
             while self.running:
                 if self.serial_conn.in_waiting > 0:
                     data = self.serial_conn.read(self.serial_conn.in_waiting)
-                    frames = self.decoder.feed(data)
-                    
-                    for frame in frames:
-                        self.frame_received.emit(frame)
+                    pending.extend(self.decoder.feed(data))
                 else:
                     self.msleep(1)
+                now = time.monotonic()
+                if pending and now - last_emit >= batch_sec:
+                    self.frames_received.emit(pending)
+                    pending = []
+                    last_emit = now
                     
         except serial.SerialException as e:
             self.connection_status.emit(False, f"❌ Error serial: {str(e)}")
@@ -0,0 +1,321 @@
+"""Append-only session journal and recovery of interrupted recordings.
+
+``journal.bin`` starts with ``MAGIC`` and is followed by records::
+
+    SYNC (4 bytes) | kind (u8) | length (u32) | crc32 of payload (u32) | payload
+
+HEADER carries the session identity, column schemas, attributes and the
+metadata known at start (JSON). BLOCK holds the rows of one stream handed
+off by the recorder. EVENTS is a JSON snapshot of the event list, and
+CLOSED marks a session that was finalized normally.
+
+A crash can only leave a truncated or half-written tail. The reader skips
+records whose CRC does not match, resynchronising on the next SYNC marker,
+so every intact block before and after a damaged one is kept.
+
+While the journal is open its writer holds an exclusive lock on
+``journal.lock``, so no process (another instance of the application
+included) treats a live recording as interrupted. The operating system
+drops the lock when the writer dies.
+"""
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import struct
+import zlib
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Mapping, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+try:  # Advisory whole-file lock on POSIX
+    import fcntl
+except ImportError:  # pragma: no cover - Windows: byte-range lock
+    fcntl = None
+    import msvcrt
+
+from config import settings as cfg
+from utils import save_json
+from .column_buffer import ColumnBuffer
+from .session_overview import OVERVIEW_NAME, OverviewBuilder
+from .session_writer import MANIFEST_NAME, SEGMENT_NAME, StreamingH5Writer, h5py, storage_profile
+
+JOURNAL_NAME = "journal.bin"
+LOCK_NAME = "journal.lock"
+MAGIC = b"RODJRNL1"
+SYNC = b"\xa5JR\x5a"
+_RECORD = struct.Struct("<4sBII")
+
+HEADER, BLOCK, EVENTS, CLOSED = 1, 2, 3, 4
+
+# Session folders with an open journal in this process (never "interrupted")
+_active_journals: Set[Path] = set()
+
+
+def _lock(handle) -> bool:
+    """Take the exclusive lock of an open file without waiting; False if another handle holds it."""
+    try:
+        if fcntl is not None:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            handle.seek(0)
+            msvcrt.locking(handle.fileno(), msvcrt.LK_NBLCK, 1)
+    except OSError:
+        return False
+    return True
+
+
+def _unlock(handle) -> None:
+    if fcntl is not None:
+        fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+    else:
+        handle.seek(0)
+        msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def is_being_recorded(session_dir: Path) -> bool:
+    """True while a ``SessionJournal`` of any process holds the lock of ``session_dir``."""
+    try:
+        with open(Path(session_dir) / LOCK_NAME, "rb") as handle:
+            if not _lock(handle):
+                return True
+            _unlock(handle)
+    except FileNotFoundError:
+        return False
+    except OSError:  # Unreadable lock: better left alone
+        return True
+    return False
+
+
+class SessionJournal:
+    """Writer side of ``journal.bin``; one instance per recording."""
+
+    def __init__(self, path: Path, header: Mapping[str, object]) -> None:
+        self.path = Path(path)
+        self._schemas: Dict[str, Tuple[str, ...]] = {
+            stream: tuple(name for name, _ in columns) for stream, columns in header["schemas"].items()
+        }
+        # Locked before the journal exists, so it is never visible unlocked
+        self._lock_path = self.path.parent / LOCK_NAME
+        self._lock_file = open(self._lock_path, "wb")
+        _lock(self._lock_file)
+        self._file = open(self.path, "wb")
+        self._file.write(MAGIC)
+        self._write(HEADER, json.dumps(header).encode("utf-8"))
+        self.sync()
+        _active_journals.add(self.path.parent.resolve())
+
+    def _write(self, kind: int, payload: bytes) -> None:
+        self._file.write(_RECORD.pack(SYNC, kind, len(payload), zlib.crc32(payload)))
+        self._file.write(payload)
+
+    def write_block(self, stream: str, block: ColumnBuffer) -> None:
+        """Append every row of ``block`` (columns in schema order)."""
+        rows = len(block)
+        if rows == 0:
+            return
+        name = stream.encode("ascii")
+        parts = [struct.pack("<B", len(name)), name, struct.pack("<I", rows)]
+        parts.extend(np.ascontiguousarray(block.column(column)).tobytes() for column in self._schemas[stream])
+        self._write(BLOCK, b"".join(parts))
+
+    def write_events(self, events: Sequence[Mapping[str, object]]) -> None:
+        self._write(EVENTS, json.dumps(list(events)).encode("utf-8"))
+
+    def sync(self) -> None:
+        """Make everything written so far survive a crash of the application or the machine."""
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self, finalized: bool = False, delete: bool = False) -> None:
+        """Close the journal (deleting it with ``delete``) and release the lock."""
+        if self._file is None:
+            return
+        if finalized:
+            self._write(CLOSED, b"")
+        self._file.close()
+        self._file = None
+        if delete:
+            self.path.unlink(missing_ok=True)
+        _unlock(self._lock_file)
+        self._lock_file.close()
+        self._lock_path.unlink(missing_ok=True)
+        _active_journals.discard(self.path.parent.resolve())
+
+
+@dataclass
+class JournalContents:
+    """What could be read back from a journal."""
+
+    header: Dict[str, object]
+    blocks: List[Tuple[str, Dict[str, np.ndarray]]] = field(default_factory=list)
+    events: List[Dict[str, object]] = field(default_factory=list)
+    closed: bool = False
+    bad_records: int = 0
+    truncated: bool = False
+
+
+def _records(data) -> Iterator[Tuple[int, bytes]]:
+    """Yield ``(kind, payload)`` of intact records; corrupt ones yield ``(0, b"")``; a cut tail yields ``(-1, b"")``."""
+    size = len(data)
+    pos = len(MAGIC)
+    while pos < size:
+        if size - pos < _RECORD.size:
+            yield -1, b""
+            return
+        sync, kind, length, crc = _RECORD.unpack_from(data, pos)
+        start = pos + _RECORD.size
+        if sync == SYNC and start + length <= size:
+            payload = bytes(data[start:start + length])
+            if zlib.crc32(payload) == crc:
+                yield kind, payload
+                pos = start + length
+                continue
+        elif sync == SYNC and data.find(SYNC, pos + 1) < 0:
+            yield -1, b""  # Last record cut short by the crash
+            return
+        yield 0, b""
+        pos = data.find(SYNC, pos + 1)
+        if pos < 0:
+            return
+
+
+def read_journal(path: Path) -> JournalContents:
+    """Parse ``journal.bin``; raises ``ValueError`` if even the header cannot be read."""
+    with open(path, "rb") as handle:
+        if os.fstat(handle.fileno()).st_size <= len(MAGIC):
+            raise ValueError(f"{path} is empty")
+        data = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            if data[:len(MAGIC)] != MAGIC:
+                raise ValueError(f"{path} is not a session journal")
+            contents: Optional[JournalContents] = None
+            bad = 0
+            truncated = False
+            for kind, payload in _records(data):
+                if kind == HEADER and contents is None:
+                    contents = JournalContents(header=json.loads(payload.decode("utf-8")))
+                elif kind < 0:
+                    truncated = True
+                elif kind == 0 or contents is None:
+                    bad += 1
+                elif kind == BLOCK:
+                    contents.blocks.append(_decode_block(payload, contents.header))
+                elif kind == EVENTS:
+                    contents.events = json.loads(payload.decode("utf-8"))
+                elif kind == CLOSED:
+                    contents.closed = True
+        finally:
+            data.close()
+    if contents is None:
+        raise ValueError(f"{path}: journal header is missing or corrupt")
+    contents.bad_records = bad
+    contents.truncated = truncated
+    return contents
+
+
+def _decode_block(payload: bytes, header: Mapping[str, object]) -> Tuple[str, Dict[str, np.ndarray]]:
+    length = payload[0]
+    stream = payload[1:1 + length].decode("ascii")
+    (rows,) = struct.unpack_from("<I", payload, 1 + length)
+    offset = 5 + length
+    columns = {}
+    for name, dtype in header["schemas"][stream]:
+        dtype = np.dtype(dtype)
+        columns[name] = np.frombuffer(payload, dtype=dtype, count=rows, offset=offset)
+        offset += rows * dtype.itemsize
+    return stream, columns
+
+
+# ----------------------------------------------------------------------
+# Recovery
+# ----------------------------------------------------------------------
+def find_interrupted_sessions(root: Optional[Path] = None) -> List[Path]:
+    """Session folders under ``root`` that still hold a journal and are not being recorded."""
+    root = Path(root) if root is not None else cfg.PROJECT_ROOT / "data" / "patients"
+    if not root.exists():
+        return []
+    return sorted(
+        path.parent for path in root.glob(f"*/sessions/*/{JOURNAL_NAME}")
+        if path.parent.resolve() not in _active_journals and not is_being_recorded(path.parent)
+    )
+
+
+def recover_session(session_dir: Path) -> Dict[str, object]:
+    """Rebuild the data files, ``events.json`` and ``metadata.json`` from the journal of ``session_dir``.
+
+    ``raw_data.h5`` and its ``overview.h5`` are written from the blocks. The
+    journal holds the whole recording, so a segmented session is rebuilt as
+    a single ``raw_data.h5`` and its partial segments are removed. The
+    journal is removed once the files are written. Returns the ``recovery``
+    summary stored in the metadata.
+    """
+    if h5py is None:
+        raise RuntimeError("h5py is required to rebuild raw_data.h5")
+    session_dir = Path(session_dir)
+    if session_dir.resolve() in _active_journals or is_being_recorded(session_dir):
+        raise RuntimeError(f"{session_dir}: the session is still being recorded")
+    journal_path = session_dir / JOURNAL_NAME
+    contents = read_journal(journal_path)
+    header = contents.header
+
+    # Write next to the old file and swap at the end: the streamed copy may be damaged
+    target = session_dir / "raw_data.h5"
+    temporary = session_dir / "raw_data.recovering.h5"
+    writer = StreamingH5Writer(temporary, storage_profile(header.get("profile")), header["sample_rates"],
+                               header.get("column_attrs"))
+    overview = OverviewBuilder({stream: [name for name, _ in columns] for stream, columns in header["schemas"].items()},
+                               header.get("column_attrs"))
+    samples: Dict[str, int] = {}
+    try:
+        for stream, columns in contents.blocks:
+            schema = [(name, np.dtype(dtype)) for name, dtype in header["schemas"][stream]]
+            block = ColumnBuffer(schema, max(1, len(next(iter(columns.values())))))
+            block.extend([columns[name] for name, _ in schema])
+            writer.append(stream, block, header["layouts"][stream])
+            overview.feed(stream, block)
+            samples[stream] = samples.get(stream, 0) + len(block)
+    finally:
+        writer.close()
+    os.replace(temporary, target)
+    (session_dir / MANIFEST_NAME).unlink(missing_ok=True)
+    for segment in session_dir.glob(SEGMENT_NAME.replace("{:03d}", "[0-9][0-9][0-9]")):
+        segment.unlink()
+    overview.write(session_dir / OVERVIEW_NAME)
+
+    summary: Dict[str, object] = {
+        "recovered_at": datetime.now().isoformat(timespec="seconds"),
+        "blocks": len(contents.blocks),
+        "bad_records": contents.bad_records,
+        "truncated": contents.truncated,
+        "finalized": contents.closed,
+        "samples": samples,
+    }
+    save_json({"events": contents.events}, str(session_dir / "events.json"))
+    metadata = dict(header.get("metadata") or {})
+    emg_rows = samples.get("emg", 0)
+    if emg_rows and not metadata.get("duration_sec"):
+        metadata["duration_sec"] = int(emg_rows / float(header["sample_rates"]["emg"]))
+    metadata.update({"recovered": True, "recovery": summary})
+    save_json(metadata, str(session_dir / "metadata.json"))
+    journal_path.unlink()
+    (session_dir / LOCK_NAME).unlink(missing_ok=True)  # Left behind by the crashed recorder
+    return summary
+
+
+def recover_interrupted_sessions(root: Optional[Path] = None) -> List[Tuple[Path, Optional[str]]]:
+    """Recover every interrupted session under ``root``; returns ``(folder, error or None)``."""
+    results = []
+    for session_dir in find_interrupted_sessions(root):
+        try:
+            recover_session(session_dir)
+        except (OSError, ValueError, RuntimeError, KeyError) as exc:
+            results.append((session_dir, str(exc)))
+        else:
+            results.append((session_dir, None))
+    return results
+
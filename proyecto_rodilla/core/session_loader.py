@@ -2,8 +2,9 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
+from functools import partial
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
 
 import numpy as np
 
@@ -14,6 +15,59 @@ except ImportError:  # pragma: no cover - optional dependency
 
 from config import settings as cfg
 from utils import load_json
+from .alignment import AlignedFrame, align_streams, unwrap_timestamps
+from .cocontraction import cocontraction_series
+from .repetitions import RepetitionRecord, detect_repetitions
+from .session_overview import OVERVIEW_NAME
+from .session_summary import FATIGUE_CHANNELS, load_summary
+from .session_writer import MANIFEST_NAME, count_scale
+
+# Internal column keys -> dataset paths inside each group of raw_data.h5
+_H5_PATHS: Dict[str, Dict[str, str]] = {
+    "emg": {
+        "timestamps_us": "timestamps_us", "sequence": "sequence",
+        "raw_ch0": "ch0/raw", "filtered_ch0": "ch0/filtered", "rms_ch0": "ch0/rms",
+        "raw_ch1": "ch1/raw", "filtered_ch1": "ch1/filtered", "rms_ch1": "ch1/rms",
+    },
+    "imu": {
+        "timestamps_us": "timestamps_us", "sequence": "sequence",
+        "accel_x": "accel/x", "accel_y": "accel/y", "accel_z": "accel/z",
+        "gyro_x": "gyro/x", "gyro_y": "gyro/y", "gyro_z": "gyro/z",
+        "angle": "angle",
+    },
+    "derived": {
+        "timestamps_us": "timestamps_us", "rom": "rom_instant", "velocity": "velocity_angular",
+        "acceleration": "acceleration_angular", "rep_marker": "rep_marker",
+    },
+}
+# Stream of every signal column, so ``read`` can take a bare column key
+_CHANNEL_SOURCES: Dict[str, str] = {
+    key: stream for stream, paths in _H5_PATHS.items() for key in paths if key not in ("timestamps_us", "sequence")
+}
+# Rows between two entries of the timestamp index used to slice raw_data.h5
+_INDEX_STRIDE = 4096
+
+
+class _LazyColumns(dict):
+    """Columns of one stream, each read from disk the first time it is requested.
+
+    ``read(key)`` returns the array, or None when the session has no such
+    column; either result is then kept like a regular entry.
+    """
+
+    def __init__(self, keys: Sequence[str], read: Callable[[str], Optional[np.ndarray]]) -> None:
+        super().__init__()
+        self._keys = frozenset(keys)
+        self._read = read
+
+    def __missing__(self, key: str) -> Optional[np.ndarray]:
+        if key not in self._keys:
+            raise KeyError(key)
+        value = self[key] = self._read(key)
+        return value
+
+    def get(self, key: str, default=None):
+        return self[key] if key in self or key in self._keys else default
 
 
 @dataclass
@@ -32,7 +86,13 @@ class SessionInfo:
         date = self.metadata.get("date", "?")
         time_start = self.metadata.get("time_start", "")
         session_type = self.metadata.get("session_type", "")
-        return f"{self.session_id} - {date} {time_start} [{session_type}]".strip()
+        label = f"{self.session_id} - {date} {time_start} [{session_type}]".strip()
+        return f"{label} (recovered)" if self.recovered else label
+
+    @property
+    def recovered(self) -> bool:
+        """True when the files were rebuilt from the journal of an interrupted recording."""
+        return bool(self.metadata.get("recovered"))
 
 
 @dataclass
@@ -51,7 +111,11 @@ class PatientInfo:
 
 
 class SessionDataset:
-    """Aggregate loaded session data with helper computations."""
+    """Aggregate loaded session data with helper computations.
+
+    Sample data is read lazily, one column at a time, on first access;
+    ``read`` and ``read_window`` slice a time range straight from HDF5.
+    """
 
     def __init__(self, patient_id: str, session_info: SessionInfo) -> None:
         self.patient_id = patient_id
@@ -64,12 +128,27 @@ class SessionDataset:
         self.events = events_payload.get("events", []) if isinstance(events_payload, dict) else []
         notes_path = self.session_dir / "notes.txt"
         self.notes = notes_path.read_text(encoding="utf-8") if notes_path.exists() else ""
+        # Present only for sessions recorded in segments (see SegmentedH5Writer)
+        self.manifest = self._safe_load_json(MANIFEST_NAME)
 
         self._data_loaded = False
+        self._h5_path: Optional[Path] = None
+        self._npz_path: Optional[Path] = None
         self._emg_data: Dict[str, np.ndarray] = {}
         self._imu_data: Dict[str, np.ndarray] = {}
         self._derived_data: Dict[str, np.ndarray] = {}
+        self._origin: Optional[int] = None
+        # Per source: sparse timestamp index of raw_data.h5 (see _row_index)
+        self._row_indexes: Dict[str, np.ndarray] = {}
         self._time_cache: Dict[str, np.ndarray] = {}
+        # Columns stored as raw counts, converted to physical units on first access
+        self._count_scales: Dict[Tuple[str, str], Tuple[float, float]] = {}
+        self._aligned_cache: Dict[Tuple[str, Tuple[str, ...], Tuple[str, ...]], AlignedFrame] = {}
+        # Per source: (samples per bucket, bucket times) of each overview level, finest first
+        self._overview_levels: Dict[str, List[Tuple[int, np.ndarray]]] = {}
+        self._repetitions: Optional[List[RepetitionRecord]] = None
+        # Valid summary.json contents ({} when missing or stale), read on first use
+        self._summary: Optional[Dict[str, object]] = None
 
     # ------------------------------------------------------------------
     # Internal helpers
@@ -82,91 +161,344 @@ class SessionDataset:
         return payload if isinstance(payload, dict) else {}
 
     def _load_raw_data(self) -> None:
+        """Attach the stored streams; each column is read the first time it is requested."""
         if self._data_loaded:
             return
 
         h5_path = self.session_dir / "raw_data.h5"
         npz_path = self.session_dir / "raw_data.npz"
-        if h5_path.exists() and h5py is not None:
-            self._load_from_h5(h5_path)
+        if self.is_segmented and h5py is not None:
+            read = self._read_segments_column
+        elif h5_path.exists() and h5py is not None:
+            self._h5_path = h5_path
+            read = self._read_h5_column
         elif npz_path.exists():
-            self._load_from_npz(npz_path)
+            self._npz_path = npz_path
+            self._read_npz_attrs()
+            read = self._read_npz_column
         else:
-            self._emg_data = {}
-            self._imu_data = {}
-            self._derived_data = {}
+            read = self._read_no_column
+        self._emg_data = _LazyColumns(_H5_PATHS["emg"], partial(read, "emg"))
+        self._imu_data = _LazyColumns(_H5_PATHS["imu"], partial(read, "imu"))
+        self._derived_data = _LazyColumns(_H5_PATHS["derived"], partial(read, "derived"))
         self._data_loaded = True
 
-    def _load_from_npz(self, path: Path) -> None:
-        payload = np.load(path, allow_pickle=False)
-        self._emg_data = {
-            "timestamps_us": payload.get("emg_timestamps_us"),
-            "sequence": payload.get("emg_sequence"),
-            "raw_ch0": payload.get("emg_raw_ch0"),
-            "raw_ch1": payload.get("emg_raw_ch1"),
-            "filtered_ch0": payload.get("emg_filtered_ch0"),
-            "filtered_ch1": payload.get("emg_filtered_ch1"),
-            "rms_ch0": payload.get("emg_rms_ch0"),
-            "rms_ch1": payload.get("emg_rms_ch1"),
-        }
-        self._imu_data = {
-            "timestamps_us": payload.get("imu_timestamps_us"),
-            "sequence": payload.get("imu_sequence"),
-            "accel_x": payload.get("imu_accel_x"),
-            "accel_y": payload.get("imu_accel_y"),
-            "accel_z": payload.get("imu_accel_z"),
-            "gyro_x": payload.get("imu_gyro_x"),
-            "gyro_y": payload.get("imu_gyro_y"),
-            "gyro_z": payload.get("imu_gyro_z"),
-            "angle": payload.get("imu_angle"),
-        }
-        self._derived_data = {
-            "timestamps_us": payload.get("derived_timestamps_us"),
-            "rom": payload.get("derived_rom_instant"),
-            "velocity": payload.get("derived_velocity_angular"),
-        }
-
-    def _load_from_h5(self, path: Path) -> None:
-        self._emg_data = {}
-        self._imu_data = {}
-        self._derived_data = {}
-        with h5py.File(path, "r") as handle:  # type: ignore[operator]
-            if "emg" in handle:
-                emg_grp = handle["emg"]
-                self._emg_data = {
-                    "timestamps_us": np.array(emg_grp.get("timestamps_us")),
-                    "sequence": np.array(emg_grp.get("sequence")),
-                    "raw_ch0": np.array(emg_grp.get("ch0/raw")),
-                    "filtered_ch0": np.array(emg_grp.get("ch0/filtered")),
-                    "rms_ch0": np.array(emg_grp.get("ch0/rms")),
-                    "raw_ch1": np.array(emg_grp.get("ch1/raw")),
-                    "filtered_ch1": np.array(emg_grp.get("ch1/filtered")),
-                    "rms_ch1": np.array(emg_grp.get("ch1/rms")),
-                }
-            if "imu" in handle:
-                imu_grp = handle["imu"]
-                self._imu_data = {
-                    "timestamps_us": np.array(imu_grp.get("timestamps_us")),
-                    "sequence": np.array(imu_grp.get("sequence")),
-                    "accel_x": np.array(imu_grp.get("accel/x")),
-                    "accel_y": np.array(imu_grp.get("accel/y")),
-                    "accel_z": np.array(imu_grp.get("accel/z")),
-                    "gyro_x": np.array(imu_grp.get("gyro/x")),
-                    "gyro_y": np.array(imu_grp.get("gyro/y")),
-                    "gyro_z": np.array(imu_grp.get("gyro/z")),
-                    "angle": np.array(imu_grp.get("angle")),
-                }
-            if "derived" in handle:
-                drv_grp = handle["derived"]
-                self._derived_data = {
-                    "timestamps_us": np.array(drv_grp.get("timestamps_us")),
-                    "rom": np.array(drv_grp.get("rom_instant")),
-                    "velocity": np.array(drv_grp.get("velocity_angular")),
-                }
+    def _read_no_column(self, stream: str, key: str) -> None:
+        return None
+
+    def _read_npz_attrs(self) -> None:
+        # Attributes of count columns are stored as "<stream>_<column>@<attribute>" entries
+        attrs: Dict[Tuple[str, str], Dict[str, object]] = {}
+        with np.load(self._npz_path, allow_pickle=False) as payload:
+            for name in payload.files:
+                if "@" in name:
+                    column, attr = name.split("@", 1)
+                    stream, key = column.split("_", 1)
+                    attrs.setdefault((stream, key), {})[attr] = payload[name][()]
+        for column, column_attrs in attrs.items():
+            scale = count_scale(column_attrs)
+            if scale is not None:
+                self._count_scales[column] = scale
+
+    def _read_npz_column(self, stream: str, key: str) -> Optional[np.ndarray]:
+        # Entries are "<stream>_<key>" ("emg_rms_ch0"), derived ones use the dataset name ("derived_rom_instant")
+        name = f"{stream}_{_H5_PATHS[stream][key] if stream == 'derived' else key}"
+        with np.load(self._npz_path, allow_pickle=False) as payload:
+            return payload[name] if name in payload.files else None
+
+    def _read_h5_column(self, stream: str, key: str) -> Optional[np.ndarray]:
+        with h5py.File(self._h5_path, "r") as handle:  # type: ignore[operator]
+            return self._h5_column(stream, key, handle.get(f"{stream}/{_H5_PATHS[stream][key]}"))
+
+    def _read_segments_column(self, stream: str, key: str) -> Optional[np.ndarray]:
+        """One column concatenated over every segment listed in the manifest."""
+        arrays = []
+        for segment in self.manifest["segments"]:
+            path = self.session_dir / segment["file"]
+            if not path.exists():
+                continue
+            with h5py.File(path, "r") as handle:  # type: ignore[operator]
+                column = self._h5_column(stream, key, handle.get(f"{stream}/{_H5_PATHS[stream][key]}"))
+            if column is not None:
+                arrays.append(column)
+        return np.concatenate(arrays) if arrays else None
+
+    def _h5_column(self, stream: str, key: str, dataset) -> Optional[np.ndarray]:
+        """Read a dataset as stored, remembering the conversion of count columns (None if missing)."""
+        if dataset is None:
+            return None
+        scale = count_scale(dataset.attrs)
+        if scale is not None:
+            self._count_scales[(stream, key)] = scale
+        return np.array(dataset)
+
+    def _column(self, stream: str, key: str) -> Optional[np.ndarray]:
+        """Column ``key`` of ``stream`` in physical units (counts are converted once, on first access)."""
+        data = self._emg_data if stream == "emg" else self._imu_data
+        values = data.get(key)
+        scale = self._count_scales.pop((stream, key), None)
+        if scale is not None and values is not None:
+            divisor, factor = scale
+            values = data[key] = np.asarray(values, dtype=np.float64) / divisor * factor
+        return values
+
+    @staticmethod
+    def _dataset_slice(dataset, lo: int, hi: int) -> np.ndarray:
+        """Rows ``lo:hi`` in physical units; only the chunks of the slice are decompressed."""
+        values = dataset[lo:hi]
+        scale = count_scale(dataset.attrs)
+        if scale is not None:
+            divisor, factor = scale
+            values = np.asarray(values, dtype=np.float64) / divisor * factor
+        return values
+
+    def _origin_us(self) -> int:
+        """Unwrapped timestamp of the first sample, as ``time_axis`` defines it."""
+        if self._origin is not None:
+            return self._origin
+        starts: Dict[str, int] = {}
+        if self.is_segmented:
+            for segment in self.manifest.get("segments", []):
+                for stream, info in segment["streams"].items():
+                    starts.setdefault(stream, int(info["start_us"]))
+        elif self._h5_path is not None:
+            with h5py.File(self._h5_path, "r") as handle:  # type: ignore[operator]
+                for stream in _H5_PATHS:
+                    stamps = handle.get(f"{stream}/timestamps_us")
+                    if stamps is not None and stamps.shape[0]:
+                        starts[stream] = int(stamps[0])
+        else:
+            for stream, data in (("emg", self._emg_data), ("imu", self._imu_data), ("derived", self._derived_data)):
+                stamps = data.get("timestamps_us")
+                if stamps is not None and np.ndim(stamps) and np.size(stamps):
+                    starts[stream] = int(stamps[0])
+        # Unwrapping keeps the first timestamp of each stream as is
+        clock = [starts[stream] for stream in ("emg", "imu") if stream in starts]
+        self._origin = min(clock) if clock else starts.get("derived", 0)
+        return self._origin
+
+    def _row_index(self, source: str) -> np.ndarray:
+        """Unwrapped timestamp (µs) of every ``_INDEX_STRIDE``-th row of ``source`` in raw_data.h5."""
+        index = self._row_indexes.get(source)
+        if index is None:
+            with h5py.File(self._h5_path, "r") as handle:  # type: ignore[operator]
+                stamps = handle.get(f"{source}/timestamps_us")
+                # A strided selection keeps one value per stride in memory, whatever the session length
+                sampled = stamps[::_INDEX_STRIDE] if stamps is not None else np.array([], dtype=np.int64)
+            index = self._row_indexes[source] = unwrap_timestamps(sampled)
+        return index
+
+    def _read_h5_window(self, source: str, columns: Sequence[str], t_start: float,
+                        t_end: float) -> Dict[str, np.ndarray]:
+        """Window of a single raw_data.h5: the row index bounds the rows, then only those are read."""
+        window = {name: np.array([]) for name in ("time", *columns)}
+        index = self._row_index(source)
+        if index.size == 0:
+            return window
+        origin = self._origin_us()
+        seconds = (index - origin).astype(np.float64) / 1e6
+        first = max(0, int(np.searchsorted(seconds, t_start, side="left")) - 1)
+        last = int(np.searchsorted(seconds, t_end, side="right"))
+        lo = first * _INDEX_STRIDE
+        paths = _H5_PATHS[source]
+        with h5py.File(self._h5_path, "r") as handle:  # type: ignore[operator]
+            group = handle[source]
+            stamps = unwrap_timestamps(group["timestamps_us"][lo:last * _INDEX_STRIDE])
+            if stamps.size == 0:
+                return window
+            # Row ``lo`` is an index row: its unwrapped value places the slice across 32-bit wraps
+            times = (stamps + (int(index[first]) - int(stamps[0])) - origin).astype(np.float64) / 1e6
+            start = int(np.searchsorted(times, t_start, side="left"))
+            stop = int(np.searchsorted(times, t_end, side="right"))
+            window["time"] = times[start:stop]
+            for column in columns:
+                dataset = group.get(paths[column])
+                if dataset is not None:
+                    window[column] = self._dataset_slice(dataset, lo + start, lo + stop)
+        return window
+
+    def _read_segment_window(self, source: str, columns: Sequence[str], t_start: float,
+                             t_end: float) -> Dict[str, np.ndarray]:
+        origin = self._origin_us()
+        paths = _H5_PATHS[source]
+        parts: Dict[str, List[np.ndarray]] = {name: [] for name in ("time", *columns)}
+        for segment in self.segments_for(source, t_start, t_end):
+            start_us = int(segment["streams"][source]["start_us"])
+            with h5py.File(self.session_dir / segment["file"], "r") as handle:  # type: ignore[operator]
+                group = handle[source]
+                stamps = unwrap_timestamps(np.asarray(group["timestamps_us"]))
+                times = (stamps - stamps[0] + (start_us - origin)).astype(np.float64) / 1e6
+                lo = int(np.searchsorted(times, t_start, side="left"))
+                hi = int(np.searchsorted(times, t_end, side="right"))
+                parts["time"].append(times[lo:hi])
+                for column in columns:
+                    dataset = group.get(paths[column])
+                    if dataset is not None:
+                        parts[column].append(self._dataset_slice(dataset, lo, hi))
+        return {name: np.concatenate(arrays) if arrays else np.array([]) for name, arrays in parts.items()}
+
+    def _overview_times(self, source: str) -> List[Tuple[int, np.ndarray]]:
+        levels = self._overview_levels.get(source)
+        if levels is None:
+            levels = []
+            if self.has_overview:
+                with h5py.File(self.session_dir / OVERVIEW_NAME, "r") as handle:  # type: ignore[operator]
+                    group = handle.get(source)
+                    for number in range(1, len(group) + 1) if group is not None else ():
+                        level = group[f"level_{number}"]
+                        levels.append((int(level.attrs["samples_per_bucket"]), np.asarray(level["time"])))
+            self._overview_levels[source] = levels
+        return levels
 
     # ------------------------------------------------------------------
     # Public accessors
     # ------------------------------------------------------------------
+    @property
+    def is_segmented(self) -> bool:
+        """True when the samples are split across the segment files listed in ``segments.json``."""
+        return bool(self.manifest.get("segments"))
+
+    def segments_for(self, source: str, t_start: float, t_end: float) -> List[Dict[str, object]]:
+        """Manifest entries holding ``source`` samples between ``t_start`` and ``t_end`` seconds."""
+        origin = self._origin_us()
+        touched = []
+        for segment in self.manifest.get("segments", []):
+            info = segment["streams"].get(source)
+            if info is None:
+                continue
+            first = (int(info["start_us"]) - origin) / 1e6
+            last = (int(info["end_us"]) - origin) / 1e6
+            if first <= t_end and last >= t_start:
+                touched.append(segment)
+        return touched
+
+    def time_bounds(self, source: str) -> Optional[Tuple[float, float]]:
+        """First and last sample time (s) of ``source`` without reading the stream; None if it is empty."""
+        self._load_raw_data()
+        times = self._time_cache.get(source)
+        if times is None and self.is_segmented and h5py is not None:
+            infos = [segment["streams"][source] for segment in self.manifest["segments"]
+                     if int(segment["streams"].get(source, {}).get("rows", 0))]
+            if not infos:
+                return None
+            origin = self._origin_us()
+            return (int(infos[0]["start_us"]) - origin) / 1e6, (int(infos[-1]["end_us"]) - origin) / 1e6
+        if times is None and self._h5_path is not None:
+            index = self._row_index(source)
+            if index.size == 0:
+                return None
+            # Only the rows after the last index entry are read
+            with h5py.File(self._h5_path, "r") as handle:  # type: ignore[operator]
+                tail = unwrap_timestamps(handle[f"{source}/timestamps_us"][(index.size - 1) * _INDEX_STRIDE:])
+            origin = self._origin_us()
+            last = int(index[-1]) + int(tail[-1]) - int(tail[0])
+            return (int(index[0]) - origin) / 1e6, (last - origin) / 1e6
+        if times is None:
+            times = self.time_axis(source)
+        return (float(times[0]), float(times[-1])) if times.size else None
+
+    def sample_count(self, source: str) -> int:
+        """Samples stored for ``source``, without reading them."""
+        self._load_raw_data()
+        if source in self._time_cache:
+            return int(self._time_cache[source].size)
+        if self.is_segmented and h5py is not None:
+            return sum(int(segment["streams"].get(source, {}).get("rows", 0)) for segment in self.manifest["segments"])
+        if self._h5_path is not None:
+            with h5py.File(self._h5_path, "r") as handle:  # type: ignore[operator]
+                stamps = handle.get(f"{source}/timestamps_us")
+                return int(stamps.shape[0]) if stamps is not None else 0
+        return int(self.time_axis(source).size)
+
+    @property
+    def has_overview(self) -> bool:
+        """True when ``overview.h5`` (min/max/mean pyramid written at finalize) can be read."""
+        return h5py is not None and (self.session_dir / OVERVIEW_NAME).exists()
+
+    def level_for(self, source: str, pixel_width: int, t_start: float, t_end: float) -> int:
+        """Overview level to draw ``source`` between ``t_start`` and ``t_end`` on ``pixel_width`` pixels.
+
+        The coarsest level that still has a bucket per pixel, so the min/max
+        envelope looks the same as the full data; 0 (full resolution) when
+        even level 1 has fewer buckets than pixels or there is no overview.
+        """
+        levels = self._overview_times(source)
+        if not levels:
+            return 0
+        pixels = max(1, int(pixel_width))
+        buckets = [int(np.searchsorted(times, t_end, side="right") - np.searchsorted(times, t_start, side="left"))
+                   for _, times in levels]
+        for number in range(len(levels), 0, -1):
+            if buckets[number - 1] >= pixels:
+                return number
+        return 0
+
+    def overview_series(self, source: str, column: str, pixel_width: int, t_start: float,
+                        t_end: float, envelope: bool = True) -> Tuple[np.ndarray, np.ndarray]:
+        """(time, values) to plot ``column`` of ``source`` over the window at ``pixel_width`` pixels.
+
+        Overview levels come back as min/max pairs per bucket, so peaks stay
+        visible, or with ``envelope`` off as one mean per bucket; level 0 is
+        the full-resolution ``read_window``. Empty if there is no such column.
+        """
+        level = self.level_for(source, pixel_width, t_start, t_end)
+        if level == 0:
+            window = self.read_window(source, (column,), t_start, t_end)
+            return window["time"], window[column]
+        _, times = self._overview_times(source)[level - 1]
+        # One bucket beyond each edge so the curve reaches the borders of the view
+        lo = max(0, int(np.searchsorted(times, t_start, side="left")) - 1)
+        hi = min(times.size, int(np.searchsorted(times, t_end, side="right")) + 1)
+        name = _H5_PATHS["derived"].get(column, column) if source == "derived" else column
+        with h5py.File(self.session_dir / OVERVIEW_NAME, "r") as handle:  # type: ignore[operator]
+            group = handle.get(f"{source}/level_{level}/{name}")
+            if group is None:
+                return np.array([]), np.array([])
+            if not envelope:
+                return times[lo:hi], np.asarray(group["mean"][lo:hi], dtype=np.float64)
+            values = np.empty(2 * (hi - lo))
+            values[0::2] = group["min"][lo:hi]
+            values[1::2] = group["max"][lo:hi]
+        return np.repeat(times[lo:hi], 2), values
+
+    def read_window(self, source: str, columns: Sequence[str], t_start: float,
+                    t_end: float) -> Dict[str, np.ndarray]:
+        """Samples of ``source`` between ``t_start`` and ``t_end`` seconds of the session timeline.
+
+        Returns ``{"time": seconds, column: values...}`` with count columns in
+        physical units. Only the rows of the window are read from HDF5: a
+        segmented session opens the segments the window touches, a single
+        raw_data.h5 is located through a sparse timestamp index. npz data is
+        sliced in memory.
+        """
+        self._load_raw_data()
+        if self.is_segmented and h5py is not None:
+            return self._read_segment_window(source, columns, t_start, t_end)
+        if self._h5_path is not None:
+            return self._read_h5_window(source, columns, t_start, t_end)
+        times = self.time_axis(source)
+        lo = int(np.searchsorted(times, t_start, side="left"))
+        hi = int(np.searchsorted(times, t_end, side="right"))
+        window = {"time": times[lo:hi]}
+        for column in columns:
+            values = self._derived_data.get(column) if source == "derived" else self._column(source, column)
+            window[column] = np.asarray(values)[lo:hi] if values is not None else np.array([])
+        return window
+
+    def read(self, channel: str, t_start: float = 0.0, t_end: float = np.inf) -> Tuple[np.ndarray, np.ndarray]:
+        """(time, values) of ``channel`` between ``t_start`` and ``t_end`` seconds, reading only that slice.
+
+        ``channel`` is a column key (``rms_ch0``, ``angle``, ``gyro_x``,
+        ``velocity``...) or ``"<stream>/<key>"`` for the shared ones
+        (``"imu/sequence"``). Nothing else of the session is loaded.
+        """
+        source, _, column = channel.rpartition("/")
+        source = source or _CHANNEL_SOURCES.get(column, "")
+        if column not in _H5_PATHS.get(source, {}):
+            raise KeyError(f"Unknown channel: {channel}")
+        window = self.read_window(source, (column,), t_start, t_end)
+        return window["time"], window[column]
+
     def has_emg(self) -> bool:
         self._load_raw_data()
         return bool(self._emg_data.get("timestamps_us") is not None)
@@ -176,41 +508,56 @@ class SessionDataset:
         return bool(self._imu_data.get("timestamps_us") is not None)
 
     def time_axis(self, source: str) -> np.ndarray:
+        """Relative seconds for ``source`` on the common session timeline.
+
+        EMG, IMU and derived streams share the device clock, so all of them are
+        unwrapped (32-bit microseconds) and referenced to the earliest EMG/IMU
+        sample (the first derived one if there are none). Only the timestamps
+        of ``source`` are read.
+        """
         self._load_raw_data()
         if source in self._time_cache:
             return self._time_cache[source]
-
-        arr = None
-        if source == "emg":
-            arr = self._emg_data.get("timestamps_us")
-        elif source == "imu":
-            arr = self._imu_data.get("timestamps_us")
-        elif source == "derived":
-            arr = self._derived_data.get("timestamps_us")
-        if arr is None:
-            self._time_cache[source] = np.array([])
-            return self._time_cache[source]
-        arr = np.asarray(arr)
-        if arr.size == 0:
-            self._time_cache[source] = np.array([])
-            return self._time_cache[source]
-        arr = arr.astype(np.float64)
-        arr = (arr - arr[0]) / 1e6
-        self._time_cache[source] = arr
-        return arr
+        data = {"emg": self._emg_data, "imu": self._imu_data, "derived": self._derived_data}.get(source, {})
+        stamps = data.get("timestamps_us")
+        if stamps is None or np.ndim(stamps) == 0 or np.size(stamps) == 0:
+            axis = np.array([])
+        else:
+            axis = (unwrap_timestamps(stamps) - self._origin_us()).astype(np.float64) / 1e6
+        self._time_cache[source] = axis
+        return axis
+
+    def aligned(self, target: str = "imu", emg_columns: Tuple[str, ...] = ("rms_ch0", "rms_ch1"),
+                imu_columns: Tuple[str, ...] = ("angle",)) -> AlignedFrame:
+        """Joint EMG/IMU view on the ``target`` time axis ("emg" or "imu").
+
+        Column names follow the internal keys (``rms_ch0``, ``filtered_ch1``,
+        ``angle``, ``gyro_x``...). Results are cached so plots and metrics share
+        one resampled copy instead of interpolating on every refresh.
+        """
+        key = (target, tuple(emg_columns), tuple(imu_columns))
+        cached = self._aligned_cache.get(key)
+        if cached is not None:
+            return cached
+        self._load_raw_data()
+        emg = {name: self._column("emg", name) for name in emg_columns if self._emg_data.get(name) is not None}
+        imu = {name: self._column("imu", name) for name in imu_columns if self._imu_data.get(name) is not None}
+        frame = align_streams(self.time_axis("emg"), emg, self.time_axis("imu"), imu, target=target)
+        self._aligned_cache[key] = frame
+        return frame
 
     def emg_channel(self, channel: int, kind: str = "rms") -> np.ndarray:
         self._load_raw_data()
         suffix = {"raw": "raw", "filtered": "filtered", "rms": "rms"}.get(kind, "rms")
         key = f"{suffix}_ch{channel}"
-        data = self._emg_data.get(key)
+        data = self._column("emg", key)
         if data is None:
             return np.array([])
         return np.asarray(data)
 
     def imu_series(self, axis: str) -> np.ndarray:
         self._load_raw_data()
-        data = self._imu_data.get(axis)
+        data = self._column("imu", axis)
         if data is None:
             return np.array([])
         return np.asarray(data)
@@ -223,12 +570,88 @@ class SessionDataset:
         return np.asarray(data)
 
     def derived_series(self, key: str) -> np.ndarray:
+        """Series recorded during acquisition: ``rom``, ``velocity``, ``acceleration`` or ``rep_marker``."""
         self._load_raw_data()
         data = self._derived_data.get(key)
-        if data is None:
+        # Sessions recorded before a column existed have no dataset for it
+        if data is None or np.ndim(data) == 0:
             return np.array([])
         return np.asarray(data)
 
+    def angular_velocity(self) -> Tuple[np.ndarray, np.ndarray]:
+        """(time, °/s): the recorded series, or the gradient of the angle for sessions without one."""
+        velocity = self.derived_series("velocity")
+        if velocity.size:
+            times = self.time_axis("derived")
+            limit = min(velocity.size, times.size)
+            return times[:limit], velocity[:limit]
+        angle = self.angle_series()
+        times = self.time_axis("imu")
+        limit = min(angle.size, times.size)
+        if limit < 2:
+            return times[:0], np.array([])
+        return times[:limit], np.gradient(angle[:limit], times[:limit])
+
+    def repetitions(self) -> List[RepetitionRecord]:
+        """Flexion/extension repetitions, from ``summary.json`` or segmented from the knee angle (cached)."""
+        if self._repetitions is None:
+            stored = self.summary().get("repetitions")
+            if stored is not None:
+                self._repetitions = [
+                    RepetitionRecord(**{key: value for key, value in item.items() if key != "duration"})
+                    for item in stored
+                ]
+            else:
+                self._repetitions = self.compute_repetitions()
+        return self._repetitions
+
+    def compute_repetitions(self) -> List[RepetitionRecord]:
+        return detect_repetitions(self.angle_series(), self.time_axis("imu"))
+
+    def cocontraction_series(self, window_sec: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Q/H co-contraction index (%) over a sliding window, on the EMG time axis.
+
+        Uses the MVC values stored in ``calibration.json`` when both are present;
+        otherwise the raw RMS envelopes are compared directly. Samples whose window
+        has no activity yet are NaN.
+        """
+        window_sec = window_sec if window_sec is not None else cfg.WINDOW_TIME_SEC
+        t_emg = self.time_axis("emg")
+        rms_ch0 = self.emg_channel(0, "rms")
+        rms_ch1 = self.emg_channel(1, "rms")
+        emg_cal = self.calibration.get("emg_calibration") if isinstance(self.calibration, dict) else None
+        emg_cal = emg_cal if isinstance(emg_cal, dict) else {}
+        mvc0 = emg_cal.get("mvc_ch0")
+        mvc1 = emg_cal.get("mvc_ch1")
+        if not (mvc0 and mvc0 > 0 and mvc1 and mvc1 > 0):
+            mvc0 = mvc1 = 1.0
+        values = cocontraction_series(t_emg, rms_ch0, rms_ch1, window_sec, float(mvc0), float(mvc1))
+        return t_emg[:values.size], values
+
+    # ------------------------------------------------------------------
+    # Stored metrics (summary.json)
+    # ------------------------------------------------------------------
+    def summary(self) -> Dict[str, object]:
+        """Metrics stored at finalize, or {} when the summary is missing or no longer matches the data."""
+        if self._summary is None:
+            self._summary = load_summary(self.session_dir) or {}
+        return self._summary
+
+    def basic_metrics(self) -> Dict[str, float]:
+        """``compute_basic_metrics`` served from the summary when it is valid."""
+        stored = self.summary().get("basic")
+        return dict(stored) if stored is not None else self.compute_basic_metrics()
+
+    def fatigue_metrics(self, channel: int = 0) -> Dict[str, float]:
+        """``compute_fatigue_metrics`` served from the summary when it is valid."""
+        stored = self.summary().get("fatigue", {}).get(str(channel)) if channel in FATIGUE_CHANNELS else None
+        return dict(stored) if stored is not None else self.compute_fatigue_metrics(channel)
+
+    def spectral_metrics(self, channel: int = 0) -> Dict[str, float]:
+        """``compute_spectral_metrics`` (default segment) served from the summary when it is valid."""
+        stored = self.summary().get("spectral", {}).get(str(channel)) if channel in FATIGUE_CHANNELS else None
+        return dict(stored) if stored is not None else self.compute_spectral_metrics(channel)
+
     # ------------------------------------------------------------------
     # Metric computations
     # ------------------------------------------------------------------
@@ -247,12 +670,14 @@ class SessionDataset:
             metrics["angle_mean"] = float(np.mean(angle))
             metrics["angle_std"] = float(np.std(angle))
             if t_angle.size > 1:
-                velocity = np.gradient(angle, t_angle)
+                _, velocity = self.angular_velocity()
                 metrics["velocity_peak"] = float(np.max(np.abs(velocity)))
                 metrics["time_span"] = float(t_angle[-1] - t_angle[0])
-                zero_crossings = np.where(np.diff(np.sign(velocity)) != 0)[0]
-                if zero_crossings.size:
-                    metrics["angle_cycles"] = float(max(1, zero_crossings.size // 2))
+                repetitions = self.repetitions()
+                if repetitions:
+                    metrics["angle_cycles"] = float(len(repetitions))
+                    metrics["rep_rom_mean"] = float(np.mean([rep.rom for rep in repetitions]))
+                    metrics["rep_duration_mean"] = float(np.mean([rep.duration for rep in repetitions]))
         if "time_span" in metrics:
             metrics.setdefault("duration_sec", metrics["time_span"])
         if rms_ch0.size:
@@ -332,6 +757,38 @@ class SessionDataset:
             metrics["median_frequency"] = median_frequency
         return metrics
 
+    def compute_spectral_metrics(self, channel: int = 0, signal: str = "filtered",
+                                 segment_sec: float = 5.0) -> Dict[str, float]:
+        """Peak and median frequency of the last ``segment_sec`` of EMG (Hanning-windowed FFT)."""
+        series = self.emg_channel(channel, signal)
+        times = self.time_axis("emg")
+        limit = min(series.size, times.size)
+        if limit == 0:
+            return {}
+        times = np.asarray(times[:limit], dtype=float)
+        start_idx = 0
+        if segment_sec > 0 and (times[-1] - times[0]) > segment_sec:
+            start_idx = int(np.searchsorted(times, times[-1] - segment_sec))
+        values = np.asarray(series[start_idx:limit], dtype=float)
+        times = times[start_idx:]
+        if times.size < 64:
+            return {}
+        values = np.abs(values) if signal == "rms" else values - np.mean(values)
+        dt = float(np.mean(np.diff(times)))
+        if dt <= 0:
+            return {}
+        psd = np.abs(np.fft.rfft(values * np.hanning(values.size))) ** 2 / values.size
+        freqs = np.fft.rfftfreq(values.size, d=dt)
+        metrics = {
+            "peak_frequency": float(freqs[int(np.argmax(psd))]),
+            "total_power": float(np.sum(psd)),
+            "segment_sec": float(times[-1] - times[0]),
+        }
+        if metrics["total_power"] > 0:
+            idx = int(np.searchsorted(np.cumsum(psd), metrics["total_power"] / 2.0))
+            metrics["median_frequency"] = float(freqs[min(idx, freqs.size - 1)])
+        return metrics
+
 
 # ----------------------------------------------------------------------
 # Repository helpers
@@ -0,0 +1,183 @@
+"""Min/max/mean overview pyramid of a recorded session (``overview.h5``).
+
+Level 1 reduces every ``BUCKET_SAMPLES`` samples of a column to their
+minimum, maximum and mean; each level above merges ``LEVEL_FACTOR`` buckets
+of the one below, until a level has at most ``MIN_LEVEL_BUCKETS`` buckets.
+Bucket times are the mean sample time in seconds on the session timeline,
+with the same origin ``SessionDataset.time_axis`` uses.
+
+The builder is fed the same blocks that go to ``raw_data.h5`` and the file
+is written once at finalize, so a plot can draw the whole session from a
+few thousand points and read full resolution only when zoomed in.
+"""
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .column_buffer import ColumnBuffer
+from .session_writer import continue_unwrap, count_scale, h5py
+
+OVERVIEW_NAME = "overview.h5"
+BUCKET_SAMPLES = 32
+LEVEL_FACTOR = 4
+MIN_LEVEL_BUCKETS = 512
+STATS = ("min", "max", "mean")
+# Small, sequentially read datasets: a light filter keeps the file well below the raw data
+_DATASET_OPTIONS = {"compression": "lzf", "shuffle": True}
+
+# Not signals: nothing to draw
+_SKIPPED_COLUMNS = frozenset(("timestamps_us", "sequence", "rep_marker"))
+
+# (samples per bucket, mean time in µs, samples, {column: {stat: values}})
+Level = Tuple[int, np.ndarray, np.ndarray, Dict[str, Dict[str, np.ndarray]]]
+
+
+class _StreamOverview:
+    """Level-1 buckets of one stream, built block by block."""
+
+    def __init__(self, columns: Sequence[str], scales: Mapping[str, Tuple[float, float]]) -> None:
+        self.columns = tuple(column for column in columns if column not in _SKIPPED_COLUMNS)
+        self.scales = dict(scales)
+        self.first_us: Optional[int] = None
+        self._clock: Optional[int] = None
+        self._pending_t = np.empty(0)
+        self._pending = {column: np.empty(0) for column in self.columns}
+        self._times: List[np.ndarray] = []
+        self._counts: List[np.ndarray] = []
+        self._stats: Dict[str, Dict[str, List[np.ndarray]]] = {
+            column: {stat: [] for stat in STATS} for column in self.columns
+        }
+
+    def feed(self, timestamps: np.ndarray, columns: Mapping[str, np.ndarray]) -> None:
+        if len(timestamps) == 0:
+            return
+        unwrapped = continue_unwrap(timestamps, self._clock)
+        self._clock = int(unwrapped[-1])
+        if self.first_us is None:
+            self.first_us = int(unwrapped[0])
+        times = np.concatenate((self._pending_t, unwrapped.astype(np.float64)))
+        values = {}
+        for column in self.columns:
+            data = np.asarray(columns[column], dtype=np.float64)
+            scale = self.scales.get(column)
+            if scale is not None:
+                data = data / scale[0] * scale[1]
+            values[column] = np.concatenate((self._pending[column], data))
+        full = times.size // BUCKET_SAMPLES * BUCKET_SAMPLES
+        self._reduce(times[:full], {column: data[:full] for column, data in values.items()}, BUCKET_SAMPLES)
+        self._pending_t = times[full:]
+        self._pending = {column: data[full:] for column, data in values.items()}
+
+    def finish(self) -> None:
+        """Close the last, partial bucket."""
+        if self._pending_t.size:
+            self._reduce(self._pending_t, self._pending, self._pending_t.size)
+            self._pending_t = np.empty(0)
+            self._pending = {column: np.empty(0) for column in self.columns}
+
+    def _reduce(self, times: np.ndarray, values: Mapping[str, np.ndarray], width: int) -> None:
+        if times.size == 0:
+            return
+        self._times.append(times.reshape(-1, width).mean(axis=1))
+        self._counts.append(np.full(times.size // width, width, dtype=np.uint32))
+        for column, data in values.items():
+            buckets = data.reshape(-1, width)
+            stats = self._stats[column]
+            stats["min"].append(buckets.min(axis=1))
+            stats["max"].append(buckets.max(axis=1))
+            stats["mean"].append(buckets.mean(axis=1))
+
+    def levels(self) -> Iterator[Level]:
+        """Level 1 and every coarser level, finest first."""
+        if not self._times:
+            return
+        times = np.concatenate(self._times)
+        counts = np.concatenate(self._counts)
+        stats = {column: {stat: np.concatenate(parts) for stat, parts in column_stats.items()}
+                 for column, column_stats in self._stats.items()}
+        samples = BUCKET_SAMPLES
+        while True:
+            yield samples, times, counts, stats
+            if times.size <= MIN_LEVEL_BUCKETS:
+                return
+            starts = np.arange(0, times.size, LEVEL_FACTOR)
+            merged = np.add.reduceat(counts, starts)
+            weights = counts.astype(np.float64)
+            times = np.add.reduceat(times * weights, starts) / merged
+            stats = {
+                column: {
+                    "min": np.minimum.reduceat(column_stats["min"], starts),
+                    "max": np.maximum.reduceat(column_stats["max"], starts),
+                    "mean": np.add.reduceat(column_stats["mean"] * weights, starts) / merged,
+                }
+                for column, column_stats in stats.items()
+            }
+            counts = merged
+            samples *= LEVEL_FACTOR
+
+
+class OverviewBuilder:
+    """Collect the overview of every stream while the session is written.
+
+    ``schemas`` maps each stream to its column names and ``column_attrs``
+    carries the count attributes, so raw-count columns are reduced in
+    physical units.
+    """
+
+    def __init__(self, schemas: Mapping[str, Sequence[str]],
+                 column_attrs: Optional[Mapping[str, Mapping[str, Mapping[str, object]]]] = None) -> None:
+        self._schemas = {stream: tuple(columns) for stream, columns in schemas.items()}
+        self._column_attrs = column_attrs or {}
+        self.reset()
+
+    def reset(self) -> None:
+        self._streams: Dict[str, _StreamOverview] = {}
+        for stream, columns in self._schemas.items():
+            scales = {}
+            for column, attrs in self._column_attrs.get(stream, {}).items():
+                scale = count_scale(attrs)
+                if scale is not None:
+                    scales[column] = scale
+            self._streams[stream] = _StreamOverview(columns, scales)
+
+    def feed(self, stream: str, block: ColumnBuffer) -> None:
+        """Add the rows of ``block`` (a recorder buffer of ``stream``)."""
+        overview = self._streams[stream]
+        for chunk in block.chunks():
+            overview.feed(chunk["timestamps_us"], chunk)
+
+    def origin_us(self) -> int:
+        """First sample of the session, as ``session_time_axes`` defines it."""
+        starts = {stream: overview.first_us for stream, overview in self._streams.items()
+                  if overview.first_us is not None}
+        clock = [starts[stream] for stream in ("emg", "imu") if stream in starts]
+        return min(clock) if clock else starts.get("derived", 0)
+
+    def write(self, path: Path) -> Optional[Path]:
+        """Write the pyramid to ``path``; None if there is nothing to reduce (or no h5py)."""
+        if h5py is None:
+            return None
+        for overview in self._streams.values():
+            overview.finish()
+        if not any(overview.first_us is not None for overview in self._streams.values()):
+            return None
+        origin = self.origin_us()
+        path = Path(path)
+        with h5py.File(path, "w") as handle:
+            handle.attrs["version"] = 1
+            handle.attrs["bucket_samples"] = BUCKET_SAMPLES
+            handle.attrs["level_factor"] = LEVEL_FACTOR
+            for stream, overview in self._streams.items():
+                for number, (samples, times, counts, stats) in enumerate(overview.levels(), start=1):
+                    group = handle.create_group(f"{stream}/level_{number}")
+                    group.attrs["samples_per_bucket"] = samples
+                    group.create_dataset("time", data=(times - origin) / 1e6, **_DATASET_OPTIONS)
+                    group.create_dataset("count", data=counts, **_DATASET_OPTIONS)
+                    for column, column_stats in stats.items():
+                        for stat in STATS:
+                            group.create_dataset(f"{column}/{stat}", data=column_stats[stat].astype(np.float32),
+                                                 **_DATASET_OPTIONS)
+        return path
@@ -3,11 +3,13 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
 import json
+import shutil
 import time
 
 import numpy as np
+from PyQt6.QtCore import QTimer
 
 try:  # Optional dependency for HDF5 storage
     import h5py  # type: ignore
@@ -16,6 +18,70 @@ except ImportError:  # pragma: no cover - optional dependency
 
 from config import settings as cfg
 from utils import save_json
+from .column_buffer import ColumnBuffer
+from .frame_decoder import ACCEL_LSB_PER_G, GYRO_LSB_PER_DPS
+from .session_writer import SegmentedH5Writer, StorageProfile, StreamingH5Writer, storage_profile, write_columns_h5
+from .session_worker import SessionWriterThread
+from .session_journal import JOURNAL_NAME, SessionJournal
+from .session_overview import OVERVIEW_NAME, OverviewBuilder
+from .session_loader import SessionDataset, SessionInfo
+from .session_summary import write_summary
+
+
+# Column schemas of the in-memory buffers (one row per sample)
+EMG_COLUMNS = (
+    ("timestamps_us", np.uint64), ("sequence", np.uint16),
+    ("raw_ch0", np.float32), ("raw_ch1", np.float32),
+    ("filtered_ch0", np.float32), ("filtered_ch1", np.float32),
+    ("rms_ch0", np.float32), ("rms_ch1", np.float32),
+)
+IMU_COLUMNS = (
+    ("timestamps_us", np.uint64), ("sequence", np.uint16),
+    ("accel_x", np.float32), ("accel_y", np.float32), ("accel_z", np.float32),
+    ("gyro_x", np.float32), ("gyro_y", np.float32), ("gyro_z", np.float32),
+    ("angle", np.float32),
+)
+DERIVED_COLUMNS = (
+    ("timestamps_us", np.uint64), ("rom_instant", np.float32), ("velocity_angular", np.float32),
+    ("acceleration_angular", np.float32), ("rep_marker", np.uint16),
+)
+
+
+def _with_dtype(columns, names, dtype):
+    return tuple((name, dtype if name in names else column_dtype) for name, column_dtype in columns)
+
+
+# Raw-count mode: original ADS1256 (int32) and MPU6050 (int16) codes instead of floats
+EMG_COUNT_COLUMNS = _with_dtype(EMG_COLUMNS, ("raw_ch0", "raw_ch1"), np.int32)
+IMU_COUNT_COLUMNS = _with_dtype(
+    IMU_COLUMNS, ("accel_x", "accel_y", "accel_z", "gyro_x", "gyro_y", "gyro_z"), np.int16,
+)
+
+
+def count_attrs() -> Dict[str, Dict[str, Dict[str, object]]]:
+    """Dataset attributes that turn the stored counts back into physical units, per stream and column."""
+    adc = {"units": "counts", "physical_units": "V", "VREF": float(cfg.VREF),
+           "PGA_GAIN": float(cfg.PGA_GAIN), "ADC_RESOLUTION": int(cfg.ADC_RESOLUTION)}
+    accel = {"units": "counts", "physical_units": "g", "LSB_PER_UNIT": ACCEL_LSB_PER_G}
+    gyro = {"units": "counts", "physical_units": "deg/s", "LSB_PER_UNIT": GYRO_LSB_PER_DPS}
+    return {
+        "emg": {"raw_ch0": adc, "raw_ch1": adc},
+        "imu": {**{f"accel_{axis}": accel for axis in "xyz"}, **{f"gyro_{axis}": gyro for axis in "xyz"}},
+    }
+
+# Column -> dataset path inside the group of each stream in raw_data.h5
+EMG_H5_LAYOUT = {
+    "timestamps_us": "timestamps_us", "sequence": "sequence",
+    "raw_ch0": "ch0/raw", "filtered_ch0": "ch0/filtered", "rms_ch0": "ch0/rms",
+    "raw_ch1": "ch1/raw", "filtered_ch1": "ch1/filtered", "rms_ch1": "ch1/rms",
+}
+IMU_H5_LAYOUT = {
+    "timestamps_us": "timestamps_us", "sequence": "sequence",
+    "accel_x": "accel/x", "accel_y": "accel/y", "accel_z": "accel/z",
+    "gyro_x": "gyro/x", "gyro_y": "gyro/y", "gyro_z": "gyro/z",
+    "angle": "angle",
+}
+DERIVED_H5_LAYOUT = {name: name for name, _ in DERIVED_COLUMNS}
 
 
 @dataclass
@@ -41,9 +107,50 @@ class EventMarker:
 
 
 class SessionRecorder:
-    """Manages persistence for a single recording session."""
-
-    def __init__(self, patient_id: str, session_number: int, session_id: str, base_dir: Optional[Path] = None) -> None:
+    """Manages persistence for a single recording session.
+
+    With h5py available, ``start`` opens ``raw_data.h5`` and samples are
+    streamed to it while recording: staged rows are appended whenever a
+    stream fills a block of ``BLOCK_ROWS`` and every ``RECORDING_FLUSH_SEC``
+    seconds, followed by an HDF5 flush. Without h5py (or if ``start`` was
+    never called) samples stay in memory and are written at ``finalize``.
+    With ``SEGMENT_MINUTES`` > 0 the stream is rotated into one file per
+    segment listed in ``segments.json`` (see ``SegmentedH5Writer``).
+
+    Given a ``writer_thread``, the staged blocks, ``finalize`` (through
+    ``finalize_async``) and ``discard`` run on that thread in order, so the
+    GUI thread never waits on disk. Nothing is queued with a blocking put:
+    if the queue is full the rows stay staged and an event snapshot stays
+    pending until the next hand-off, while ``finalize_async`` and ``discard``
+    are retried from a timer. If the thread is not running the work is done
+    in place.
+
+    Chunking, compression and precision of the output follow the storage
+    profile (``STORAGE_PROFILE`` unless ``profile`` is given), which is also
+    recorded under ``storage`` in ``metadata.json``.
+
+    While streaming, every block is first appended to ``journal.bin`` (see
+    ``session_journal``) when ``RECORDING_JOURNAL`` is on, and the journal is
+    synced with each flush. If the program dies, ``recover_session`` rebuilds
+    the session from it; a normal ``finalize`` removes it once the overview
+    and ``summary.json`` are written.
+
+    With ``raw_counts`` (``RECORD_RAW_COUNTS`` by default) the raw EMG and
+    IMU columns keep the integer sensor codes, bit-exact, with the
+    conversion constants as dataset attributes (see ``count_attrs``).
+
+    Every block written also feeds an ``OverviewBuilder``; ``finalize``
+    writes the resulting min/max/mean pyramid to ``overview.h5`` and then
+    the session metrics to ``summary.json`` (see ``session_summary``).
+    """
+
+    BLOCK_ROWS = 16384
+    # Retry period of finalize/discard while the writer queue is full
+    SUBMIT_RETRY_MS = 50
+
+    def __init__(self, patient_id: str, session_number: int, session_id: str, base_dir: Optional[Path] = None,
+                 writer_thread: Optional[SessionWriterThread] = None, profile: Optional[str] = None,
+                 raw_counts: Optional[bool] = None) -> None:
         self.patient_id = patient_id
         self.session_number = session_number
         self.session_id = session_id
@@ -52,11 +159,31 @@ class SessionRecorder:
         self.session_dir = self.patient_dir / "sessions" / session_id
 
         self.session_dir.mkdir(parents=True, exist_ok=True)
-
-        self._emg_records: List[Tuple[int, int, float, float, float, float, float, float]] = []
-        self._imu_records: List[Tuple[int, int, float, float, float, float, float, float, float]] = []
-        self._derived_records: List[Tuple[int, float, float]] = []
+        self.profile: StorageProfile = storage_profile(profile if profile is not None else cfg.STORAGE_PROFILE)
+        # Derived values are computed per IMU sample
+        self._sample_rates = {"emg": float(cfg.EMG_FS), "imu": float(cfg.IMU_FS), "derived": float(cfg.IMU_FS)}
+
+        self.raw_counts = bool(cfg.RECORD_RAW_COUNTS if raw_counts is None else raw_counts)
+        self._column_attrs = count_attrs() if self.raw_counts else {}
+        self._emg = ColumnBuffer(EMG_COUNT_COLUMNS if self.raw_counts else EMG_COLUMNS, self.BLOCK_ROWS)
+        self._imu = ColumnBuffer(IMU_COUNT_COLUMNS if self.raw_counts else IMU_COLUMNS, self.BLOCK_ROWS)
+        self._derived = ColumnBuffer(DERIVED_COLUMNS, self.BLOCK_ROWS)
+        self._streams = (
+            ("emg", self._emg, EMG_H5_LAYOUT),
+            ("imu", self._imu, IMU_H5_LAYOUT),
+            ("derived", self._derived, DERIVED_H5_LAYOUT),
+        )
+        self._overview = OverviewBuilder({stream: buffer.names for stream, buffer, _ in self._streams},
+                                         self._column_attrs)
         self._events: List[EventMarker] = []
+        self._writer: Optional[Union[StreamingH5Writer, SegmentedH5Writer]] = None
+        self._journal: Optional[SessionJournal] = None
+        self._writer_thread = writer_thread
+        # Event snapshot that found the writer queue full; journaled with the next hand-off
+        self._events_pending = False
+        self._last_flush = 0.0
+        # Rows already handed to the file (written or queued), per stream
+        self._rows_out = {stream: 0 for stream, _, _ in self._streams}
 
         self._start_monotonic: Optional[float] = None
         self._emg_start_us: Optional[int] = None
@@ -65,36 +192,228 @@ class SessionRecorder:
     # ------------------------------------------------------------------
     # Lifecycle
     # ------------------------------------------------------------------
-    def start(self, *, emg_start_us: Optional[int] = None, imu_start_us: Optional[int] = None) -> None:
+    def start(self, *, emg_start_us: Optional[int] = None, imu_start_us: Optional[int] = None,
+              metadata: Optional[Dict[str, object]] = None) -> None:
+        """Start the session clock and, with h5py, the streamed file and journal.
+
+        ``metadata`` known at start is kept in the journal so a recovered
+        session still has its patient and session details.
+        """
         self._start_monotonic = time.monotonic()
         self._emg_start_us = emg_start_us
         self._imu_start_us = imu_start_us
+        if h5py is not None and self._writer is None:
+            segment_sec = float(cfg.SEGMENT_MINUTES) * 60.0
+            if segment_sec > 0:
+                self._writer = SegmentedH5Writer(self.session_dir, segment_sec, self.profile, self._sample_rates,
+                                                 self._column_attrs)
+            else:
+                self._writer = StreamingH5Writer(self.session_dir / "raw_data.h5", self.profile,
+                                                 self._sample_rates, self._column_attrs)
+            self._last_flush = self._start_monotonic
+            if cfg.RECORDING_JOURNAL:
+                self._journal = SessionJournal(self.session_dir / JOURNAL_NAME, self._journal_header(metadata))
+
+    def _journal_header(self, metadata: Optional[Dict[str, object]]) -> Dict[str, object]:
+        return {
+            "patient_id": self.patient_id,
+            "session_number": self.session_number,
+            "session_id": self.session_id,
+            "emg_start_us": self._emg_start_us,
+            "imu_start_us": self._imu_start_us,
+            "profile": self.profile.name,
+            "segment_sec": float(cfg.SEGMENT_MINUTES) * 60.0,
+            "raw_counts": self.raw_counts,
+            "sample_rates": self._sample_rates,
+            "schemas": {stream: [(name, dtype.str) for name, dtype in buffer.schema]
+                        for stream, buffer, _ in self._streams},
+            "layouts": {stream: layout for stream, _, layout in self._streams},
+            "column_attrs": self._column_attrs,
+            "metadata": dict(metadata or {}),
+        }
 
     def reset(self) -> None:
-        self._emg_records.clear()
-        self._imu_records.clear()
-        self._derived_records.clear()
+        self._discard_stream()
+        self._emg.clear()
+        self._imu.clear()
+        self._derived.clear()
+        self._overview.reset()
         self._events.clear()
+        self._rows_out = dict.fromkeys(self._rows_out, 0)
         self._start_monotonic = None
         self._emg_start_us = None
         self._imu_start_us = None
 
+    def discard(self) -> None:
+        """Drop everything recorded so far, including the streamed file and the folder if left empty."""
+        if not self._submit_final(lambda _report: self._discard_files()):
+            self._discard_files()
+
+    def _discard_files(self) -> None:
+        self.reset()
+        if self.session_dir.exists() and not any(self.session_dir.iterdir()):
+            shutil.rmtree(self.session_dir, ignore_errors=True)
+
+    def _discard_stream(self) -> None:
+        self._close_journal()
+        if self._writer is None:
+            return
+        self._writer.discard()
+        self._writer = None
+
+    def _close_journal(self, finalized: bool = False) -> None:
+        """Close ``journal.bin`` and delete it: discarded, or no longer needed after finalize."""
+        if self._journal is None:
+            return
+        self._journal.close(finalized, delete=True)
+        self._journal = None
+
     # ------------------------------------------------------------------
     # Data ingestion
     # ------------------------------------------------------------------
+    def _emg_counts(self, volts: np.ndarray) -> np.ndarray:
+        """ADC codes of voltages from the decoder (exact: they were computed from the codes)."""
+        return np.rint(np.asarray(volts, dtype=np.float64) / (cfg.VREF / cfg.PGA_GAIN) * cfg.ADC_RESOLUTION)
+
     def record_emg(self, timestamp_us: int, sequence: int, raw_ch0: float, raw_ch1: float,
                    filtered_ch0: float, filtered_ch1: float, rms_ch0: float, rms_ch1: float) -> None:
-        self._emg_records.append((timestamp_us, sequence, raw_ch0, raw_ch1, filtered_ch0, filtered_ch1, rms_ch0, rms_ch1))
+        if self.raw_counts:
+            raw_ch0, raw_ch1 = self._emg_counts((raw_ch0, raw_ch1))
+        self._emg.append((timestamp_us, sequence, raw_ch0, raw_ch1, filtered_ch0, filtered_ch1, rms_ch0, rms_ch1))
+        if self._writer is not None:
+            self._stream_pending()
 
     def record_imu(self, timestamp_us: int, sequence: int, ax: float, ay: float, az: float,
                    gx: float, gy: float, gz: float, angle_deg: float) -> None:
-        self._imu_records.append((timestamp_us, sequence, ax, ay, az, gx, gy, gz, angle_deg))
-
-    def record_derived(self, timestamp_us: int, rom_instant: float, angular_velocity: float) -> None:
-        self._derived_records.append((timestamp_us, rom_instant, angular_velocity))
+        if self.raw_counts:
+            ax, ay, az = np.rint(np.array((ax, ay, az)) * ACCEL_LSB_PER_G)
+            gx, gy, gz = np.rint(np.array((gx, gy, gz)) * GYRO_LSB_PER_DPS)
+        self._imu.append((timestamp_us, sequence, ax, ay, az, gx, gy, gz, angle_deg))
+        if self._writer is not None:
+            self._stream_pending()
+
+    def record_emg_block(self, timestamps_us: np.ndarray, sequence: np.ndarray, raw: np.ndarray,
+                         filtered: np.ndarray, rms: np.ndarray, counts: Optional[np.ndarray] = None) -> None:
+        """Append a processed EMG batch; ``raw``/``filtered``/``rms`` and the ADC ``counts`` are (2, n)."""
+        if self.raw_counts:
+            raw = counts if counts is not None else self._emg_counts(raw)
+        self._emg.extend((timestamps_us, sequence, raw[0], raw[1], filtered[0], filtered[1], rms[0], rms[1]))
+        if self._writer is not None:
+            self._stream_pending()
+
+    def record_imu_block(self, timestamps_us: np.ndarray, sequence: np.ndarray, accel: np.ndarray,
+                         gyro: np.ndarray, angle_deg: np.ndarray, counts: Optional[np.ndarray] = None) -> None:
+        """Append a processed IMU batch; ``accel``/``gyro`` are (3, n), sensor ``counts`` (6, n)."""
+        if self.raw_counts:
+            if counts is None:
+                counts = np.vstack((np.rint(accel * ACCEL_LSB_PER_G), np.rint(gyro * GYRO_LSB_PER_DPS)))
+            accel, gyro = counts[:3], counts[3:]
+        self._imu.extend((timestamps_us, sequence, accel[0], accel[1], accel[2], gyro[0], gyro[1], gyro[2], angle_deg))
+        if self._writer is not None:
+            self._stream_pending()
+
+    def record_derived(self, timestamp_us: int, rom_instant: float, angular_velocity: float,
+                       angular_acceleration: float = 0.0, rep_marker: int = 0) -> None:
+        self._derived.append((timestamp_us, rom_instant, angular_velocity, angular_acceleration, rep_marker))
+        if self._writer is not None:
+            self._stream_pending()
+
+    def record_derived_block(self, timestamps_us: np.ndarray, rom_instant: np.ndarray, velocity: np.ndarray,
+                             acceleration: np.ndarray, rep_marker: np.ndarray) -> None:
+        """Append a batch from ``DerivedSignalStage`` (one row per IMU sample)."""
+        self._derived.extend((timestamps_us, rom_instant, velocity, acceleration, rep_marker))
+        if self._writer is not None:
+            self._stream_pending()
 
     def add_event(self, event: EventMarker) -> None:
         self._events.append(event)
+        self._journal_events()
+
+    def set_events(self, events: List[EventMarker]) -> None:
+        """Replace the event list (after edits or removals in the UI)."""
+        self._events = list(events)
+        self._journal_events()
+
+    def _journal_events(self) -> None:
+        journal = self._journal
+        if journal is None:
+            return
+        snapshot = [event.to_dict() for event in self._events]
+        if self._threaded:
+            self._events_pending = not self._submit(lambda _report: journal.write_events(snapshot))
+        else:
+            journal.write_events(snapshot)
+
+    # ------------------------------------------------------------------
+    # Streaming to disk
+    # ------------------------------------------------------------------
+    @property
+    def _threaded(self) -> bool:
+        return self._writer_thread is not None and self._writer_thread.isRunning()
+
+    def _submit(self, job: Callable[[Callable[[int, int], None]], Optional[Dict[str, object]]],
+                block: bool = False) -> bool:
+        """Queue ``job`` on the writer thread; False if there is no running thread or (``block`` off) it is full."""
+        return self._writer_thread is not None and self._writer_thread.submit(self.session_id, job, block=block)
+
+    def _submit_final(self, job: Callable[[Callable[[int, int], None]], Optional[Dict[str, object]]]) -> bool:
+        """Queue the last job of the session without waiting; False means it has to run in place.
+
+        While the queue is full the job is retried from a timer on the
+        calling thread; if the writer thread stops meanwhile it runs there.
+        """
+        if not self._threaded:
+            return False
+        if not self._submit(job):
+            QTimer.singleShot(self.SUBMIT_RETRY_MS,
+                              lambda: self._submit_final(job) or job(lambda _done, _total: None))
+        return True
+
+    def _stream_pending(self) -> None:
+        """Hand off full blocks; on the flush period hand off everything staged and flush the file."""
+        if self._events_pending and not self._writer_thread.is_full:
+            self._journal_events()
+        now = time.monotonic()
+        flush = now - self._last_flush >= float(cfg.RECORDING_FLUSH_SEC)
+        if not flush and all(len(buffer) < self.BLOCK_ROWS for _, buffer, _ in self._streams):
+            return
+        if self._writer_thread is not None and self._writer_thread.is_full:
+            return  # Keep staging; retried on the next record call
+        blocks = self._take_staged(1 if flush else self.BLOCK_ROWS)
+        # Blocking put never waits here: the queue is not full and the GUI thread is its only producer
+        if not self._submit(lambda _report: self._write_blocks(blocks, flush), block=True):
+            self._write_blocks(blocks, flush)
+        if flush:
+            self._last_flush = now
+
+    def _take_staged(self, min_rows: int = 1) -> List[Tuple[str, ColumnBuffer, Dict[str, str]]]:
+        """Move the staged rows of every stream with at least ``min_rows`` out of the buffers."""
+        blocks = []
+        for stream, buffer, layout in self._streams:
+            if len(buffer) >= min_rows:
+                self._rows_out[stream] += len(buffer)
+                blocks.append((stream, buffer.take(), layout))
+        return blocks
+
+    def _write_blocks(self, blocks: Sequence[Tuple[str, ColumnBuffer, Dict[str, str]]], flush: bool = False) -> None:
+        for stream, block, layout in blocks:
+            # Journal first: it is the copy that survives a crash
+            if self._journal is not None:
+                self._journal.write_block(stream, block)
+            self._writer.append(stream, block, layout)
+            self._overview.feed(stream, block)
+        if flush:
+            if self._journal is not None:
+                self._journal.sync()
+            self._writer.flush()
+
+    def _close_stream(self) -> Path:
+        """Write the remaining rows and close ``raw_data.h5`` (or the last segment and the manifest)."""
+        self._write_blocks(self._take_staged())
+        path = self._writer.path
+        self._writer.close()
+        self._writer = None
+        return path
 
     # ------------------------------------------------------------------
     # Export helpers
@@ -119,80 +438,29 @@ class SessionRecorder:
             return self._write_raw_data_npz()
 
         with h5py.File(target, "w") as h5:
-            emg_grp = h5.create_group("emg")
-            if self._emg_records:
-                emg_array = np.array(self._emg_records, dtype=np.float64)
-                timestamps = emg_array[:, 0].astype(np.uint64)
-                sequence = emg_array[:, 1].astype(np.uint16)
-                raw = emg_array[:, 2:4].astype(np.float32)
-                filtered = emg_array[:, 4:6].astype(np.float32)
-                rms = emg_array[:, 6:8].astype(np.float32)
-
-                emg_grp.create_dataset("timestamps_us", data=timestamps)
-                emg_grp.create_dataset("sequence", data=sequence)
-                ch0_grp = emg_grp.create_group("ch0")
-                ch1_grp = emg_grp.create_group("ch1")
-                ch0_grp.create_dataset("raw", data=raw[:, 0])
-                ch0_grp.create_dataset("filtered", data=filtered[:, 0])
-                ch0_grp.create_dataset("rms", data=rms[:, 0])
-                ch1_grp.create_dataset("raw", data=raw[:, 1])
-                ch1_grp.create_dataset("filtered", data=filtered[:, 1])
-                ch1_grp.create_dataset("rms", data=rms[:, 1])
-
-            imu_grp = h5.create_group("imu")
-            if self._imu_records:
-                imu_array = np.array(self._imu_records, dtype=np.float64)
-                imu_grp.create_dataset("timestamps_us", data=imu_array[:, 0].astype(np.uint64))
-                imu_grp.create_dataset("sequence", data=imu_array[:, 1].astype(np.uint16))
-                accel_grp = imu_grp.create_group("accel")
-                gyro_grp = imu_grp.create_group("gyro")
-                accel_grp.create_dataset("x", data=imu_array[:, 2].astype(np.float32))
-                accel_grp.create_dataset("y", data=imu_array[:, 3].astype(np.float32))
-                accel_grp.create_dataset("z", data=imu_array[:, 4].astype(np.float32))
-                gyro_grp.create_dataset("x", data=imu_array[:, 5].astype(np.float32))
-                gyro_grp.create_dataset("y", data=imu_array[:, 6].astype(np.float32))
-                gyro_grp.create_dataset("z", data=imu_array[:, 7].astype(np.float32))
-                imu_grp.create_dataset("angle", data=imu_array[:, 8].astype(np.float32))
-
-            if self._derived_records:
-                derived_grp = h5.create_group("derived")
-                derived_array = np.array(self._derived_records, dtype=np.float64)
-                derived_grp.create_dataset("timestamps_us", data=derived_array[:, 0].astype(np.uint64))
-                derived_grp.create_dataset("rom_instant", data=derived_array[:, 1].astype(np.float32))
-                derived_grp.create_dataset("velocity_angular", data=derived_array[:, 2].astype(np.float32))
+            h5.attrs["storage_profile"] = self.profile.name
+            h5.create_group("emg")
+            h5.create_group("imu")
+            for stream, buffer, layout in self._streams:
+                if len(buffer):
+                    group = h5.require_group(stream)
+                    write_columns_h5(group, buffer, layout, self.profile, self._sample_rates[stream],
+                                     self._column_attrs.get(stream))
         return target
 
     def _write_raw_data_npz(self) -> Path:
         target = self.session_dir / "raw_data.npz"
         payload: Dict[str, np.ndarray] = {}
-        if self._emg_records:
-            emg_array = np.array(self._emg_records, dtype=np.float64)
-            payload["emg_timestamps_us"] = emg_array[:, 0].astype(np.uint64)
-            payload["emg_sequence"] = emg_array[:, 1].astype(np.uint16)
-            payload["emg_raw_ch0"] = emg_array[:, 2].astype(np.float32)
-            payload["emg_raw_ch1"] = emg_array[:, 3].astype(np.float32)
-            payload["emg_filtered_ch0"] = emg_array[:, 4].astype(np.float32)
-            payload["emg_filtered_ch1"] = emg_array[:, 5].astype(np.float32)
-            payload["emg_rms_ch0"] = emg_array[:, 6].astype(np.float32)
-            payload["emg_rms_ch1"] = emg_array[:, 7].astype(np.float32)
-        if self._imu_records:
-            imu_array = np.array(self._imu_records, dtype=np.float64)
-            payload["imu_timestamps_us"] = imu_array[:, 0].astype(np.uint64)
-            payload["imu_sequence"] = imu_array[:, 1].astype(np.uint16)
-            payload["imu_accel_x"] = imu_array[:, 2].astype(np.float32)
-            payload["imu_accel_y"] = imu_array[:, 3].astype(np.float32)
-            payload["imu_accel_z"] = imu_array[:, 4].astype(np.float32)
-            payload["imu_gyro_x"] = imu_array[:, 5].astype(np.float32)
-            payload["imu_gyro_y"] = imu_array[:, 6].astype(np.float32)
-            payload["imu_gyro_z"] = imu_array[:, 7].astype(np.float32)
-            payload["imu_angle"] = imu_array[:, 8].astype(np.float32)
-        if self._derived_records:
-            derived_array = np.array(self._derived_records, dtype=np.float64)
-            payload["derived_timestamps_us"] = derived_array[:, 0].astype(np.uint64)
-            payload["derived_rom_instant"] = derived_array[:, 1].astype(np.float32)
-            payload["derived_velocity_angular"] = derived_array[:, 2].astype(np.float32)
+        for prefix, buffer in (("emg", self._emg), ("imu", self._imu), ("derived", self._derived)):
+            if len(buffer):
+                for name in buffer.names:
+                    payload[f"{prefix}_{name}"] = buffer.column(name)
+                    # npz has no attributes: one scalar entry per attribute ("emg_raw_ch0@VREF")
+                    for attr, value in self._column_attrs.get(prefix, {}).get(name, {}).items():
+                        payload[f"{prefix}_{name}@{attr}"] = np.asarray(value)
         if payload:
-            np.savez(target, **payload)
+            save = np.savez_compressed if self.profile.compression else np.savez
+            save(target, **payload)
         else:  # pragma: no cover - empty session
             target.touch()
         return target
@@ -200,30 +468,89 @@ class SessionRecorder:
     # ------------------------------------------------------------------
     # Public finalization
     # ------------------------------------------------------------------
-    def finalize(self, metadata: Dict[str, object], calibration: Dict[str, object], notes: str) -> Dict[str, Path]:
-        self._write_metadata(metadata)
-        self._write_events()
-        self._write_calibration(calibration)
-        self._write_notes(notes or "")
-        data_path = self._write_raw_data_h5()
-        return {
+    def finalize(self, metadata: Dict[str, object], calibration: Dict[str, object], notes: str,
+                 report: Optional[Callable[[int, int], None]] = None) -> Dict[str, Path]:
+        metadata = {**metadata, "storage": self.storage_info()}
+        steps = (
+            lambda: self._write_metadata(metadata),
+            self._write_events,
+            lambda: self._write_calibration(calibration),
+            lambda: self._write_notes(notes or ""),
+        )
+        total = len(steps) + 3
+        for done, step in enumerate(steps, start=1):
+            step()
+            if report is not None:
+                report(done, total)
+        if self._writer is not None:
+            data_path = self._close_stream()
+        else:
+            for stream, buffer, _ in self._streams:
+                self._overview.feed(stream, buffer)
+            data_path = self._write_raw_data_h5()
+        if report is not None:
+            report(total - 2, total)
+        overview_path = self._overview.write(self.session_dir / OVERVIEW_NAME)
+        if report is not None:
+            report(total - 1, total)
+        try:
+            summary_path = write_summary(
+                SessionDataset(self.patient_id, SessionInfo(self.session_id, self.session_dir, metadata)))
+        except (OSError, ValueError):  # The data is already saved; the summary backfill retries later
+            summary_path = None
+        # Last: while journal.bin exists SummaryBackfillThread leaves the session alone
+        self._close_journal(finalized=True)
+        if report is not None:
+            report(total, total)
+        paths = {
             "metadata": self.session_dir / "metadata.json",
             "events": self.session_dir / "events.json",
             "calibration": self.session_dir / "calibration.json",
             "notes": self.session_dir / "notes.txt",
             "data": data_path,
         }
+        if overview_path is not None:
+            paths["overview"] = overview_path
+        if summary_path is not None:
+            paths["summary"] = summary_path
+        return paths
+
+    def finalize_async(self, metadata: Dict[str, object], calibration: Dict[str, object], notes: str) -> bool:
+        """Queue ``finalize`` on the writer thread.
+
+        The outcome arrives through the thread's ``progress``, ``session_saved``
+        and ``failed`` signals; the recorder must not be used afterwards.
+        Returns False when there is no running writer thread (call ``finalize``).
+        """
+        return self._submit_final(lambda report: self.finalize(metadata, calibration, notes, report))
 
     # ------------------------------------------------------------------
     # Introspection helpers
     # ------------------------------------------------------------------
+    def storage_info(self) -> Dict[str, object]:
+        """Format and profile of ``raw_data`` as stored in the metadata."""
+        if h5py is not None:
+            return {"format": "hdf5", **self.profile.describe(), "raw_counts": self.raw_counts}
+        # The npz fallback only honours the compression choice (zip deflate, lossless)
+        return {"format": "npz", "profile": self.profile.name, "raw_counts": self.raw_counts,
+                "compression": "zip" if self.profile.compression else "none", "lossless": True}
+
     @property
     def emg_sample_count(self) -> int:
-        return len(self._emg_records)
+        return self._rows_out["emg"] + len(self._emg)
 
     @property
     def imu_sample_count(self) -> int:
-        return len(self._imu_records)
+        return self._rows_out["imu"] + len(self._imu)
+
+    @property
+    def is_streaming(self) -> bool:
+        return self._writer is not None
+
+    @property
+    def memory_bytes(self) -> int:
+        """Memory reserved by the sample buffers (only unwritten rows while streaming)."""
+        return self._emg.nbytes + self._imu.nbytes + self._derived.nbytes
 
     @property
     def has_started(self) -> bool:
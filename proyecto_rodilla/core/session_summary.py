@@ -0,0 +1,111 @@
+"""Metrics of a session computed once and stored in ``summary.json``.
+
+The summary holds the basic, fatigue, spectral and per-repetition metrics
+of ``SessionDataset``. It is only trusted while ``version`` equals
+``SUMMARY_VERSION`` (bumped whenever a metric computation changes) and
+``data_hash``, a SHA-256 of the data files and ``events.json``, matches the
+files on disk. The size and mtime of each hashed file are stored as well,
+so the hash is only recomputed when one of them changed.
+"""
+from __future__ import annotations
+
+import hashlib
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from config import settings as cfg
+from utils import load_json, save_json
+from .session_journal import JOURNAL_NAME
+from .session_writer import MANIFEST_NAME
+
+SUMMARY_NAME = "summary.json"
+SUMMARY_VERSION = 1
+FATIGUE_CHANNELS = (0, 1)
+_HASH_BLOCK = 1 << 20
+
+
+def summary_inputs(session_dir: Path) -> List[Path]:
+    """Files the metrics are computed from, in a fixed order."""
+    session_dir = Path(session_dir)
+    names = ["raw_data.h5", "raw_data.npz", MANIFEST_NAME]
+    manifest = load_json(str(session_dir / MANIFEST_NAME))
+    names.extend(segment["file"] for segment in (manifest or {}).get("segments", []))
+    names.append("events.json")
+    return [session_dir / name for name in names if (session_dir / name).exists()]
+
+
+def _file_stats(paths: List[Path]) -> Dict[str, List[int]]:
+    stats = {}
+    for path in paths:
+        info = path.stat()
+        stats[path.name] = [info.st_size, info.st_mtime_ns]
+    return stats
+
+
+def data_hash(paths: List[Path]) -> str:
+    digest = hashlib.sha256()
+    for path in paths:
+        digest.update(path.name.encode("utf-8"))
+        with open(path, "rb") as handle:
+            for block in iter(lambda: handle.read(_HASH_BLOCK), b""):
+                digest.update(block)
+    return f"sha256:{digest.hexdigest()}"
+
+
+def build_summary(dataset) -> Dict[str, object]:
+    """Compute every metric of ``dataset`` (a ``SessionDataset``) from its data."""
+    paths = summary_inputs(dataset.session_dir)
+    return {
+        "version": SUMMARY_VERSION,
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "data_hash": data_hash(paths),
+        "files": _file_stats(paths),
+        "basic": dataset.compute_basic_metrics(),
+        "fatigue": {str(channel): dataset.compute_fatigue_metrics(channel) for channel in FATIGUE_CHANNELS},
+        "spectral": {str(channel): dataset.compute_spectral_metrics(channel) for channel in FATIGUE_CHANNELS},
+        "repetitions": [record.to_dict() for record in dataset.compute_repetitions()],
+    }
+
+
+def write_summary(dataset) -> Path:
+    """Compute and store ``summary.json`` for ``dataset``; returns its path."""
+    target = Path(dataset.session_dir) / SUMMARY_NAME
+    save_json(build_summary(dataset), str(target))
+    return target
+
+
+def load_summary(session_dir: Path) -> Optional[Dict[str, object]]:
+    """The stored summary if it is still valid for the files on disk, else None."""
+    session_dir = Path(session_dir)
+    path = session_dir / SUMMARY_NAME
+    if not path.exists():
+        return None
+    try:
+        summary = load_json(str(path))
+    except ValueError:  # Truncated or hand-edited file
+        return None
+    if not isinstance(summary, dict) or summary.get("version") != SUMMARY_VERSION:
+        return None
+    paths = summary_inputs(session_dir)
+    stats = _file_stats(paths)
+    if stats == summary.get("files"):
+        return summary
+    # Copied or touched files: only the content decides
+    if data_hash(paths) != summary.get("data_hash"):
+        return None
+    summary["files"] = stats
+    save_json(summary, str(path))
+    return summary
+
+
+def sessions_needing_summary(root: Optional[Path] = None) -> List[Path]:
+    """Finalized session folders under ``root`` without a valid summary."""
+    root = Path(root) if root is not None else cfg.PROJECT_ROOT / "data" / "patients"
+    if not root.exists():
+        return []
+    return [
+        session_dir for session_dir in sorted(path.parent for path in root.glob("*/sessions/*/metadata.json"))
+        if not (session_dir / JOURNAL_NAME).exists() and summary_inputs(session_dir)
+        and load_summary(session_dir) is None
+    ]
@@ -0,0 +1,154 @@
+"""Background threads: persisting recorded sessions, recovering interrupted ones and backfilling summaries."""
+from __future__ import annotations
+
+import queue
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+from PyQt6.QtCore import QThread, pyqtSignal
+
+from config import settings as cfg
+from utils import load_json
+from .session_journal import find_interrupted_sessions, recover_session
+from .session_loader import SessionDataset, SessionInfo
+from .session_summary import sessions_needing_summary, write_summary
+
+# A job receives ``report(done, total)`` and returns the saved paths, or None for intermediate writes
+WriterJob = Callable[[Callable[[int, int], None]], Optional[Dict[str, object]]]
+
+
+class SessionWriterThread(QThread):
+    """Single consumer of a bounded queue of write jobs.
+
+    Jobs run strictly in the order they were queued, so every block of a
+    session reaches its file before the session's finalize job. A job that
+    raises emits ``failed`` and the thread keeps serving the next ones.
+    """
+
+    progress = pyqtSignal(str, int, int)  # (session_id, done, total)
+    session_saved = pyqtSignal(str, dict)  # (session_id, paths)
+    failed = pyqtSignal(str, str)  # (session_id, message)
+
+    def __init__(self, max_pending: Optional[int] = None) -> None:
+        super().__init__()
+        size = cfg.WRITER_QUEUE_SIZE if max_pending is None else max_pending
+        self._queue: "queue.Queue[Optional[tuple]]" = queue.Queue(maxsize=max(1, int(size)))
+
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    @property
+    def is_full(self) -> bool:
+        return self._queue.full()
+
+    def submit(self, session_id: str, job: WriterJob, block: bool = True) -> bool:
+        """Queue ``job``; returns False if the thread is not running or the queue is full."""
+        if not self.isRunning():
+            return False
+        try:
+            self._queue.put((session_id, job), block=block)
+        except queue.Full:
+            return False
+        return True
+
+    def run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            session_id, job = item
+            try:
+                result = job(lambda done, total: self.progress.emit(session_id, done, total))
+            except Exception as exc:  # reported to the GUI, the next jobs still run
+                self.failed.emit(session_id, str(exc) or type(exc).__name__)
+            else:
+                if result is not None:
+                    self.session_saved.emit(session_id, result)
+
+    def stop(self, wait: bool = True) -> None:
+        """Run every queued job and then stop the thread."""
+        if not self.isRunning():
+            return
+        self._queue.put(None)
+        if wait:
+            self.wait()
+
+
+class SummaryBackfillThread(QThread):
+    """Write ``summary.json`` for finalized sessions without a valid one.
+
+    Separate from the shared writer, so summarizing many older sessions
+    never delays the blocks of a recording in progress. ``stop`` lets the
+    session being summarized finish and skips the rest.
+    """
+
+    summarized = pyqtSignal(str)  # session folder
+    failed = pyqtSignal(str, str)  # (session folder, message)
+
+    def __init__(self, root: Optional[Path] = None) -> None:
+        super().__init__()
+        self.root = root
+
+    def run(self) -> None:
+        for session_dir in sessions_needing_summary(self.root):
+            if self.isInterruptionRequested():
+                break
+            metadata = load_json(str(session_dir / "metadata.json"))
+            info = SessionInfo(session_id=session_dir.name, path=session_dir, metadata=metadata or {})
+            try:
+                write_summary(SessionDataset(session_dir.parent.parent.name, info))
+            except Exception as exc:  # reported to the GUI, the next sessions still run
+                self.failed.emit(str(session_dir), str(exc) or type(exc).__name__)
+            else:
+                self.summarized.emit(str(session_dir))
+
+    def stop(self, wait: bool = True) -> None:
+        self.requestInterruption()
+        if wait:
+            self.wait()
+
+
+class SessionRecoveryThread(QThread):
+    """Rebuild interrupted sessions from their journal (see ``session_journal``).
+
+    Rebuilding an hour-long journal takes seconds, so it never runs on the
+    GUI thread. Sessions still being recorded, by this or another process,
+    are not touched. ``stop`` lets the session being rebuilt finish.
+    """
+
+    recovered = pyqtSignal(str)  # session folder
+    failed = pyqtSignal(str, str)  # (session folder, message)
+
+    def __init__(self, root: Optional[Path] = None) -> None:
+        super().__init__()
+        self.root = root
+
+    def run(self) -> None:
+        for session_dir in find_interrupted_sessions(self.root):
+            if self.isInterruptionRequested():
+                break
+            try:
+                recover_session(session_dir)
+            except (OSError, ValueError, RuntimeError, KeyError) as exc:
+                self.failed.emit(str(session_dir), str(exc))
+            else:
+                self.recovered.emit(str(session_dir))
+
+    def stop(self, wait: bool = True) -> None:
+        self.requestInterruption()
+        if wait:
+            self.wait()
+
+
+_shared_writer: Optional[SessionWriterThread] = None
+
+
+def shared_writer() -> SessionWriterThread:
+    """Writer thread shared by the whole application (started on first use)."""
+    global _shared_writer
+    if _shared_writer is None:
+        _shared_writer = SessionWriterThread()
+    if not _shared_writer.isRunning():
+        _shared_writer.start()
+    return _shared_writer
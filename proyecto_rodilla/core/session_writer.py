@@ -0,0 +1,330 @@
+"""Storage profiles and the incremental HDF5 writer used by SessionRecorder."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+try:  # Optional dependency for HDF5 storage
+    import h5py  # type: ignore
+except ImportError:  # pragma: no cover - optional dependency
+    h5py = None
+
+from utils import save_json
+from .alignment import unwrap_timestamps
+from .column_buffer import ColumnBuffer
+
+MANIFEST_NAME = "segments.json"
+SEGMENT_NAME = "raw_data_{:03d}.h5"
+_TIMESTAMP_PERIOD = 1 << 32  # Device timestamps are 32-bit microseconds
+
+
+@dataclass(frozen=True)
+class StorageProfile:
+    """Chunking, filters and precision of the datasets in ``raw_data.h5``.
+
+    Chunks span ``chunk_sec`` seconds of a stream, so reading a time window
+    only decompresses the chunks it overlaps. ``decimals`` maps float columns
+    to the decimal digits kept by the HDF5 scale-offset filter; profiles
+    without it are lossless.
+    """
+
+    name: str
+    chunk_sec: float
+    compression: Optional[str] = None
+    compression_opts: Optional[int] = None
+    shuffle: bool = False
+    decimals: Optional[Mapping[str, int]] = None
+
+    @property
+    def lossless(self) -> bool:
+        return self.decimals is None
+
+    def chunk_rows(self, sample_rate: float) -> int:
+        return max(256, int(round(self.chunk_sec * sample_rate)))
+
+    def dataset_options(self, column: str, dtype: np.dtype, sample_rate: float) -> Dict[str, object]:
+        """Keyword arguments for ``create_dataset`` (besides shape and dtype)."""
+        options: Dict[str, object] = {"chunks": (self.chunk_rows(sample_rate),)}
+        if self.compression:
+            options["compression"] = self.compression
+            if self.compression_opts is not None:
+                options["compression_opts"] = self.compression_opts
+        if self.shuffle:
+            options["shuffle"] = True
+        if self.decimals is not None:
+            if np.dtype(dtype).kind in "iu":
+                options["scaleoffset"] = 0  # Lossless: minimum bits above the block minimum
+            elif column in self.decimals:
+                options["scaleoffset"] = self.decimals[column]
+        return options
+
+    def describe(self) -> Dict[str, object]:
+        """Profile summary stored in ``metadata.json`` and the file attributes."""
+        return {
+            "profile": self.name,
+            "chunk_sec": self.chunk_sec,
+            "compression": self.compression or "none",
+            "compression_opts": self.compression_opts,
+            "shuffle": self.shuffle,
+            "lossless": self.lossless,
+            "decimals": dict(self.decimals) if self.decimals is not None else None,
+        }
+
+
+# Decimal digits kept by the archival profile: below the ADC step (~0.39 µV) for
+# EMG volts, 0.1 mg for acceleration and 0.01 °/s or ° for gyro, angle and velocity
+ARCHIVAL_DECIMALS = {
+    "raw_ch0": 7, "raw_ch1": 7, "filtered_ch0": 7, "filtered_ch1": 7, "rms_ch0": 7, "rms_ch1": 7,
+    "accel_x": 4, "accel_y": 4, "accel_z": 4,
+    "gyro_x": 2, "gyro_y": 2, "gyro_z": 2,
+    "angle": 2, "rom_instant": 2, "velocity_angular": 2, "acceleration_angular": 1,
+}
+
+STORAGE_PROFILES: Dict[str, StorageProfile] = {
+    "fast": StorageProfile("fast", chunk_sec=2.0, compression="lzf", shuffle=True),
+    "lossless-compact": StorageProfile("lossless-compact", chunk_sec=4.0, compression="gzip",
+                                       compression_opts=4, shuffle=True),
+    "archival": StorageProfile("archival", chunk_sec=8.0, compression="gzip", compression_opts=9,
+                               shuffle=True, decimals=ARCHIVAL_DECIMALS),
+}
+DEFAULT_STORAGE_PROFILE = "lossless-compact"
+
+
+def count_scale(attrs) -> Optional[Tuple[float, float]]:
+    """``(divisor, factor)`` turning stored sensor counts into physical units, if the column holds counts."""
+    if str(attrs.get("units", "")) != "counts":
+        return None
+    if "ADC_RESOLUTION" in attrs:
+        # Same operations as FrameDecoder, so the volts match the live values bit for bit
+        return float(attrs["ADC_RESOLUTION"]), float(attrs["VREF"]) / float(attrs["PGA_GAIN"])
+    if "LSB_PER_UNIT" in attrs:
+        return float(attrs["LSB_PER_UNIT"]), 1.0
+    return None
+
+
+def continue_unwrap(timestamps: np.ndarray, previous: Optional[int]) -> np.ndarray:
+    """Unwrap ``timestamps`` as the continuation of a stream whose last unwrapped value is ``previous``.
+
+    Gives the same values ``unwrap_timestamps`` gives over the whole stream.
+    """
+    unwrapped = unwrap_timestamps(timestamps)
+    if previous is not None:
+        offset = previous // _TIMESTAMP_PERIOD * _TIMESTAMP_PERIOD
+        if int(unwrapped[0]) + offset < previous - _TIMESTAMP_PERIOD // 2:
+            offset += _TIMESTAMP_PERIOD
+        unwrapped = unwrapped + offset
+    return unwrapped
+
+
+def storage_profile(name: Optional[str]) -> StorageProfile:
+    """Profile called ``name`` (the default one for unknown names)."""
+    return STORAGE_PROFILES.get(str(name), STORAGE_PROFILES[DEFAULT_STORAGE_PROFILE])
+
+
+def write_columns_h5(group, buffer: ColumnBuffer, layout: Dict[str, str], profile: StorageProfile,
+                     sample_rate: float, attrs: Optional[Mapping[str, Mapping[str, object]]] = None) -> None:
+    """Create one dataset per column and fill it chunk by chunk (no full-size temporaries)."""
+    total = len(buffer)
+    datasets = {}
+    for name, dtype in buffer.schema:
+        options = profile.dataset_options(name, dtype, sample_rate)
+        # A fixed-size dataset cannot have chunks longer than itself
+        options["chunks"] = (max(1, min(total, options["chunks"][0])),)
+        datasets[name] = group.create_dataset(layout[name], shape=(total,), dtype=dtype, **options)
+        datasets[name].attrs.update((attrs or {}).get(name, {}))
+    offset = 0
+    for chunk in buffer.chunks():
+        rows = len(chunk[buffer.names[0]])
+        for name, dataset in datasets.items():
+            dataset[offset:offset + rows] = chunk[name]
+        offset += rows
+
+
+class StreamingH5Writer:
+    """Append sample columns to resizable, chunked datasets of ``raw_data.h5``.
+
+    Datasets are created on the first block of each stream with the same
+    paths the one-shot writer used (``emg/ch0/raw``, ``imu/accel/x``...), so
+    ``SessionDataset`` reads streamed files unchanged. Each dataset grows by
+    the rows written; chunking and filters come from the storage profile.
+    """
+
+    def __init__(self, path: Path, profile: StorageProfile, sample_rates: Mapping[str, float],
+                 column_attrs: Optional[Mapping[str, Mapping[str, Mapping[str, object]]]] = None) -> None:
+        if h5py is None:  # pragma: no cover - guarded by the recorder
+            raise RuntimeError("h5py is required for streaming HDF5 output")
+        self.path = Path(path)
+        self.profile = profile
+        self.sample_rates = dict(sample_rates)
+        self.column_attrs = column_attrs or {}
+        self._file = h5py.File(self.path, "w")
+        self._file.attrs["storage_profile"] = profile.name
+        # Same top-level groups as a finalized file, even if a stream stays empty
+        self._file.create_group("emg")
+        self._file.create_group("imu")
+        self._datasets: Dict[str, Dict[str, object]] = {}
+        self.rows: Dict[str, int] = {}
+
+    @property
+    def is_open(self) -> bool:
+        return self._file is not None
+
+    def _create_datasets(self, stream: str, buffer: ColumnBuffer, layout: Dict[str, str]) -> Dict[str, object]:
+        group = self._file.require_group(stream)
+        rate = self.sample_rates[stream]
+        attrs = self.column_attrs.get(stream, {})
+        datasets = {}
+        for name, dtype in buffer.schema:
+            datasets[name] = group.create_dataset(layout[name], shape=(0,), maxshape=(None,), dtype=dtype,
+                                                  **self.profile.dataset_options(name, dtype, rate))
+            datasets[name].attrs.update(attrs.get(name, {}))
+        self._datasets[stream] = datasets
+        self.rows[stream] = 0
+        return datasets
+
+    def append(self, stream: str, buffer: ColumnBuffer, layout: Dict[str, str]) -> int:
+        """Write every row staged in ``buffer`` at the end of ``stream``; returns rows written."""
+        total = len(buffer)
+        if total == 0:
+            return 0
+        datasets = self._datasets.get(stream) or self._create_datasets(stream, buffer, layout)
+        offset = self.rows[stream]
+        for dataset in datasets.values():
+            dataset.resize((offset + total,))
+        for chunk in buffer.chunks():
+            rows = len(chunk[buffer.names[0]])
+            for name, dataset in datasets.items():
+                dataset[offset:offset + rows] = chunk[name]
+            offset += rows
+        self.rows[stream] = offset
+        return total
+
+    def flush(self) -> None:
+        """Push written blocks to disk so a crash keeps everything up to here."""
+        if self._file is not None:
+            self._file.flush()
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def discard(self) -> None:
+        """Close and delete the file."""
+        self.close()
+        self.path.unlink(missing_ok=True)
+
+
+class SegmentedH5Writer:
+    """Rotate the streamed data into ``raw_data_NNN.h5`` files of ``segment_sec`` seconds each.
+
+    Same interface as ``StreamingH5Writer``. A new segment starts with the
+    first block whose device timestamps fall ``segment_sec`` or more after the
+    start of the current segment. ``segments.json`` lists the segments with
+    their rows, row offset and time span per stream: ``start_us``/``end_us``
+    are unwrapped exactly as ``unwrap_timestamps`` does over the whole
+    stream, so a reader can place a segment on the session timeline without
+    opening it. The manifest is rewritten at every rotation, so a crash
+    leaves a consistent list of the closed segments.
+    """
+
+    def __init__(self, session_dir: Path, segment_sec: float, profile: StorageProfile,
+                 sample_rates: Mapping[str, float],
+                 column_attrs: Optional[Mapping[str, Mapping[str, Mapping[str, object]]]] = None) -> None:
+        self.session_dir = Path(session_dir)
+        self.path = self.session_dir / MANIFEST_NAME
+        self.segment_us = int(segment_sec * 1e6)
+        self._args = (profile, sample_rates, column_attrs)
+        self.segments: List[Dict[str, object]] = []
+        self.rows: Dict[str, int] = {}
+        # Last unwrapped timestamp per stream
+        self._clock: Dict[str, int] = {}
+        self._current: Optional[StreamingH5Writer] = None
+        self._open_segment()
+
+    @property
+    def is_open(self) -> bool:
+        return self._current is not None
+
+    def _open_segment(self) -> None:
+        name = SEGMENT_NAME.format(len(self.segments))
+        self._current = StreamingH5Writer(self.session_dir / name, *self._args)
+        self.segments.append({"file": name, "streams": {}})
+
+    def _due(self, timestamps: np.ndarray) -> bool:
+        """True if the block starting at ``timestamps[0]`` belongs to the next segment.
+
+        The boundary is measured from the first block of the segment, whatever
+        its stream, so every stream rotates together. A block that starts
+        before it (the IMU hand-off that follows the EMG block opening the
+        segment) stays in the segment.
+        """
+        streams = self.segments[-1]["streams"]
+        if not streams:
+            return False
+        start = next(iter(streams.values()))["first_us"]
+        # Signed difference: the 32-bit device clock wraps every ~71 minutes
+        half = _TIMESTAMP_PERIOD // 2
+        elapsed = (int(timestamps[0]) - start + half) % _TIMESTAMP_PERIOD - half
+        return elapsed >= self.segment_us
+
+    def _unwrap(self, stream: str, timestamps: np.ndarray) -> np.ndarray:
+        """Continue the unwrapped clock of ``stream`` over ``timestamps``."""
+        unwrapped = continue_unwrap(timestamps, self._clock.get(stream))
+        self._clock[stream] = int(unwrapped[-1])
+        return unwrapped
+
+    def append(self, stream: str, buffer: ColumnBuffer, layout: Dict[str, str]) -> int:
+        if len(buffer) == 0:
+            return 0
+        timestamps = buffer.column("timestamps_us")
+        if self._due(timestamps):
+            self.rotate()
+        written = self._current.append(stream, buffer, layout)
+        unwrapped = self._unwrap(stream, timestamps)
+        info = self.segments[-1]["streams"].setdefault(stream, {
+            "rows": 0, "row_offset": self.rows.get(stream, 0),
+            "first_us": int(timestamps[0]), "start_us": int(unwrapped[0]),
+        })
+        info["rows"] += written
+        info["end_us"] = int(unwrapped[-1])
+        self.rows[stream] = self.rows.get(stream, 0) + written
+        return written
+
+    def rotate(self) -> None:
+        """Close the current segment and start the next one."""
+        self._current.close()
+        self._write_manifest()
+        self._open_segment()
+
+    def _write_manifest(self) -> None:
+        # Segments that never received a block are left out
+        segments = [segment for segment in self.segments if segment["streams"]]
+        profile = self._args[0]
+        save_json({"version": 1, "segment_sec": self.segment_us / 1e6, "storage_profile": profile.name,
+                   "rows": dict(self.rows), "segments": segments}, str(self.path))
+
+    def flush(self) -> None:
+        if self._current is not None:
+            self._current.flush()
+
+    def close(self) -> None:
+        if self._current is None:
+            return
+        self._current.close()
+        self._current = None
+        if not self.segments[-1]["streams"]:
+            (self.session_dir / self.segments[-1]["file"]).unlink(missing_ok=True)
+        self._write_manifest()
+
+    def discard(self) -> None:
+        """Close and delete every segment and the manifest."""
+        if self._current is not None:
+            self._current.close()
+            self._current = None
+        for segment in self.segments:
+            (self.session_dir / segment["file"]).unlink(missing_ok=True)
+        self.path.unlink(missing_ok=True)
@@ -6,6 +6,8 @@ from scipy import signal
 from collections import deque
 from typing import Optional
 from config import settings as cfg
+from .orientation import GyroBiasTracker, create_orientation_filter
+from .line_noise import LineNoiseCanceller
 
 
 class EMGProcessor:
@@ -21,8 +23,11 @@ class EMGProcessor:
         # Pasa-bajas (Butterworth 4° orden)
         self.sos_lp = signal.butter(4, cfg.EMG_LOWPASS_CUTOFF, 'lp', fs=self.fs, output='sos')
         
-        # Notch (IIR)
+        # Interferencia de red: notch IIR fijo o cancelador adaptativo
         self.b_notch, self.a_notch = signal.iirnotch(cfg.EMG_NOTCH_FREQ, cfg.EMG_NOTCH_Q, self.fs)
+        self.line_canceller: Optional[LineNoiseCanceller] = None
+        if cfg.EMG_LINE_FILTER == "adaptive":
+            self.line_canceller = LineNoiseCanceller(fs=self.fs)
         
         # Estados de los filtros (para procesamiento continuo)
         self.zi_hp = signal.sosfilt_zi(self.sos_hp)
@@ -44,7 +49,10 @@ class EMGProcessor:
         
         # Aplicar filtros en cascada
         filtered, self.zi_hp = signal.sosfilt(self.sos_hp, [sample], zi=self.zi_hp)
-        filtered, self.zi_notch = signal.lfilter(self.b_notch, self.a_notch, filtered, zi=self.zi_notch)
+        if self.line_canceller is not None:
+            filtered[0] = self.line_canceller.process_sample(filtered[0])
+        else:
+            filtered, self.zi_notch = signal.lfilter(self.b_notch, self.a_notch, filtered, zi=self.zi_notch)
         filtered, self.zi_lp = signal.sosfilt(self.sos_lp, filtered, zi=self.zi_lp)
         
         filtered_sample = filtered[0]
@@ -54,25 +62,65 @@ class EMGProcessor:
         rms_value = np.sqrt(np.mean(self.rms_buffer)) if len(self.rms_buffer) > 0 else 0.0
         
         return filtered_sample, rms_value
+
+    def process_block(self, samples: np.ndarray) -> tuple:
+        """
+        Procesa un bloque de muestras EMG con el mismo estado que ``process_sample``.
+
+        Returns:
+            (arreglo_filtrado, arreglo_rms)
+        """
+        samples = np.asarray(samples, dtype=np.float64)
+        if samples.size == 0:
+            return np.empty(0), np.empty(0)
+
+        filtered, self.zi_hp = signal.sosfilt(self.sos_hp, samples, zi=self.zi_hp)
+        if self.line_canceller is not None:
+            filtered = self.line_canceller.process_block(filtered)
+        else:
+            filtered, self.zi_notch = signal.lfilter(self.b_notch, self.a_notch, filtered, zi=self.zi_notch)
+        filtered, self.zi_lp = signal.sosfilt(self.sos_lp, filtered, zi=self.zi_lp)
+
+        # RMS móvil continuando la ventana anterior (sumas acumuladas)
+        history = np.fromiter(self.rms_buffer, dtype=np.float64, count=len(self.rms_buffer))
+        squares = np.concatenate((history, filtered ** 2))
+        cumulative = np.concatenate(([0.0], np.cumsum(squares)))
+        window = self.rms_buffer.maxlen or 1
+        ends = np.arange(history.size + 1, squares.size + 1)
+        starts = np.maximum(0, ends - window)
+        mean_sq = (cumulative[ends] - cumulative[starts]) / (ends - starts)
+        rms = np.sqrt(np.maximum(mean_sq, 0.0))
+
+        self.rms_buffer.extend(squares[max(history.size, squares.size - window):])
+        return filtered, rms
     
     def reset(self):
         """Reinicia estados de los filtros"""
         self.zi_hp = signal.sosfilt_zi(self.sos_hp)
         self.zi_lp = signal.sosfilt_zi(self.sos_lp)
         self.zi_notch = signal.lfilter_zi(self.b_notch, self.a_notch)
+        if self.line_canceller is not None:
+            self.line_canceller.reset()
         self.rms_buffer.clear()
 
 
 class AngleCalculator:
     """
     Calcula el ángulo de flexión de rodilla usando fusión accel + gyro.
+    El backend de fusión se elige con ``ORIENTATION_FILTER``.
     IMU montado con X lateral, Y superior (hacia la rodilla) y Z anterior (hacia el frente).
     """
     
-    def __init__(self, alpha: Optional[float] = None, fs: Optional[float] = None):
+    def __init__(self, alpha: Optional[float] = None, fs: Optional[float] = None,
+                 backend: Optional[str] = None, bias_tracking: Optional[bool] = None):
         self.alpha = alpha if alpha is not None else cfg.COMPLEMENTARY_FILTER_ALPHA
         imu_fs = fs if fs is not None else cfg.IMU_FS
         self.dt = 1.0 / imu_fs if imu_fs else 0.02
+
+        # Backend de fusión (complementario, Kalman o Mahony)
+        self.filter = create_orientation_filter(backend, alpha=self.alpha)
+        tracking = bias_tracking if bias_tracking is not None else cfg.GYRO_BIAS_TRACKING
+        self.bias_tracker: Optional[GyroBiasTracker] = GyroBiasTracker() if tracking else None
         
         # Estado
         self.angle = 0.0  # Ángulo actual (°)
@@ -96,11 +144,17 @@ class AngleCalculator:
         # Usar arctan2 para obtener ángulo respecto a gravedad
         angle = np.degrees(np.arctan2(-az, ay))
         return angle
+
+    @property
+    def gyro_bias(self) -> float:
+        """Sesgo estimado del giroscopio en el eje de flexión (°/s)."""
+        bias = self.bias_tracker.bias if self.bias_tracker is not None else 0.0
+        return bias + getattr(self.filter, "bias", 0.0)
     
     def update(self, ax: float, ay: float, az: float, 
                gx: float, gy: float, gz: float, timestamp_us: float) -> float:
         """
-        Actualiza el ángulo usando filtro complementario.
+        Actualiza el ángulo con el backend de orientación configurado.
         
         Args:
             ax, ay, az: Aceleración en g
@@ -113,6 +167,8 @@ class AngleCalculator:
         # Calcular dt real (en caso de que no sea constante)
         if self.last_time is not None:
             dt = (timestamp_us - self.last_time) / 1e6  # a segundos
+            if dt <= 0:
+                dt = self.dt  # Reinicio o desborde del contador del MCU
         else:
             dt = self.dt
         
@@ -121,12 +177,16 @@ class AngleCalculator:
         # Ángulo del acelerómetro (referencia absoluta pero ruidoso)
         angle_accel = self.calculate_angle_accel(ax, ay, az)
         
-        # Integración del giroscopio (rotación de flexión alrededor del eje lateral X)
+        # Velocidad de flexión (rotación alrededor del eje lateral X)
         gyro_rate = -gx
-        angle_gyro = self.angle + gyro_rate * dt
+        still = False
+        if self.bias_tracker is not None:
+            accel_norm = float(np.sqrt(ax * ax + ay * ay + az * az))
+            bias = self.bias_tracker.update(gyro_rate, accel_norm)
+            still = self.bias_tracker.is_still
+            gyro_rate -= bias
         
-        # Filtro complementario
-        self.angle = self.alpha * angle_gyro + (1 - self.alpha) * angle_accel
+        self.angle = self.filter.step(self.angle, angle_accel, gyro_rate, dt, still)
 
         raw_uncalibrated = self.angle + self._uncalibrated_offset
         self.last_uncalibrated_angle = raw_uncalibrated
@@ -138,6 +198,43 @@ class AngleCalculator:
             calibrated_angle = raw_uncalibrated
         
         return calibrated_angle
+
+    def update_block(self, ax: np.ndarray, ay: np.ndarray, az: np.ndarray,
+                     gx: np.ndarray, gy: np.ndarray, gz: np.ndarray,
+                     timestamps_us: np.ndarray) -> np.ndarray:
+        """
+        Versión por bloque de ``update`` para ráfagas de muestras IMU.
+
+        Returns:
+            Arreglo de ángulos de flexión calibrados (°)
+        """
+        ax = np.asarray(ax, dtype=np.float64)
+        ay = np.asarray(ay, dtype=np.float64)
+        az = np.asarray(az, dtype=np.float64)
+        timestamps = np.asarray(timestamps_us, dtype=np.float64)
+        if timestamps.size == 0:
+            return np.empty(0)
+
+        previous = self.last_time if self.last_time is not None else timestamps[0] - self.dt * 1e6
+        dt = np.diff(timestamps, prepend=previous) / 1e6
+        dt[dt <= 0] = self.dt
+        self.last_time = timestamps_us[-1]
+
+        angle_accel = self.calculate_angle_accel(ax, ay, az)
+        gyro_rate = -np.asarray(gx, dtype=np.float64)
+        still = None
+        if self.bias_tracker is not None:
+            accel_norm = np.sqrt(ax * ax + ay * ay + az * az)
+            bias, still = self.bias_tracker.update_block(gyro_rate, accel_norm)
+            gyro_rate = gyro_rate - bias
+
+        angles = self.filter.step_block(self.angle, angle_accel, gyro_rate, dt, still)
+        self.angle = float(angles[-1])
+        self.last_uncalibrated_angle = self.angle + self._uncalibrated_offset
+
+        if self.calibrated:
+            return (angles - self.offset) * self.scale
+        return angles + self._uncalibrated_offset
     
     def calibrate_one_point(self, angle_ref: float = 0.0):
         """Calibración de 1 punto (solo offset)."""
@@ -174,4 +271,7 @@ class AngleCalculator:
         self.calibrated = False
         self.offset = 0.0
         self.scale = 1.0
-        self.last_uncalibrated_angle = self._uncalibrated_offset
\ No newline at end of file
+        self.last_uncalibrated_angle = self._uncalibrated_offset
+        self.filter.reset()
+        if self.bias_tracker is not None:
+            self.bias_tracker.reset()
\ No newline at end of file
@@ -0,0 +1,99 @@
+"""
+Espectrograma EMG en flujo continuo (STFT incremental).
+
+``StreamingSpectrogram`` recibe bloques de la señal filtrada y calcula solo
+las columnas nuevas: ventanas de ``nfft`` muestras con avance fijo ``hop``,
+ventana precalculada y densidad espectral en dB. Las muestras que aún no
+completan una ventana se conservan para el siguiente bloque, así que el
+resultado no depende del tamaño de los bloques.
+
+Cada canal escribe sus columnas en un ``RingBuffer`` (frecuencias × columnas)
+preasignado; ``image`` devuelve la vista tiempo × frecuencia sin copia,
+lista para un ``pg.ImageItem``.
+"""
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy import signal
+from typing import Optional, Tuple
+
+from .ring_buffer import RingBuffer
+
+
+class StreamingSpectrogram:
+    """STFT por bloques de varias señales con anillo de imagen por canal."""
+
+    def __init__(self, fs: float, channels: int = 1, nfft: int = 256, hop: Optional[int] = None,
+                 columns: int = 256, max_freq: Optional[float] = None, window: str = "hann"):
+        self.fs = float(fs)
+        self.channels = int(channels)
+        self.nfft = int(nfft)
+        self.hop = max(1, int(hop if hop is not None else self.nfft // 4))
+        self.window = signal.get_window(window, self.nfft).astype(np.float64)
+        # Densidad espectral unilateral (V²/Hz)
+        self._scale = 1.0 / (self.fs * float(np.sum(self.window ** 2)))
+
+        freqs = np.fft.rfftfreq(self.nfft, 1.0 / self.fs)
+        max_freq = self.fs / 2 if max_freq is None else min(float(max_freq), self.fs / 2)
+        self.freqs = freqs[freqs <= max_freq]
+        bins = self.freqs.size
+
+        names = tuple(f"bin{i}" for i in range(bins))
+        self.images = [RingBuffer(columns, names, dtype=np.float32) for _ in range(self.channels)]
+        self.times = RingBuffer(columns, ("time",))
+        self.reset()
+
+    @property
+    def column_sec(self) -> float:
+        """Separación temporal entre columnas (s)."""
+        return self.hop / self.fs
+
+    def reset(self):
+        for image in self.images:
+            image.clear()
+        self.times.clear()
+        self._pending = np.empty((self.channels, 0))
+        self._pending_t = np.empty(0)
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    def process(self, times: np.ndarray, data: np.ndarray) -> int:
+        """
+        Agrega muestras (canales × n) y calcula las columnas completas.
+
+        Returns:
+            Número de columnas nuevas.
+        """
+        data = np.asarray(data, dtype=np.float64).reshape(self.channels, -1)
+        buffer = np.concatenate((self._pending, data), axis=1)
+        time_buffer = np.concatenate((self._pending_t, np.asarray(times, dtype=np.float64)))
+        n = time_buffer.size
+        count = 0 if n < self.nfft else (n - self.nfft) // self.hop + 1
+        if count:
+            frames = sliding_window_view(buffer, self.nfft, axis=1)[:, :count * self.hop:self.hop, :]
+            spectrum = np.fft.rfft(frames * self.window, axis=2)[..., :self.freqs.size]
+            power = (spectrum.real ** 2 + spectrum.imag ** 2) * self._scale
+            power[..., 1:] *= 2.0
+            db = 10.0 * np.log10(np.maximum(power, 1e-20))
+            for channel, image in enumerate(self.images):
+                image.extend(db[channel].T.astype(np.float32))
+            center = self.nfft // 2
+            self.times.extend(time_buffer[np.newaxis, center:center + count * self.hop:self.hop])
+        consumed = count * self.hop
+        self._pending = buffer[:, consumed:]
+        self._pending_t = time_buffer[consumed:]
+        return count
+
+    def image(self, channel: int) -> np.ndarray:
+        """Columnas vigentes del canal como imagen tiempo × frecuencia (dB, sin copia)."""
+        return self.images[channel].view().T
+
+    def extent(self) -> Optional[Tuple[float, float, float, float]]:
+        """(x, y, ancho, alto) de la imagen en segundos y Hz, centrando cada columna en su ventana."""
+        if len(self.times) == 0:
+            return None
+        times = self.times.view()[0]
+        x0 = float(times[0]) - 0.5 * self.column_sec
+        width = float(times[-1] - times[0]) + self.column_sec
+        df = self.freqs[1] - self.freqs[0] if self.freqs.size > 1 else 0.0
+        return x0, -0.5 * float(df), width, self.freqs.size * float(df)
@@ -59,6 +59,7 @@ from core.session_loader import (
     discover_patients,
     load_session,
 )
+from core.session_worker import SessionRecoveryThread, SummaryBackfillThread
 from utils.helpers import load_json
 
 
@@ -143,6 +144,12 @@ class SessionAnalysisWindow(QMainWindow):
         self._current_dataset: Optional[SessionDataset] = None
         self._crosshair_lines: List[pg.InfiniteLine] = []
         self._event_markers: List[pg.InfiniteLine] = []
+        # Curvas dibujadas desde overview.h5: (curva, fuente, columna, escala)
+        self._overview_curves: List[Tuple[pg.PlotDataItem, str, str, float]] = []
+        self._summary_backfill: Optional[SummaryBackfillThread] = None
+        self._session_recovery: Optional[SessionRecoveryThread] = None
+        # (carpeta, error o None) de la recuperación en curso
+        self._recovery_results: List[Tuple[str, Optional[str]]] = []
         self._emg_mode = "filtered"
         self.accel_curves: Dict[str, pg.PlotDataItem] = {}
         self.gyro_curves: Dict[str, pg.PlotDataItem] = {}
@@ -473,6 +480,13 @@ class SessionAnalysisWindow(QMainWindow):
         for key in ("emg_ch1", "angle", "velocity", "accel", "gyro"):
             self.plots[key].widget.setXLink(self.plots["emg_ch0"].widget)
 
+        # Al hacer zoom se relee el nivel del overview que corresponde a la vista
+        self.overview_timer = QtCore.QTimer(self)
+        self.overview_timer.setSingleShot(True)
+        self.overview_timer.setInterval(60)
+        self.overview_timer.timeout.connect(self._refresh_overview_curves)
+        self.plots["emg_ch0"].widget.sigXRangeChanged.connect(lambda *_: self.overview_timer.start())
+
         for channel in self.plots.values():
             layout.addWidget(channel.widget, stretch=1)
 
@@ -503,6 +517,22 @@ class SessionAnalysisWindow(QMainWindow):
         self.metrics_table.setEditTriggers(QtWidgets.QAbstractItemView.EditTrigger.NoEditTriggers)
         tabs.addTab(self.metrics_table, "Métricas biomecánicas")
 
+        # Tab 1b: Repetitions --------------------------------------------
+        self.repetitions_table = QTableWidget(0, 7)
+        self.repetitions_table.setHorizontalHeaderLabels([
+            "#",
+            "Inicio (s)",
+            "Duración (s)",
+            "ROM (°)",
+            "Ángulo mín (°)",
+            "Ángulo máx (°)",
+            "Vel. pico (°/s)",
+        ])
+        self.repetitions_table.horizontalHeader().setStretchLastSection(True)
+        self.repetitions_table.verticalHeader().setVisible(False)
+        self.repetitions_table.setEditTriggers(QtWidgets.QAbstractItemView.EditTrigger.NoEditTriggers)
+        tabs.addTab(self.repetitions_table, "Repeticiones")
+
         # Tab 2: Fatigue -------------------------------------------------
         fatigue_panel = QWidget()
         fatigue_layout = QVBoxLayout(fatigue_panel)
@@ -595,6 +625,10 @@ class SessionAnalysisWindow(QMainWindow):
     # Data loading and tree population
     # ------------------------------------------------------------------
     def _load_patients(self) -> None:
+        self._list_patients()
+        self._start_session_recovery()
+
+    def _list_patients(self) -> None:
         self._patients = discover_patients()
         self._populate_tree()
         session_types = sorted({info.metadata.get("session_type", "") for patient in self._patients for info in patient.sessions})
@@ -607,6 +641,52 @@ class SessionAnalysisWindow(QMainWindow):
         self.type_filter.blockSignals(False)
         self.status_label.setText(f"Pacientes encontrados: {len(self._patients)}")
 
+    def _start_session_recovery(self) -> None:
+        # Sesiones interrumpidas (cierre inesperado): se reconstruyen desde su journal en segundo plano
+        if self._session_recovery is not None and self._session_recovery.isRunning():
+            return
+        self._recovery_results = []
+        self._session_recovery = SessionRecoveryThread(cfg.PROJECT_ROOT / "data" / "patients")
+        self._session_recovery.recovered.connect(self._on_session_recovered)
+        self._session_recovery.failed.connect(self._on_session_recovery_failed)
+        self._session_recovery.finished.connect(self._on_session_recovery_finished)
+        self._session_recovery.start()
+
+    def _on_session_recovered(self, path: str) -> None:
+        self._recovery_results.append((path, None))
+
+    def _on_session_recovery_failed(self, path: str, error: str) -> None:
+        self._recovery_results.append((path, error))
+
+    def _on_session_recovery_finished(self) -> None:
+        recovered = sum(error is None for _, error in self._recovery_results)
+        if recovered:
+            # Metadatos reconstruidos: se vuelve a listar
+            self._list_patients()
+        status = self.status_label.text()
+        if recovered:
+            status += f" | Sesiones recuperadas: {recovered}"
+        failed = [f"{Path(path).name}: {error}" for path, error in self._recovery_results if error is not None]
+        if failed:
+            status += f" | Sin recuperar: {len(failed)}"
+            self.status_label.setToolTip("\n".join(failed))
+        self.status_label.setText(status)
+        self._start_summary_backfill()
+
+    def _start_summary_backfill(self) -> None:
+        # Sesiones sin summary.json válido (antiguas o editadas): las métricas se calculan en segundo plano
+        if self._summary_backfill is not None and self._summary_backfill.isRunning():
+            return
+        self._summary_backfill = SummaryBackfillThread(cfg.PROJECT_ROOT / "data" / "patients")
+        self._summary_backfill.start()
+
+    def closeEvent(self, event):  # pragma: no cover - UI lifecycle hook
+        if self._session_recovery is not None:
+            self._session_recovery.stop()
+        if self._summary_backfill is not None:
+            self._summary_backfill.stop()
+        super().closeEvent(event)
+
     def _populate_tree(self) -> None:
         self.session_tree.clear()
         for patient in self._patients:
@@ -626,6 +706,14 @@ class SessionAnalysisWindow(QMainWindow):
         item.setText(2, str(session.metadata.get("session_type", "")))
         item.setData(0, Qt.ItemDataRole.UserRole, (patient_id, session))
         icon = self.style().standardIcon(QtWidgets.QStyle.StandardPixmap.SP_FileDialogContentsView)
+        if session.recovered:
+            recovery = session.metadata.get("recovery") or {}
+            item.setText(0, f"{label} ⚠ recuperada")
+            item.setToolTip(0, (
+                f"Reconstruida desde el journal el {recovery.get('recovered_at', '?')}\n"
+                f"Bloques: {recovery.get('blocks', '?')} | Registros dañados: {recovery.get('bad_records', 0)}"
+            ))
+            icon = self.style().standardIcon(QtWidgets.QStyle.StandardPixmap.SP_MessageBoxWarning)
         item.setIcon(0, icon)
 
     def _apply_filters(self) -> None:
@@ -676,9 +764,12 @@ class SessionAnalysisWindow(QMainWindow):
         profile = next((p.profile for p in self._patients if p.patient_id == dataset.patient_id), {})
 
         self.meta_labels["patient"].setText(f"{profile.get('name', '--')} ({dataset.patient_id})")
-        self.meta_labels["session"].setText(dataset.session_info.session_id)
+        session_text = dataset.session_info.session_id
+        if dataset.session_info.recovered:
+            session_text += " (recuperada)"
+        self.meta_labels["session"].setText(session_text)
         self.meta_labels["date"].setText(f"{metadata.get('date', '--')} {metadata.get('time_start', '')}")
-        duration = metadata.get("duration_sec") or dataset.compute_basic_metrics().get("time_span", 0)
+        duration = metadata.get("duration_sec") or dataset.basic_metrics().get("time_span", 0)
         self.meta_labels["duration"].setText(f"{duration:.1f} s" if duration else "--")
         self.meta_labels["session_type"].setText(str(metadata.get("session_type", "--")))
         self.meta_labels["protocol"].setText(str(metadata.get("protocol", "--")))
@@ -688,6 +779,7 @@ class SessionAnalysisWindow(QMainWindow):
         self._update_plots(dataset)
         self._update_quick_stats(dataset)
         self._populate_metrics_tab(dataset)
+        self._populate_repetitions_tab(dataset)
         self._populate_fatigue_tab(dataset)
         self._populate_events_tab(dataset)
         self._populate_compare_tab(dataset)
@@ -696,17 +788,78 @@ class SessionAnalysisWindow(QMainWindow):
     # ------------------------------------------------------------------
     # Plotting helpers
     # ------------------------------------------------------------------
+    @staticmethod
+    def _full_series(dataset: SessionDataset, source: str, column: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Serie completa de ``column`` (clave interna, p. ej. ``rms_ch0``) recortada a su eje de tiempo."""
+        times = dataset.time_axis(source)
+        if source == "emg":
+            kind, channel = column.rsplit("_ch", 1)
+            values = dataset.emg_channel(int(channel), kind)
+        elif source == "derived":
+            values = dataset.derived_series(column)
+        else:
+            values = dataset.imu_series(column)
+        limit = min(len(times), len(values))
+        return times[:limit], values[:limit]
+
+    def _plot_series(self, curve: pg.PlotDataItem, dataset: SessionDataset, source: str, column: str,
+                     scale: float = 1.0) -> bool:
+        """Dibuja ``column`` de ``source``; False si no hay datos.
+
+        Con overview solo se leen los puntos que caben en pantalla entre los
+        extremos de la sesión; la serie completa se carga solo si no lo hay.
+        """
+        self._overview_curves = [entry for entry in self._overview_curves if entry[0] is not curve]
+        if dataset.has_overview:
+            bounds = dataset.time_bounds(source)
+            times = values = np.array([])
+            if bounds is not None:
+                pixels = self.plots["emg_ch0"].widget.width()
+                times, values = dataset.overview_series(source, column, pixels, *bounds)
+            if times.size:
+                self._overview_curves.append((curve, source, column, scale))
+        else:
+            times, values = self._full_series(dataset, source, column)
+        if times.size == 0:
+            curve.clear()
+            return False
+        curve.setData(times, values * scale)
+        return True
+
+    def _timeline(self, dataset: SessionDataset) -> Tuple[str, Optional[Tuple[float, float]]]:
+        """Flujo que recorre el deslizador (EMG, o IMU si no hay EMG) y sus tiempos extremos."""
+        bounds = dataset.time_bounds("emg")
+        if bounds is not None:
+            return "emg", bounds
+        return "imu", dataset.time_bounds("imu")
+
+    def _slider_time(self, dataset: SessionDataset, position: int) -> Optional[float]:
+        """Tiempo (s) de una posición del deslizador (una por muestra del flujo de ``_timeline``)."""
+        source, bounds = self._timeline(dataset)
+        if bounds is None:
+            return None
+        if dataset.has_overview:
+            # Sin cargar el eje completo: muestreo uniforme entre los extremos
+            return bounds[0] + (bounds[1] - bounds[0]) * position / max(1, self.slider.maximum())
+        t_axis = dataset.time_axis(source)
+        return float(t_axis[min(position, len(t_axis) - 1)])
+
+    def _refresh_overview_curves(self) -> None:
+        dataset = self._current_dataset
+        if dataset is None or not self._overview_curves:
+            return
+        widget = self.plots["emg_ch0"].widget
+        (x_start, x_end), _ = widget.viewRange()
+        for curve, source, column, scale in self._overview_curves:
+            times, values = dataset.overview_series(source, column, widget.width(), x_start, x_end)
+            curve.setData(times, values * scale)
+
     def _update_plots(self, dataset: SessionDataset) -> None:
-        t_emg = dataset.time_axis("emg")
-        t_imu = dataset.time_axis("imu")
+        self._overview_curves = []
+        source, _ = self._timeline(dataset)
 
         self.slider.blockSignals(True)
-        if t_emg.size:
-            self.slider.setMaximum(len(t_emg) - 1)
-        elif t_imu.size:
-            self.slider.setMaximum(len(t_imu) - 1)
-        else:
-            self.slider.setMaximum(0)
+        self.slider.setMaximum(max(0, dataset.sample_count(source) - 1))
         self.slider.setValue(0)
         self.slider.blockSignals(False)
 
@@ -714,24 +867,17 @@ class SessionAnalysisWindow(QMainWindow):
 
         self._refresh_emg_curves(dataset)
 
-        angle_series = dataset.angle_series()
-        if angle_series.size and t_imu.size:
-            limit = min(len(angle_series), len(t_imu))
-            self.plots["angle"].curve.setData(t_imu[:limit], angle_series[:limit])
-        else:
-            self.plots["angle"].curve.clear()
+        self._plot_series(self.plots["angle"].curve, dataset, "imu", "angle")
 
-        velocity = dataset.derived_series("velocity")
-        if velocity.size == 0 and angle_series.size and t_imu.size > 1:
-            velocity = np.gradient(angle_series, t_imu)
-        if velocity.size and t_imu.size:
-            limit = min(len(velocity), len(t_imu))
-            self.plots["velocity"].curve.setData(t_imu[:limit], velocity[:limit])
-        else:
-            self.plots["velocity"].curve.clear()
+        # Sesiones antiguas sin velocidad registrada (ni overview): gradiente del ángulo
+        plotted = self._plot_series(self.plots["velocity"].curve, dataset, "derived", "velocity")
+        if not plotted and not dataset.has_overview:
+            t_velocity, velocity = dataset.angular_velocity()
+            if velocity.size:
+                self.plots["velocity"].curve.setData(t_velocity, velocity)
 
-        accel_available = self._update_accel_data(dataset, t_imu)
-        gyro_available = self._update_gyro_data(dataset, t_imu)
+        accel_available = self._update_accel_data(dataset)
+        gyro_available = self._update_gyro_data(dataset)
         self._set_axis_controls_enabled(accel_available, gyro_available)
         self._apply_imu_visibility()
 
@@ -769,40 +915,22 @@ class SessionAnalysisWindow(QMainWindow):
         if not self._current_dataset:
             return
         range_seconds = self.range_spin.value()
-        center = self.slider.value()
-        t_axis = self._current_dataset.time_axis("emg")
-        if t_axis.size == 0:
-            t_axis = self._current_dataset.time_axis("imu")
-        if t_axis.size == 0:
+        _, bounds = self._timeline(self._current_dataset)
+        center_time = self._slider_time(self._current_dataset, self.slider.value())
+        if bounds is None or center_time is None:
             return
-        if center >= len(t_axis):
-            center = len(t_axis) - 1
-        center_time = t_axis[center]
         min_time = max(0.0, center_time - range_seconds / 2)
-        max_time = min(t_axis[-1], center_time + range_seconds / 2)
+        max_time = min(bounds[1], center_time + range_seconds / 2)
         for channel in self.plots.values():
             channel.widget.setXRange(min_time, max_time, padding=0.02)
         for line in self._crosshair_lines:
             line.setPos(center_time)
 
     def _refresh_emg_curves(self, dataset: SessionDataset) -> None:
-        t_emg = dataset.time_axis("emg")
         mode = self._emg_mode or "filtered"
-        if t_emg.size == 0:
-            for ch in (0, 1):
-                self.plots[f"emg_ch{ch}"].curve.clear()
-            return
         for ch in (0, 1):
-            values = dataset.emg_channel(ch, "rms" if mode == "rms" else mode)
-            if values.size == 0:
-                self.plots[f"emg_ch{ch}"].curve.clear()
-                continue
-            limit = min(len(values), len(t_emg))
-            if mode == "rms":
-                y_data = np.abs(values[:limit]) * 1e3
-            else:
-                y_data = values[:limit] * 1e3
-            self.plots[f"emg_ch{ch}"].curve.setData(t_emg[:limit], y_data)
+            # La envolvente RMS ya es no negativa
+            self._plot_series(self.plots[f"emg_ch{ch}"].curve, dataset, "emg", f"{mode}_ch{ch}", 1e3)
         self._update_emg_axis_labels()
 
     def _update_emg_axis_labels(self) -> None:
@@ -812,40 +940,30 @@ class SessionAnalysisWindow(QMainWindow):
         for ch in (0, 1):
             self.plots[f"emg_ch{ch}"].widget.setLabel("left", f"EMG Canal {ch} ({label})", units="mV")
 
-    def _update_accel_data(self, dataset: SessionDataset, t_imu: np.ndarray) -> bool:
+    def _update_accel_data(self, dataset: SessionDataset) -> bool:
         available = False
         for axis, curve in self.accel_curves.items():
-            series = dataset.imu_series(f"accel_{axis}")
+            plotted = self._plot_series(curve, dataset, "imu", f"accel_{axis}")
+            available = available or plotted
             checkbox = self.accel_axis_checks.get(axis)
-            if series.size and t_imu.size:
-                limit = min(len(series), len(t_imu))
-                curve.setData(t_imu[:limit], series[:limit])
-                available = True
-            else:
-                curve.clear()
             if checkbox:
                 checkbox.blockSignals(True)
-                checkbox.setEnabled(series.size > 0)
-                if not series.size:
+                checkbox.setEnabled(plotted)
+                if not plotted:
                     checkbox.setChecked(False)
                 checkbox.blockSignals(False)
         return available
 
-    def _update_gyro_data(self, dataset: SessionDataset, t_imu: np.ndarray) -> bool:
+    def _update_gyro_data(self, dataset: SessionDataset) -> bool:
         available = False
         for axis, curve in self.gyro_curves.items():
-            series = dataset.imu_series(f"gyro_{axis}")
+            plotted = self._plot_series(curve, dataset, "imu", f"gyro_{axis}")
+            available = available or plotted
             checkbox = self.gyro_axis_checks.get(axis)
-            if series.size and t_imu.size:
-                limit = min(len(series), len(t_imu))
-                curve.setData(t_imu[:limit], series[:limit])
-                available = True
-            else:
-                curve.clear()
             if checkbox:
                 checkbox.blockSignals(True)
-                checkbox.setEnabled(series.size > 0)
-                if not series.size:
+                checkbox.setEnabled(plotted)
+                if not plotted:
                     checkbox.setChecked(False)
                 checkbox.blockSignals(False)
         return available
@@ -927,19 +1045,21 @@ class SessionAnalysisWindow(QMainWindow):
         dataset = self._current_dataset
         if not dataset:
             return
-        t_axis = dataset.time_axis("emg")
-        if t_axis.size == 0:
-            t_axis = dataset.time_axis("imu")
-        if t_axis.size == 0:
+        source, bounds = self._timeline(dataset)
+        if bounds is None:
             return
-        idx = int(np.argmin(np.abs(t_axis - ts)))
-        self.slider.setValue(idx)
+        if dataset.has_overview:
+            span = max(bounds[1] - bounds[0], 1e-9)
+            idx = int(round((ts - bounds[0]) / span * self.slider.maximum()))
+        else:
+            idx = int(np.argmin(np.abs(dataset.time_axis(source) - ts)))
+        self.slider.setValue(min(max(idx, 0), self.slider.maximum()))
 
     # ------------------------------------------------------------------
     # Metrics and tabs population
     # ------------------------------------------------------------------
     def _update_quick_stats(self, dataset: SessionDataset) -> None:
-        metrics = dataset.compute_basic_metrics()
+        metrics = dataset.basic_metrics()
         rom_total = metrics.get("rom_total")
         if rom_total is not None:
             self.quick_stats["rom_total"].setText(f"{rom_total:.2f} °")
@@ -984,7 +1104,7 @@ class SessionAnalysisWindow(QMainWindow):
             self.quick_stats["angle_cycles"].setText("--")
 
     def _populate_metrics_tab(self, dataset: SessionDataset) -> None:
-        metrics = dataset.compute_basic_metrics()
+        metrics = dataset.basic_metrics()
         rows = [
             ("Duración", metrics.get("duration_sec"), "s"),
             ("ROM total", metrics.get("rom_total"), "°"),
@@ -994,6 +1114,8 @@ class SessionAnalysisWindow(QMainWindow):
             ("Desvío estándar ángulo", metrics.get("angle_std"), "°"),
             ("Velocidad máxima", metrics.get("velocity_peak"), "°/s"),
             ("Ciclos estimados", metrics.get("angle_cycles"), ""),
+            ("ROM medio por repetición", metrics.get("rep_rom_mean"), "°"),
+            ("Duración media repetición", metrics.get("rep_duration_mean"), "s"),
             ("Peak RMS C0", metrics.get("rms_ch0_peak"), "mV"),
             ("Peak RMS C1", metrics.get("rms_ch1_peak"), "mV"),
             ("RMS medio C0", metrics.get("rms_ch0_mean"), "mV"),
@@ -1029,11 +1151,33 @@ class SessionAnalysisWindow(QMainWindow):
             self.metrics_table.setItem(row_idx, 1, val_item)
         self.metrics_table.resizeRowsToContents()
 
+    def _populate_repetitions_tab(self, dataset: SessionDataset) -> None:
+        repetitions = dataset.repetitions()
+        self.repetitions_table.setRowCount(len(repetitions))
+        for row_idx, rep in enumerate(repetitions):
+            values = [
+                str(rep.number),
+                f"{rep.start_time:.2f}",
+                f"{rep.duration:.2f}",
+                f"{rep.rom:.1f}",
+                f"{rep.angle_min:.1f}",
+                f"{rep.angle_max:.1f}",
+                f"{rep.peak_velocity:.1f}",
+            ]
+            for col, value in enumerate(values):
+                self.repetitions_table.setItem(row_idx, col, QTableWidgetItem(value))
+        self.repetitions_table.resizeColumnsToContents()
+
     def _populate_fatigue_tab(self, dataset: SessionDataset) -> None:
         self.fatigue_plot.clear()
         channel = getattr(self, "_fatigue_channel", 0)
-        rms = dataset.emg_channel(channel, "rms")
-        t_axis = dataset.time_axis("emg")
+        bounds = dataset.time_bounds("emg") if dataset.has_overview else None
+        if bounds is not None:
+            # Una media por cubeta del overview en lugar de cada muestra
+            t_axis, rms = dataset.overview_series("emg", f"rms_ch{channel}", self.fatigue_plot.width(), *bounds,
+                                                  envelope=False)
+        else:
+            t_axis, rms = self._full_series(dataset, "emg", f"rms_ch{channel}")
         summary_text = "--"
         if rms.size == 0 or t_axis.size == 0:
             info = pg.TextItem("Sin datos EMG para análisis", anchor=(0.5, 0.5), color="w")
@@ -1068,7 +1212,7 @@ class SessionAnalysisWindow(QMainWindow):
             smooth = np.convolve(rms_mv, kernel, mode="same")
         self.fatigue_plot.plot(t_axis, smooth, pen=smooth_pen)
 
-        metrics = dataset.compute_fatigue_metrics(channel)
+        metrics = dataset.fatigue_metrics(channel)
         summary_parts: List[str] = []
         duration = metrics.get("duration")
         if duration is not None:
@@ -1099,8 +1243,13 @@ class SessionAnalysisWindow(QMainWindow):
         signal_mode = getattr(self, "_spectral_signal", "filtered")
         summary_text = "--"
 
-        series = dataset.emg_channel(channel, "rms" if signal_mode == "rms" else signal_mode)
-        times = dataset.time_axis("emg")
+        config = getattr(self, "_analysis_config", {})
+        segment_sec = float(config.get("spectral_segment_sec", 5.0))
+        max_freq = float(config.get("spectral_max_freq", 500.0))
+        bounds = dataset.time_bounds("emg")
+        # Solo se lee el último segmento
+        t_start = bounds[1] - segment_sec if bounds is not None and segment_sec > 0 else -np.inf
+        times, series = dataset.read(f"emg/{signal_mode}_ch{channel}", t_start, np.inf)
         if series.size == 0 or times.size == 0:
             info = pg.TextItem("Sin datos EMG disponibles", anchor=(0.5, 0.5), color="w")
             self.spectral_plot.addItem(info)
@@ -1109,17 +1258,8 @@ class SessionAnalysisWindow(QMainWindow):
             return
 
         limit = min(len(series), len(times))
+        signal = np.asarray(series[:limit], dtype=float)
         times = np.asarray(times[:limit], dtype=float)
-        config = getattr(self, "_analysis_config", {})
-        segment_sec = float(config.get("spectral_segment_sec", 5.0))
-        max_freq = float(config.get("spectral_max_freq", 500.0))
-        if times.size and segment_sec > 0 and (times[-1] - times[0]) > segment_sec:
-            start_time = times[-1] - segment_sec
-            start_idx = int(np.searchsorted(times, start_time))
-        else:
-            start_idx = 0
-        signal = np.asarray(series[start_idx:limit], dtype=float)
-        times = times[start_idx:limit]
         if times.size < 64:
             info = pg.TextItem("Datos insuficientes para FFT", anchor=(0.5, 0.5), color="w")
             self.spectral_plot.addItem(info)
@@ -1222,8 +1362,8 @@ class SessionAnalysisWindow(QMainWindow):
                     self.compare_table.setItem(row_idx, 0, warning)
                     continue
 
-            metrics = ds.compute_basic_metrics()
-            fatigue = ds.compute_fatigue_metrics(0)
+            metrics = ds.basic_metrics()
+            fatigue = ds.fatigue_metrics(0)
             date = str(session_info.metadata.get("date", ""))
             time_start = str(session_info.metadata.get("time_start", ""))
             date_display = f"{date} {time_start}".strip() or "--"
@@ -1318,6 +1458,8 @@ class SessionAnalysisWindow(QMainWindow):
         gyro_y = dataset.imu_series("gyro_y")
         gyro_z = dataset.imu_series("gyro_z")
         velocity = dataset.derived_series("velocity")
+        acceleration = dataset.derived_series("acceleration")
+        rom_instant = dataset.derived_series("rom")
 
         columns = [
             ("time_emg", arr_to_list(t_emg)),
@@ -1334,6 +1476,8 @@ class SessionAnalysisWindow(QMainWindow):
             ("gyro_y_dps", arr_to_list(gyro_y)),
             ("gyro_z_dps", arr_to_list(gyro_z)),
             ("angular_velocity_dps", arr_to_list(velocity)),
+            ("angular_acceleration_dps2", arr_to_list(acceleration)),
+            ("rom_instant_deg", arr_to_list(rom_instant)),
         ]
 
         try:
@@ -1380,6 +1524,8 @@ class SessionAnalysisWindow(QMainWindow):
             "gyro_y_dps": dataset.imu_series("gyro_y"),
             "gyro_z_dps": dataset.imu_series("gyro_z"),
             "angular_velocity_dps": dataset.derived_series("velocity"),
+            "angular_acceleration_dps2": dataset.derived_series("acceleration"),
+            "rom_instant_deg": dataset.derived_series("rom"),
             "metadata_json": np.array([json.dumps(dataset.metadata, ensure_ascii=False)], dtype=object),
         }
 
@@ -1503,7 +1649,7 @@ class SessionAnalysisWindow(QMainWindow):
         dataset = self._current_dataset_or_warn("Exportar métricas")
         if not dataset:
             return
-        metrics = dataset.compute_basic_metrics()
+        metrics = dataset.basic_metrics()
         fmt = fmt.lower()
         if fmt == "json":
             default_path = cfg.PROJECT_ROOT / "metrics.json"
@@ -1574,8 +1720,8 @@ class SessionAnalysisWindow(QMainWindow):
         if not save_path:
             return
 
-        metrics = dataset.compute_basic_metrics()
-        fatigue = dataset.compute_fatigue_metrics(self._fatigue_channel)
+        metrics = dataset.basic_metrics()
+        fatigue = dataset.fatigue_metrics(self._fatigue_channel)
         spectral_channel = self._spectral_channel
         spectral_mode = self._spectral_signal
 
@@ -0,0 +1,99 @@
+"""Overlay de diagnóstico de rendimiento para las ventanas de adquisición."""
+from __future__ import annotations
+
+import time
+from typing import Callable, Optional, Tuple
+
+from PyQt6.QtCore import Qt, QTimer
+from PyQt6.QtGui import QFont, QKeySequence, QShortcut
+from PyQt6.QtWidgets import QLabel, QWidget
+
+from config import settings as cfg
+from core.diagnostics import DiagnosticsCounters
+
+
+class DiagnosticsOverlay(QLabel):
+    """Panel flotante con los contadores de ``DiagnosticsCounters`` (F3 lo muestra u oculta).
+
+    Mientras está oculto no hay temporizadores activos: solo los contadores
+    de la ventana siguen sumando. Al mostrarse mide además el retraso del
+    bucle de eventos con un temporizador de sondeo.
+    """
+
+    REFRESH_MS = 500
+    LAG_PROBE_MS = 100
+
+    def __init__(self, parent: QWidget, counters: DiagnosticsCounters,
+                 sources: Callable[[], Tuple[object, object]]) -> None:
+        super().__init__(parent)
+        self.counters = counters
+        # Devuelve (decodificador, grabador) actuales; cualquiera puede ser None
+        self._sources = sources
+        self.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents)
+        self.setStyleSheet(
+            "background-color: rgba(20, 21, 22, 210); color: #D9E4E4;"
+            " border: 1px solid #3A3F44; border-radius: 4px; padding: 6px;"
+        )
+        self.setFont(QFont("Consolas", 9))
+
+        self._refresh_timer = QTimer(self)
+        self._refresh_timer.setInterval(self.REFRESH_MS)
+        self._refresh_timer.timeout.connect(self._refresh)
+
+        self._probe_timer = QTimer(self)
+        self._probe_timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self._probe_timer.setInterval(self.LAG_PROBE_MS)
+        self._probe_timer.timeout.connect(self._on_probe)
+        self._last_probe: Optional[float] = None
+
+        self._shortcut = QShortcut(QKeySequence("F3"), parent.window())
+        self._shortcut.activated.connect(self.toggle)
+        self.setVisible(bool(cfg.DIAGNOSTICS_OVERLAY))
+
+    def toggle(self) -> None:
+        self.setVisible(not self.isVisible())
+
+    def showEvent(self, event) -> None:  # pragma: no cover - UI lifecycle hook
+        self._last_probe = None
+        self.counters.event_lag.reset()
+        self._probe_timer.start()
+        self._refresh_timer.start()
+        self._refresh()
+        super().showEvent(event)
+
+    def hideEvent(self, event) -> None:  # pragma: no cover - UI lifecycle hook
+        self._probe_timer.stop()
+        self._refresh_timer.stop()
+        super().hideEvent(event)
+
+    def _on_probe(self) -> None:
+        now = time.perf_counter()
+        if self._last_probe is not None:
+            lag_ms = (now - self._last_probe) * 1000.0 - self.LAG_PROBE_MS
+            self.counters.event_lag.add(max(0.0, lag_ms))
+        self._last_probe = now
+
+    def _refresh(self) -> None:
+        decoder, recorder = self._sources()
+        values = self.counters.snapshot(decoder, recorder)
+
+        def fmt(key: str, pattern: str, scale: float = 1.0) -> str:
+            value = values.get(key)
+            return "--" if value is None else pattern.format(value * scale)
+
+        lines = [
+            f"Refresco:     {fmt('refresh_ms', '{:.1f}')} ms (pico {fmt('refresh_peak_ms', '{:.1f}')})",
+            f"Frames/ref.:  {fmt('frames_per_refresh', '{:.0f}')}",
+            f"Lag eventos:  {fmt('event_lag_ms', '{:.1f}')} ms (pico {fmt('event_lag_peak_ms', '{:.1f}')})",
+            f"DSP/bloque:   {fmt('dsp_ms', '{:.2f}')} ms",
+            f"Frames OK:    {fmt('frames_decoded', '{:.0f}')}",
+            f"CRC/huecos:   {fmt('crc_errors', '{:.0f}')} / {fmt('sequence_gaps', '{:.0f}')}",
+            f"Serial:       {fmt('serial_bytes_per_sec', '{:.1f}', 1 / 1024)} KB/s",
+            f"Grabador:     {fmt('recorder_bytes', '{:.1f}', 1 / (1024 * 1024))} MB",
+        ]
+        self.setText("\n".join(lines))
+        self.adjustSize()
+        parent = self.parentWidget()
+        if parent is not None:
+            self.move(max(0, parent.width() - self.width() - 12), 12)
+        self.raise_()
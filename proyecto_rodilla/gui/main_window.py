@@ -6,6 +6,8 @@ from PyQt6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout,
 from PyQt6.QtCore import Qt, QTimer
 from PyQt6.QtGui import QFont
 
+from core import shared_writer
+
 
 class MainWindow(QMainWindow):
     """Ventana principal del sistema de evaluación de rodilla."""
@@ -294,6 +296,8 @@ class MainWindow(QMainWindow):
             self.data_analysis_window.close()
         if self.settings_window and self.settings_window.isVisible():
             self.settings_window.close()
+        # Terminar de escribir las sesiones pendientes antes de salir
+        shared_writer().stop()
         
         event.accept()
 
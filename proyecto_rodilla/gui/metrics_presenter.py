@@ -0,0 +1,62 @@
+"""Refresco de etiquetas de métricas en vivo desacoplado de la adquisición."""
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from PyQt6.QtCore import QObject, QTimer
+from PyQt6.QtWidgets import QLabel
+
+from config import settings as cfg
+
+
+class MetricsPresenter(QObject):
+    """Actualiza etiquetas a partir del último valor de cada métrica, con un temporizador.
+
+    La adquisición solo guarda valores en atributos de la ventana; cada
+    métrica se registra con ``bind`` junto a una función que lee su valor
+    actual (``None`` si aún no hay dato) y otra que lo formatea. En cada tick
+    se formatea únicamente lo que cambió y se omite ``setText`` si el texto
+    resultante es el mismo que ya muestra la etiqueta.
+    """
+
+    def __init__(self, parent: Optional[QObject] = None, refresh_hz: Optional[float] = None) -> None:
+        super().__init__(parent)
+        self._bindings: Dict[str, Tuple[QLabel, Callable[[], Any], Callable[[Any], str]]] = {}
+        self._values: Dict[str, Any] = {}
+        self._texts: Dict[str, str] = {}
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.refresh)
+        self.set_rate(refresh_hz if refresh_hz is not None else cfg.METRICS_REFRESH_HZ)
+
+    def set_rate(self, refresh_hz: float) -> None:
+        """Cambia la frecuencia máxima de refresco (Hz)."""
+        self.timer.setInterval(int(1000 / max(1.0, float(refresh_hz))))
+
+    def start(self) -> None:
+        self.timer.start()
+
+    def stop(self) -> None:
+        self.timer.stop()
+
+    def bind(self, key: str, label: QLabel, source: Callable[[], Any], formatter: Callable[[Any], str]) -> None:
+        """Asocia una etiqueta a la métrica ``key``."""
+        self._bindings[key] = (label, source, formatter)
+        self._values.pop(key, None)
+        self._texts[key] = label.text()
+
+    def refresh(self, *keys: str, force: bool = False) -> None:
+        """Reescribe las etiquetas cuyo valor cambió (todas si no se indican ``keys``).
+
+        ``force`` vuelve a formatear aunque el valor sea el mismo, p. ej. cuando
+        cambia la normalización MVC que usa el formateador.
+        """
+        for key in keys or tuple(self._bindings):
+            label, source, formatter = self._bindings[key]
+            value = source()
+            if value is None or (not force and key in self._values and self._values[key] == value):
+                continue
+            self._values[key] = value
+            text = formatter(value)
+            if text != self._texts.get(key):
+                label.setText(text)
+                self._texts[key] = text
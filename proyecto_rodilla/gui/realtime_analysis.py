@@ -2,6 +2,7 @@
 Módulo de análisis en tiempo real: EMG + IMU + Ángulo de flexión
 """
 import sys
+import time
 import numpy as np
 from typing import Optional, Dict, Tuple
 import pyqtgraph as pg
@@ -21,13 +22,14 @@ from PyQt6.QtWidgets import (
 )
 from PyQt6.QtGui import QFont
 
-from core import SerialReaderThread, get_available_ports, EMGProcessor, AngleCalculator
+from core import get_available_ports, shared_engine, ProcessedBatch, RepetitionDetector, MinMaxDecimator, MultiRateDecimator, RingBuffer, HistoryPyramid, StreamingSpectrogram, CoContractionAccumulator, FrameRateController, DiagnosticsCounters
 from config import settings as cfg
 from utils import save_json, load_json
 from .settings_window import SettingsWindow
 from .calibration_dialog import CalibrationDialog
 from .rom_dialog import ROMDialog
 from .emg_normalization_dialog import EMGNormalizationDialog
+from .diagnostics_overlay import DiagnosticsOverlay
 
 
 class ClickableMetricLabel(QLabel):
@@ -52,53 +54,74 @@ class RealtimeAnalysisWindow(QMainWindow):
         self.setMinimumSize(1200, 800)
         
         # Estados
-        self.serial_thread: Optional[SerialReaderThread] = None
         self.is_connected = False
         self.settings_window: Optional[SettingsWindow] = None
         
-        # Procesadores
-        self.emg_ch0_processor = EMGProcessor()
-        self.emg_ch1_processor = EMGProcessor()
-        self.angle_calculator = AngleCalculator()
+        # Puerto, procesamiento, calibración y MVC compartidos con las demás vistas
+        self.engine = shared_engine()
+        self.engine.mvc_changed.connect(self._on_mvc_changed)
         
-        # Buffers (arrays numpy pre-alocados)
+        # Buffers circulares espejados (lecturas contiguas sin copia)
         emg_buffer = cfg.EMG_BUFFER_SIZE
         imu_buffer = cfg.IMU_BUFFER_SIZE
-        self.time_emg_ch0 = np.zeros(emg_buffer, dtype=np.float64)
-        self.data_emg_ch0 = np.zeros(emg_buffer, dtype=np.float64)
-        self.data_rms_ch0 = np.zeros(emg_buffer, dtype=np.float64)
-        
-        self.time_emg_ch1 = np.zeros(emg_buffer, dtype=np.float64)
-        self.data_emg_ch1 = np.zeros(emg_buffer, dtype=np.float64)
-        self.data_rms_ch1 = np.zeros(emg_buffer, dtype=np.float64)
-        
-        self.time_imu = np.zeros(imu_buffer, dtype=np.float64)
-        self.data_angle = np.zeros(imu_buffer, dtype=np.float64)
-        
-        # Índices circulares
-        self.idx_emg_ch0 = 0
-        self.idx_emg_ch1 = 0
-        self.idx_imu = 0
-        
-        # Tiempo de referencia
-        self.t0_emg: Optional[float] = None
-        self.t0_imu: Optional[float] = None
+        self.emg_ring = RingBuffer(emg_buffer, ("time", "filtered_ch0", "filtered_ch1", "rms_ch0", "rms_ch1"))
+        self.imu_ring = RingBuffer(imu_buffer, ("time", "angle"))
+
+        # Decimación multi-tasa de filtrada/RMS (niveles 1×, 1/4, 1/16)
+        self.emg_decimator = MultiRateDecimator()
+        self.rms_plot_level = self.emg_decimator.level_for(cfg.PLOT_RMS_DECIMATION)
+        self._undecimated_emg = 0
+        rms_buffer = max(1, emg_buffer // self.emg_decimator.rates[self.rms_plot_level])
+        self.rms_ring = RingBuffer(rms_buffer, ("time", "rms_ch0", "rms_ch1"))
+
+        # Reducción min/máx por píxel para las curvas EMG filtradas
+        self._plot_columns = 0
+        self.emg_minmax = MinMaxDecimator(cfg.WINDOW_TIME_SEC / 1000, channels=2, capacity_buckets=1024)
+
+        # Historial para revisar hacia atrás (muestras recientes + niveles min/máx/media)
+        history_sec = cfg.HISTORY_DURATION_MIN * 60
+        self.emg_history = HistoryPyramid(("filtered_ch0", "filtered_ch1", "rms_ch0", "rms_ch1"),
+                                          cfg.EMG_FS, cfg.HISTORY_FULL_RES_SEC, history_sec)
+        self.imu_history = HistoryPyramid(("angle",), cfg.IMU_FS, cfg.HISTORY_FULL_RES_SEC, history_sec)
+        # Rango X fijado por el usuario al desplazar/zoom; None = seguir en vivo
+        self._history_range: Optional[Tuple[float, float]] = None
+
+        # Espectrograma de la señal filtrada (solo se calcula con el panel activo)
+        nfft = int(cfg.SPECTROGRAM_NFFT)
+        self.spectrogram = StreamingSpectrogram(
+            cfg.EMG_FS, channels=2, nfft=nfft, hop=nfft // 4,
+            columns=int(cfg.WINDOW_TIME_SEC * cfg.EMG_FS / (nfft // 4)) + 2,
+            max_freq=cfg.EMG_LOWPASS_CUTOFF,
+        )
+        self._spectrogram_enabled = False
+        self._spectrogram_dirty = False
+
+        # Conteo de repeticiones en vivo
+        self.rep_detector = RepetitionDetector()
+
+        # Intervalo y calidad de dibujo adaptados al costo de cada refresco
+        self.frame_rate = FrameRateController(max_quality_level=2)
+        self._base_rms_level = self.rms_plot_level
+        self.diagnostics = DiagnosticsCounters()
         
         # Tiempo actual
         self.current_time_emg = 0.0
         self.current_time_imu = 0.0
         
         # Ángulo crudo actual (para calibración)
-        self.current_raw_angle = self.angle_calculator.last_uncalibrated_angle
+        self.current_raw_angle = self.engine.current_raw_angle
         self.current_angle = 0.0
         self.current_rom_value: Optional[float] = None
         self._rom_in_progress = False
 
         # EMG
         self.current_rms_values: Dict[int, float] = {0: 0.0, 1: 0.0}
-        self.mvc_values: Dict[int, Optional[float]] = {0: None, 1: None}
+        self.mvc_values: Dict[int, Optional[float]] = self.engine.mvc_values
         self._last_rom_measurements: Optional[tuple[float, float]] = None
         self.cocontraction_value: Optional[float] = None
+        # Las MVC pueden venir ya fijadas desde otra vista del motor
+        self.cocontraction = CoContractionAccumulator(cfg.WINDOW_TIME_SEC, self.mvc_values.get(0),
+                                                      self.mvc_values.get(1))
         
         # Estadísticas
         self.emg_count = 0
@@ -108,6 +131,8 @@ class RealtimeAnalysisWindow(QMainWindow):
         # UI
         self._create_ui()
         
+        self.btn_spectrogram.setChecked(bool(cfg.SPECTROGRAM_PANEL))
+        
         # Timer de actualización
         self.update_timer = QTimer()
         self.update_timer.timeout.connect(self._update_plots)
@@ -167,6 +192,33 @@ class RealtimeAnalysisWindow(QMainWindow):
         self.curve_angle = self.plot_angle.plot(pen=pg.mkPen(color=cfg.COLOR_ANGLE, width=2))
         
         main_layout.addWidget(self.plot_angle)
+
+        # Espectrogramas EMG
+        self.spectrogram_panel = QWidget()
+        spectrogram_layout = QHBoxLayout(self.spectrogram_panel)
+        spectrogram_layout.setContentsMargins(0, 0, 0, 0)
+        self.spectrogram_plots = []
+        self.spectrogram_images = []
+        for title in ('Espectrograma CH0 (Cuadríceps)', 'Espectrograma CH1 (Isquiotibiales)'):
+            plot = pg.PlotWidget(title=title)
+            plot.setLabel('left', 'Frecuencia', units='Hz')
+            plot.setLabel('bottom', 'Tiempo', units='s')
+            plot.setMouseEnabled(x=False, y=False)
+            plot.setYRange(0, float(self.spectrogram.freqs[-1]), padding=0)
+            image = pg.ImageItem(axisOrder='col-major')
+            image.setColorMap(pg.colormap.get('viridis'))
+            plot.addItem(image)
+            spectrogram_layout.addWidget(plot)
+            self.spectrogram_plots.append(plot)
+            self.spectrogram_images.append(image)
+        main_layout.addWidget(self.spectrogram_panel)
+        self.spectrogram_panel.setVisible(False)
+
+        # Arrastrar o hacer zoom en cualquier gráfica pasa a revisar el historial
+        for plot in (self.plot_ch0, self.plot_ch1, self.plot_angle):
+            plot.getViewBox().sigRangeChangedManually.connect(
+                lambda _mask, plot=plot: self._on_plot_range_changed_manually(plot)
+            )
         
         # ========== PANEL DE MÉTRICAS ==========
         metrics_layout = QHBoxLayout()
@@ -196,6 +248,11 @@ class RealtimeAnalysisWindow(QMainWindow):
         self.label_rom.setToolTip("Haz clic para medir el rango de movimiento (ROM).")
         metrics_layout.addWidget(self.label_rom)
         self._update_rom_display()
+
+        # Repeticiones
+        self.label_reps = self._create_metric_label("Reps: 0", cfg.COLOR_ANGLE)
+        self.label_reps.setToolTip("Repeticiones de flexo-extensión detectadas en la sesión actual.")
+        metrics_layout.addWidget(self.label_reps)
         
         main_layout.addLayout(metrics_layout)
         
@@ -204,6 +261,14 @@ class RealtimeAnalysisWindow(QMainWindow):
         self.stats_label = QLabel("EMG: 0 sps | IMU: 0 sps")
         self.statusBar().addWidget(self.status_label)
         self.statusBar().addPermanentWidget(self.stats_label)
+        self.stats_label.setToolTip("F3: diagnóstico de rendimiento")
+
+        # ========== DIAGNÓSTICO (F3) ==========
+        self.diagnostics_overlay = DiagnosticsOverlay(
+            central_widget,
+            self.diagnostics,
+            lambda: (self.engine.decoder, None),
+        )
     
     def _create_toolbar(self, parent_layout):
         """Crea el toolbar de control."""
@@ -256,6 +321,20 @@ class RealtimeAnalysisWindow(QMainWindow):
         btn_clear.clicked.connect(self._clear_buffers)
         toolbar_layout.addWidget(btn_clear)
 
+        self.btn_spectrogram = QPushButton("Espectrograma")
+        self.btn_spectrogram.setProperty("category", "secondary")
+        self.btn_spectrogram.setCheckable(True)
+        self.btn_spectrogram.setToolTip("Mostrar la STFT en vivo de cada canal EMG")
+        self.btn_spectrogram.toggled.connect(self._set_spectrogram_enabled)
+        toolbar_layout.addWidget(self.btn_spectrogram)
+
+        self.btn_live = QPushButton("⏵ En vivo")
+        self.btn_live.setProperty("category", "secondary")
+        self.btn_live.setEnabled(False)
+        self.btn_live.setToolTip("Volver a seguir la señal en vivo (arrastra o usa la rueda sobre una gráfica para revisar el historial)")
+        self.btn_live.clicked.connect(self._resume_live_view)
+        toolbar_layout.addWidget(self.btn_live)
+
         toolbar_layout.addStretch(1)
 
         self.btn_settings = QPushButton("⚙️ Configuración")
@@ -369,11 +448,8 @@ class RealtimeAnalysisWindow(QMainWindow):
     def _toggle_connection(self):
         """Conecta o desconecta del puerto serial."""
         if self.is_connected:
-            # Desconectar
-            if self.serial_thread:
-                self.serial_thread.stop()
-                self.serial_thread.wait()
-                self.serial_thread = None
+            # Desconectar (el puerto sigue abierto si otra vista lo usa)
+            self._detach_engine()
             
             self.is_connected = False
             self.btn_connect.setText("Conectar")
@@ -389,10 +465,23 @@ class RealtimeAnalysisWindow(QMainWindow):
             
             self._clear_buffers()
             
-            self.serial_thread = SerialReaderThread(port)
-            self.serial_thread.frame_received.connect(self._on_frame_received)
-            self.serial_thread.connection_status.connect(self._on_connection_status)
-            self.serial_thread.start()
+            if not self.engine.acquire(self, port):
+                QMessageBox.warning(self, "Error", f"El puerto {self.engine.port} ya está en uso por otra vista")
+                return
+            self.engine.batch_ready.connect(self._on_batch_received)
+            self.engine.connection_status.connect(self._on_connection_status)
+            if self.engine.is_connected:
+                self._on_connection_status(True, self.engine.status_message)
+
+    def _detach_engine(self):
+        """Deja de recibir lotes y libera el puerto compartido."""
+        for signal, slot in ((self.engine.batch_ready, self._on_batch_received),
+                             (self.engine.connection_status, self._on_connection_status)):
+            try:
+                signal.disconnect(slot)
+            except TypeError:
+                pass
+        self.engine.release(self)
     
     def _on_connection_status(self, connected: bool, message: str):
         """Maneja cambios en el estado de conexión."""
@@ -408,6 +497,7 @@ class RealtimeAnalysisWindow(QMainWindow):
             self.btn_calibrate.setEnabled(True)
             self.btn_normalize.setEnabled(True)
         else:
+            self._detach_engine()
             self.is_connected = False
             self.btn_connect.setText("Conectar")
             self.btn_connect.setProperty("state", "disconnected")
@@ -417,55 +507,36 @@ class RealtimeAnalysisWindow(QMainWindow):
             self.btn_calibrate.setEnabled(False)
             self.btn_normalize.setEnabled(False)
     
-    def _on_frame_received(self, frame: Dict):
-        """Procesa un frame recibido."""
-        if frame['type'] == 'EMG':
-            if self.t0_emg is None:
-                self.t0_emg = frame['timestamp_us']
-            
-            t_sec = (frame['timestamp_us'] - self.t0_emg) / 1e6
-            self.current_time_emg = t_sec
+    def _on_batch_received(self, batch: ProcessedBatch):
+        """Agrega un lote ya procesado por el motor de adquisición."""
+        started = time.perf_counter()
+        emg = batch.emg
+        if len(emg):
+            self.current_time_emg = float(emg.time[-1])
+            self.emg_ring.extend(np.vstack((emg.time, emg.filtered, emg.rms)))
+            self._undecimated_emg += len(emg)
+            self.current_rms_values[0] = float(emg.rms[0, -1])
+            self.current_rms_values[1] = float(emg.rms[1, -1])
             
-            # Procesar Canal 0
-            filtered_ch0, rms_ch0 = self.emg_ch0_processor.process_sample(frame['ch0'])
-            self.time_emg_ch0[self.idx_emg_ch0] = t_sec
-            self.data_emg_ch0[self.idx_emg_ch0] = filtered_ch0
-            self.data_rms_ch0[self.idx_emg_ch0] = rms_ch0
-            self.idx_emg_ch0 = (self.idx_emg_ch0 + 1) % cfg.EMG_BUFFER_SIZE
-            self.current_rms_values[0] = rms_ch0
-            
-            # Procesar Canal 1
-            filtered_ch1, rms_ch1 = self.emg_ch1_processor.process_sample(frame['ch1'])
-            self.time_emg_ch1[self.idx_emg_ch1] = t_sec
-            self.data_emg_ch1[self.idx_emg_ch1] = filtered_ch1
-            self.data_rms_ch1[self.idx_emg_ch1] = rms_ch1
-            self.idx_emg_ch1 = (self.idx_emg_ch1 + 1) % cfg.EMG_BUFFER_SIZE
-            self.current_rms_values[1] = rms_ch1
-            
-            self.emg_count += 1
+            self.emg_count += len(emg)
         
-        elif frame['type'] == 'IMU':
-            if self.t0_imu is None:
-                self.t0_imu = frame['timestamp_us']
-            
-            t_sec = (frame['timestamp_us'] - self.t0_imu) / 1e6
-            self.current_time_imu = t_sec
-            
-            # Calcular ángulo
-            angle = self.angle_calculator.update(
-                frame['ax'], frame['ay'], frame['az'],
-                frame['gx'], frame['gy'], frame['gz'],
-                frame['timestamp_us']
-            )
+        imu = batch.imu
+        if len(imu):
+            self.current_time_imu = float(imu.time[-1])
+            self.current_raw_angle = self.engine.current_raw_angle
+            self.current_angle = float(imu.angle[-1])
             
-            self.current_raw_angle = self.angle_calculator.last_uncalibrated_angle
-            self.current_angle = angle
-            
-            self.time_imu[self.idx_imu] = t_sec
-            self.data_angle[self.idx_imu] = angle
-            self.idx_imu = (self.idx_imu + 1) % cfg.IMU_BUFFER_SIZE
+            self.imu_ring.extend(np.vstack((imu.time, imu.angle)))
+            self.imu_history.extend(imu.time, imu.angle)
+
+            for angle, t_sec in zip(imu.angle.tolist(), imu.time.tolist()):
+                repetition = self.rep_detector.update(angle, t_sec)
+                if repetition is not None:
+                    self._update_reps_label(repetition)
             
-            self.imu_count += 1
+            self.imu_count += len(imu)
+
+        self.diagnostics.add_frames(len(batch), batch.dsp_sec + time.perf_counter() - started)
         
         # Actualizar estadísticas cada segundo
         current_time = QTime.currentTime()
@@ -480,72 +551,192 @@ class RealtimeAnalysisWindow(QMainWindow):
             self.imu_count = 0
             self.last_stats_update = current_time
     
+    def _sync_minmax_resolution(self) -> bool:
+        """Ajusta los intervalos min/máx al ancho en píxeles de la gráfica EMG (True si se reconstruyó)."""
+        # Cada nivel de calidad reducido divide a la mitad las columnas min/máx
+        columns = max(100, int(self.plot_ch0.getPlotItem().getViewBox().width())) >> self.frame_rate.quality_level
+        if columns == self._plot_columns:
+            return False
+        self._plot_columns = columns
+        capacity = columns + 2
+        if self.emg_minmax.output.capacity != 2 * capacity:
+            self.emg_minmax = MinMaxDecimator(cfg.WINDOW_TIME_SEC / columns, channels=2, capacity_buckets=capacity)
+        else:
+            self.emg_minmax.reset(cfg.WINDOW_TIME_SEC / columns)
+        # Reconstruir con lo que ya hay en el buffer
+        data = self.emg_ring.view()
+        self.emg_minmax.process(data[0], data[1:3])
+        return True
+
+    def _flush_emg_stages(self):
+        """Pasa las muestras EMG nuevas por el decimador multi-tasa, el reductor min/máx y la co-contracción."""
+        rebuilt = self._sync_minmax_resolution()
+        if self._undecimated_emg == 0:
+            return
+        self.frame_rate.observe_stream(self.current_time_emg)
+        block = self.emg_ring.latest(self._undecimated_emg)
+        self._undecimated_emg = 0
+        if not rebuilt:
+            self.emg_minmax.process(block[0], block[1:3])
+        self.cocontraction.update_block(block[0], block[3], block[4])
+        self.emg_history.extend(block[0], block[1:])
+        if self._spectrogram_enabled and self.spectrogram.process(block[0], block[1:3]):
+            self._spectrogram_dirty = True
+        levels = self.emg_decimator.process(block[0], block[1:])
+        times, data = levels[self.rms_plot_level]
+        if times.size:
+            self.rms_ring.extend(np.vstack((times, data[2], data[3])))
+
     def _update_plots(self):
         """Actualiza las gráficas."""
-        # ===== EMG CH0 =====
-        if self.idx_emg_ch0 > 0:
-            x_max = self.current_time_emg
-            x_min = max(0, x_max - cfg.WINDOW_TIME_SEC)
-            
-            t_data = np.roll(self.time_emg_ch0, -self.idx_emg_ch0)
-            y_data = np.roll(self.data_emg_ch0, -self.idx_emg_ch0)
-            rms_data = np.roll(self.data_rms_ch0, -self.idx_emg_ch0)
-            
-            mask = (t_data >= x_min) & (t_data <= x_max) & (t_data > 0)
-            
-            self.curve_ch0.setData(t_data[mask], y_data[mask])
-            self.curve_rms_ch0.setData(t_data[mask], rms_data[mask])
-            self.plot_ch0.setXRange(x_min, x_max, padding=0)
-            
-            # Actualizar métrica RMS
-            if np.any(mask):
-                current_rms = rms_data[mask][-1] if mask.sum() > 0 else 0.0
-                self.current_rms_values[0] = current_rms
-                self.label_rms_ch0.setText(self._format_rms_label(0, current_rms))
-        
-        # ===== EMG CH1 =====
-        if self.idx_emg_ch1 > 0:
+        self.frame_rate.begin()
+        flush_started = time.perf_counter()
+        self._flush_emg_stages()
+        self.diagnostics.add_dsp(time.perf_counter() - flush_started)
+
+        # ===== EMG (ambos canales comparten eje temporal) =====
+        if len(self.emg_ring):
             x_max = self.current_time_emg
             x_min = max(0, x_max - cfg.WINDOW_TIME_SEC)
-            
-            t_data = np.roll(self.time_emg_ch1, -self.idx_emg_ch1)
-            y_data = np.roll(self.data_emg_ch1, -self.idx_emg_ch1)
-            rms_data = np.roll(self.data_rms_ch1, -self.idx_emg_ch1)
-            
-            mask = (t_data >= x_min) & (t_data <= x_max) & (t_data > 0)
-            
-            self.curve_ch1.setData(t_data[mask], y_data[mask])
-            self.curve_rms_ch1.setData(t_data[mask], rms_data[mask])
-            self.plot_ch1.setXRange(x_min, x_max, padding=0)
-            
-            # Actualizar métrica RMS
-            if np.any(mask):
-                current_rms = rms_data[mask][-1] if mask.sum() > 0 else 0.0
-                self.current_rms_values[1] = current_rms
-                self.label_rms_ch1.setText(self._format_rms_label(1, current_rms))
+            window = self.emg_ring.window(x_min, x_max)
+            rms_window = self.rms_ring.window(x_min, x_max)
+            t_data = window[0]
+
+            if self._history_range is None:
+                # ~2 puntos por píxel salvo que haya menos de dos muestras por intervalo
+                if self.emg_minmax.bucket_sec * cfg.EMG_FS >= 2:
+                    curves = self.emg_minmax.output.window(x_min, x_max)
+                else:
+                    curves = window[:3]
+
+                self.curve_ch0.setData(curves[0], curves[1])
+                self.curve_rms_ch0.setData(rms_window[0], rms_window[1])
+                self.plot_ch0.setXRange(x_min, x_max, padding=0)
+
+                self.curve_ch1.setData(curves[0], curves[2])
+                self.curve_rms_ch1.setData(rms_window[0], rms_window[2])
+                self.plot_ch1.setXRange(x_min, x_max, padding=0)
+
+            # Actualizar métricas RMS
+            if t_data.size:
+                for channel, row in ((0, 3), (1, 4)):
+                    current_rms = float(window[row, -1])
+                    self.current_rms_values[channel] = current_rms
+                    label = self.label_rms_ch0 if channel == 0 else self.label_rms_ch1
+                    label.setText(self._format_rms_label(channel, current_rms))
         
         # ===== ÁNGULO =====
-        if self.idx_imu > 0:
+        if len(self.imu_ring):
             x_max = self.current_time_imu
             x_min = max(0, x_max - cfg.WINDOW_TIME_SEC)
+            window = self.imu_ring.window(x_min, x_max)
             
-            t_data = np.roll(self.time_imu, -self.idx_imu)
-            angle_data = np.roll(self.data_angle, -self.idx_imu)
-            
-            mask = (t_data >= x_min) & (t_data <= x_max) & (t_data > 0)
-            
-            self.curve_angle.setData(t_data[mask], angle_data[mask])
-            self.plot_angle.setXRange(x_min, x_max, padding=0)
+            if self._history_range is None:
+                self.curve_angle.setData(window[0], window[1])
+                self.plot_angle.setXRange(x_min, x_max, padding=0)
             
             # Actualizar métrica de ángulo
-            if np.any(mask):
-                current_angle = angle_data[mask][-1] if mask.sum() > 0 else 0.0
-                status = "✓ Calibrado" if self.angle_calculator.calibrated else "⚠ No calibrado"
+            if window.shape[1]:
+                current_angle = float(window[1, -1])
+                status = "✓ Calibrado" if self.engine.angle_calculator.calibrated else "⚠ No calibrado"
                 self.label_angle.setText(f"Ángulo: {current_angle:.1f}° ({status})")
                 self.current_angle = current_angle
 
+        if self._history_range is not None:
+            self._draw_history()
+        if self._spectrogram_dirty:
+            self._draw_spectrogram()
+
         self._update_cocontraction_metric()
+        if self.frame_rate.end():
+            self._apply_frame_rate()
+        self.diagnostics.close_refresh(self.frame_rate.last_cost_ms)
+
+    def _draw_history(self):
+        """Dibuja el rango elegido por el usuario desde el historial (costo acotado por el ancho en píxeles)."""
+        x_min, x_max = self._history_range
+        columns = max(100, int(self.plot_ch0.getPlotItem().getViewBox().width())) >> self.frame_rate.quality_level
+        self.curve_ch0.setData(*self.emg_history.envelope("filtered_ch0", x_min, x_max, columns))
+        self.curve_ch1.setData(*self.emg_history.envelope("filtered_ch1", x_min, x_max, columns))
+        self.curve_rms_ch0.setData(*self.emg_history.mean("rms_ch0", x_min, x_max, columns))
+        self.curve_rms_ch1.setData(*self.emg_history.mean("rms_ch1", x_min, x_max, columns))
+        self.curve_angle.setData(*self.imu_history.mean("angle", x_min, x_max, columns))
+
+    def _draw_spectrogram(self):
+        """Muestra las columnas vigentes del espectrograma alineadas con la ventana EMG."""
+        self._spectrogram_dirty = False
+        extent = self.spectrogram.extent()
+        if extent is None:
+            return
+        x_max = self.current_time_emg
+        x_min = max(0, x_max - cfg.WINDOW_TIME_SEC)
+        for channel, (plot, item) in enumerate(zip(self.spectrogram_plots, self.spectrogram_images)):
+            image = self.spectrogram.image(channel)
+            # Rango dinámico fijo de 60 dB bajo el pico de la ventana
+            peak = float(image.max())
+            item.setImage(image, autoLevels=False, levels=(peak - 60.0, peak))
+            item.setRect(QtCore.QRectF(*extent))
+            plot.setXRange(x_min, x_max, padding=0)
+
+    def _set_spectrogram_enabled(self, enabled: bool):
+        """Activa el panel; al activarlo se reconstruye con la señal ya recibida."""
+        # Vaciar lo pendiente antes: el siguiente flush no debe volver a sumarlo
+        self._spectrogram_enabled = False
+        self._flush_emg_stages()
+        self.spectrogram.reset()
+        self._spectrogram_enabled = enabled
+        self.spectrogram_panel.setVisible(enabled)
+        if enabled:
+            data = self.emg_ring.view()
+            self._spectrogram_dirty = self.spectrogram.process(data[0], data[1:3]) > 0
+
+    def _on_plot_range_changed_manually(self, plot: pg.PlotWidget):
+        """Pasa a modo historial y sincroniza el eje X de las tres gráficas."""
+        x_min, x_max = plot.getViewBox().viewRange()[0]
+        self._history_range = (x_min, x_max)
+        for other in (self.plot_ch0, self.plot_ch1, self.plot_angle):
+            if other is not plot:
+                other.setXRange(x_min, x_max, padding=0)
+        self.btn_live.setEnabled(True)
+        self._draw_history()
+
+    def _resume_live_view(self):
+        """Vuelve a seguir la señal en vivo con los rangos Y originales."""
+        self._history_range = None
+        self.btn_live.setEnabled(False)
+        self.plot_ch0.setYRange(-1, 1, padding=0.05)
+        self.plot_ch1.setYRange(-1, 1, padding=0.05)
+        self.plot_angle.setYRange(-10, 180, padding=0.05)
+
+    def _apply_frame_rate(self):
+        """Aplica el intervalo y el nivel de decimación elegidos por el control adaptativo."""
+        self.update_timer.setInterval(int(round(self.frame_rate.interval_ms)))
+        level = min(len(self.emg_decimator.rates) - 1, self._base_rms_level + self.frame_rate.quality_level)
+        if level != self.rms_plot_level:
+            self.rms_plot_level = level
+            self._rebuild_rms_ring()
+
+    def _rebuild_rms_ring(self):
+        """Rehace ``rms_ring`` al nivel actual desde ``emg_ring`` (no mezcla muestras de dos niveles)."""
+        self.rms_ring.clear()
+        self.emg_decimator.reset()
+        # Las muestras aún no decimadas entran con el próximo _flush_emg_stages
+        data = self.emg_ring.view()
+        data = data[:, :data.shape[1] - self._undecimated_emg]
+        if data.shape[1] == 0:
+            return
+        times, levels = self.emg_decimator.process(data[0], data[1:])[self.rms_plot_level]
+        if times.size:
+            self.rms_ring.extend(np.vstack((times, levels[2], levels[3])))
     
+    def _update_reps_label(self, repetition):
+        """Muestra el conteo y el resumen de la última repetición."""
+        self.label_reps.setText(f"Reps: {self.rep_detector.count}")
+        self.label_reps.setToolTip(
+            f"Última repetición: ROM {repetition.rom:.1f}° | "
+            f"{repetition.duration:.1f} s | vel. pico {repetition.peak_velocity:.0f}°/s"
+        )
+
     def _format_rms_label(self, channel: int, rms_value: float) -> str:
         """Formatea el texto de RMS considerando la normalización si aplica."""
         text = f"RMS CH{channel}: {rms_value * 1000:.3f} mV"
@@ -568,50 +759,30 @@ class RealtimeAnalysisWindow(QMainWindow):
             self.label_cocontraction.setToolTip(tooltip or "Índice de co-contracción Q/H en la ventana actual.")
 
     def _compute_cocontraction_value(self) -> Tuple[Optional[float], Optional[str]]:
-        mvc0 = self.mvc_values.get(0)
-        mvc1 = self.mvc_values.get(1)
-        if not (mvc0 and mvc0 > 0 and mvc1 and mvc1 > 0):
+        if not self.cocontraction.normalized:
             return None, "Normaliza ambos canales (MVC) para calcular co-contracción."
 
-        if self.idx_emg_ch0 == 0 or self.idx_emg_ch1 == 0:
+        if len(self.emg_ring) == 0:
             return None, "Aún no hay datos EMG suficientes para Q/H."
 
-        x_max = self.current_time_emg
-        x_min = max(0, x_max - cfg.WINDOW_TIME_SEC)
-
-        t0 = np.roll(self.time_emg_ch0, -self.idx_emg_ch0)
-        t1 = np.roll(self.time_emg_ch1, -self.idx_emg_ch1)
-        r0 = np.roll(self.data_rms_ch0, -self.idx_emg_ch0)
-        r1 = np.roll(self.data_rms_ch1, -self.idx_emg_ch1)
-
-        mask0 = (t0 >= x_min) & (t0 <= x_max) & (t0 > 0)
-        mask1 = (t1 >= x_min) & (t1 <= x_max) & (t1 > 0)
-        mask = mask0 & mask1
-
-        if not np.any(mask):
-            return None, "Aún no hay ventana EMG suficiente para Q/H."
-
-        t_vals = t0[mask]
-        if t_vals.size < 2:
+        if self.cocontraction.segments == 0:
             return None, "Aún no hay ventana EMG suficiente para Q/H."
 
-        order = np.argsort(t_vals)
-        t_vals = t_vals[order]
-        s0 = np.abs(r0[mask])[order] / mvc0
-        s1 = np.abs(r1[mask])[order] / mvc1
-
-        envelope = np.maximum(s0, s1)
-        overlap = np.minimum(s0, s1)
-
-        denom = float(np.trapezoid(envelope, t_vals))
-        if denom <= 0:
+        ci = self.cocontraction.value
+        if ci is None:
             return None, "Actividad EMG insuficiente para Q/H."
-
-        num = float(np.trapezoid(overlap, t_vals))
-        ci = (num / denom) * 100.0
-        ci = max(0.0, min(100.0, ci))
         return ci, "Índice de co-contracción calculado sobre la ventana EMG activa."
 
+    def _rebuild_cocontraction(self) -> None:
+        """Reinicia el acumulador Q/H con las MVC actuales y la ventana ya recibida."""
+        # Vaciar lo pendiente antes: el siguiente flush no debe volver a sumarlo
+        self._flush_emg_stages()
+        self.cocontraction.set_mvc(self.mvc_values.get(0), self.mvc_values.get(1))
+        if len(self.emg_ring):
+            x_max = self.current_time_emg
+            window = self.emg_ring.window(max(0, x_max - cfg.WINDOW_TIME_SEC), x_max)
+            self.cocontraction.update_block(window[0], window[3], window[4])
+
     def _update_cocontraction_metric(self) -> None:
         value, tooltip = self._compute_cocontraction_value()
         self.cocontraction_value = value
@@ -646,7 +817,7 @@ class RealtimeAnalysisWindow(QMainWindow):
 
     def _open_rom_dialog(self) -> None:
         """Arranca la rutina de medición de ROM."""
-        if self.idx_imu == 0:
+        if len(self.imu_ring) == 0:
             QMessageBox.information(
                 self,
                 "Sin datos IMU",
@@ -663,20 +834,16 @@ class RealtimeAnalysisWindow(QMainWindow):
         self._rom_in_progress = True
         self._update_rom_display()
 
-        update_timer = QTimer(self)
-
-        def push_angle():
-            if dialog.isVisible():
-                dialog.set_current_angle(self.current_angle)
-            else:
-                update_timer.stop()
-
-        update_timer.setInterval(100)
-        update_timer.timeout.connect(push_angle)
-        update_timer.start()
+        def push_angles(batch: ProcessedBatch):
+            # Extremos del lote primero: el diálogo busca mínimo y máximo
+            if len(batch.imu):
+                angles = batch.imu.angle
+                for angle in (angles.min(), angles.max(), angles[-1]):
+                    dialog.set_current_angle(float(angle))
 
+        self.engine.batch_ready.connect(push_angles)
         result = dialog.exec()
-        update_timer.stop()
+        self.engine.batch_ready.disconnect(push_angles)
 
         self._rom_in_progress = False
 
@@ -699,7 +866,7 @@ class RealtimeAnalysisWindow(QMainWindow):
 
     def _open_emg_normalization(self) -> None:
         """Abre el diálogo para capturar MVC y normalizar EMG."""
-        if self.idx_emg_ch0 == 0 and self.idx_emg_ch1 == 0:
+        if len(self.emg_ring) == 0:
             QMessageBox.information(
                 self,
                 "Sin datos EMG",
@@ -709,64 +876,60 @@ class RealtimeAnalysisWindow(QMainWindow):
         dialog = EMGNormalizationDialog(dict(self.mvc_values), self)
         dialog.mvc_computed.connect(self._on_mvc_computed)
 
-        update_timer = QTimer(self)
-
-        def push_rms():
-            if dialog.isVisible():
-                dialog.set_current_rms(
-                    self.current_rms_values.get(0, 0.0),
-                    self.current_rms_values.get(1, 0.0),
-                )
-            else:
-                update_timer.stop()
+        def push_rms(batch: ProcessedBatch):
+            # El diálogo se queda con el máximo: basta el pico de cada lote
+            if len(batch.emg):
+                peaks = np.max(np.abs(batch.emg.rms), axis=1)
+                dialog.set_current_rms(float(peaks[0]), float(peaks[1]))
 
-        update_timer.setInterval(100)
-        update_timer.timeout.connect(push_rms)
-        update_timer.start()
+        self.engine.batch_ready.connect(push_rms)
         dialog.exec()
-        update_timer.stop()
+        self.engine.batch_ready.disconnect(push_rms)
 
     def _on_mvc_computed(self, channel: int, value: float) -> None:
-        """Actualiza el factor de normalización MVC para un canal."""
-        self.mvc_values[channel] = value
+        """Guarda la MVC en el motor compartido (la ven todas las vistas)."""
+        self.engine.set_mvc(channel, value)
+        self.statusBar().showMessage(
+            f"MVC canal {channel}: {value * 1000:.3f} mV", 5000
+        )
+
+    def _on_mvc_changed(self, channel: int, value: float) -> None:
+        """Actualiza la normalización MVC de un canal."""
         current_rms = self.current_rms_values.get(channel, 0.0)
         if channel == 0:
             self.label_rms_ch0.setText(self._format_rms_label(channel, current_rms))
         else:
             self.label_rms_ch1.setText(self._format_rms_label(channel, current_rms))
-        self.statusBar().showMessage(
-            f"MVC canal {channel}: {value * 1000:.3f} mV", 5000
-        )
+        self._rebuild_cocontraction()
         self._update_cocontraction_metric()
 
     def _clear_buffers(self):
         """Limpia todos los buffers."""
-        self.time_emg_ch0.fill(0)
-        self.data_emg_ch0.fill(0)
-        self.data_rms_ch0.fill(0)
-        
-        self.time_emg_ch1.fill(0)
-        self.data_emg_ch1.fill(0)
-        self.data_rms_ch1.fill(0)
-        
-        self.time_imu.fill(0)
-        self.data_angle.fill(0)
-        
-        self.idx_emg_ch0 = 0
-        self.idx_emg_ch1 = 0
-        self.idx_imu = 0
-        
-        self.t0_emg = None
-        self.t0_imu = None
+        self.emg_ring.clear()
+        self.imu_ring.clear()
+        self.rms_ring.clear()
+        self.emg_decimator.reset()
+        self.emg_minmax.reset()
+        self._plot_columns = 0
+        self._undecimated_emg = 0
+        self.cocontraction.reset()
+        self.emg_history.reset()
+        self.imu_history.reset()
+        self.spectrogram.reset()
+        for image in self.spectrogram_images:
+            image.clear()
+        self._resume_live_view()
+        self.frame_rate.reset()
+        self._apply_frame_rate()
+        
+        self.rep_detector.reset()
+        self.label_reps.setText("Reps: 0")
         
         self.current_time_emg = 0.0
         self.current_time_imu = 0.0
         
-        # Resetear procesadores
-        self.emg_ch0_processor.reset()
-        self.emg_ch1_processor.reset()
-        self.angle_calculator.reset()
-        self.current_raw_angle = self.angle_calculator.last_uncalibrated_angle
+        # Filtros, ángulo y línea de tiempo viven en el motor compartido
+        self.current_raw_angle = self.engine.current_raw_angle
         self.current_angle = 0.0
         self.current_rms_values[0] = 0.0
         self.current_rms_values[1] = 0.0
@@ -778,35 +941,21 @@ class RealtimeAnalysisWindow(QMainWindow):
         """Abre el diálogo de calibración."""
         dialog = CalibrationDialog(self)
         
-        # Actualizar ángulo crudo en tiempo real dentro del diálogo
-        def update_angle_in_dialog():
-            if dialog.isVisible():
-                dialog.set_current_angle(self.current_raw_angle)
-        
-        timer = QTimer()
-        timer.timeout.connect(update_angle_in_dialog)
-        timer.start(100)  # Actualizar cada 100 ms
+        # Actualizar ángulo crudo dentro del diálogo con cada lote IMU
+        def update_angle_in_dialog(batch: ProcessedBatch):
+            if len(batch.imu):
+                dialog.set_current_angle(self.engine.current_raw_angle)
         
+        self.engine.batch_ready.connect(update_angle_in_dialog)
         result = dialog.exec()
-        timer.stop()
+        self.engine.batch_ready.disconnect(update_angle_in_dialog)
         
         if result == QDialog.DialogCode.Accepted and dialog.calibration_done:
             calib_data = dialog.get_calibration_data()
             
-            # Aplicar calibración
-            if calib_data['mode'] == 1:
-                if calib_data.get('angle_raw_point1') is not None:
-                    raw_point = float(calib_data['angle_raw_point1'])
-                    self.angle_calculator.angle = raw_point
-                    self.angle_calculator.last_uncalibrated_angle = raw_point
-                self.angle_calculator.calibrate_one_point(calib_data['angle_ref_point1'])
-            else:
-                self.angle_calculator.calibrate_two_points(
-                    calib_data['angle_raw_point1'], calib_data['angle_ref_point1'],
-                    calib_data['angle_raw_point2'], calib_data['angle_ref_point2']
-                )
-
-            self.current_raw_angle = self.angle_calculator.last_uncalibrated_angle
+            # Aplicar calibración (compartida con las demás vistas)
+            self.engine.apply_calibration(calib_data)
+            self.current_raw_angle = self.engine.current_raw_angle
             
             QMessageBox.information(
                 self,
@@ -845,9 +994,11 @@ class RealtimeAnalysisWindow(QMainWindow):
     
     def closeEvent(self, event):
         """Maneja el cierre de la ventana."""
-        if self.serial_thread and self.serial_thread.isRunning():
-            self.serial_thread.stop()
-            self.serial_thread.wait()
+        self._detach_engine()
+        try:
+            self.engine.mvc_changed.disconnect(self._on_mvc_changed)
+        except TypeError:
+            pass
         if self.settings_window and self.settings_window.isVisible():
             self.settings_window.close()
         self.settings_window = None
@@ -1,7 +1,7 @@
 """Ventana de grabación de sesión EMG/IMU."""
 from __future__ import annotations
 
-import shutil
+import time
 from datetime import datetime
 from enum import Enum, auto
 from typing import Dict, List, Optional
@@ -34,11 +34,13 @@ from PyQt6.QtWidgets import (
 )
 
 from config import settings as cfg
-from core import AngleCalculator, EMGProcessor, SerialReaderThread, get_available_ports
+from core import DerivedSignalStage, DiagnosticsCounters, FrameRateController, ProcessedBatch, RepetitionDetector, RingBuffer, get_available_ports, shared_engine, shared_writer
 from core.session_recorder import EventMarker, SessionRecorder
 from utils import load_json, save_json
 from .calibration_dialog import CalibrationDialog
 from .emg_normalization_dialog import EMGNormalizationDialog
+from .diagnostics_overlay import DiagnosticsOverlay
+from .metrics_presenter import MetricsPresenter
 
 
 class RecordingState(Enum):
@@ -59,44 +61,47 @@ class SessionRecordingWindow(QMainWindow):
         self.setWindowState(QtCore.Qt.WindowState.WindowMaximized)
         self.setMinimumSize(1200, 820)
 
-        self.serial_thread: Optional[SerialReaderThread] = None
         self.is_connected = False
         self.recording_state = RecordingState.IDLE
         self.current_session_id: Optional[str] = None
 
-        self.emg_ch0_processor = EMGProcessor()
-        self.emg_ch1_processor = EMGProcessor()
-        self.angle_calculator = AngleCalculator()
+        # Puerto, procesamiento, calibración y MVC compartidos con las demás vistas
+        self.engine = shared_engine()
+        self.engine.mvc_changed.connect(self._on_mvc_changed)
 
-        self.mvc_values: Dict[int, Optional[float]] = {0: None, 1: None}
+        self.mvc_values: Dict[int, Optional[float]] = self.engine.mvc_values
         self.session_recorder: Optional[SessionRecorder] = None
         self.pending_countdown = 3
 
+        # Las sesiones se escriben en segundo plano; aquí se siguen las que aún se están guardando
+        self.writer = shared_writer()
+        self.writer.progress.connect(self._on_write_progress)
+        self.writer.session_saved.connect(self._on_session_saved)
+        self.writer.failed.connect(self._on_write_failed)
+        self._saving_sessions: Dict[str, str] = {}
+        self._write_errors: set = set()
+
         buffer_len_emg = int(cfg.EMG_FS * cfg.WINDOW_TIME_SEC)
         buffer_len_imu = int(cfg.IMU_FS * cfg.WINDOW_TIME_SEC)
-        self.time_emg_ch0 = np.zeros(buffer_len_emg, dtype=np.float64)
-        self.data_rms_ch0 = np.zeros(buffer_len_emg, dtype=np.float64)
-        self.data_emg_ch0 = np.zeros(buffer_len_emg, dtype=np.float64)
-        self.time_emg_ch1 = np.zeros(buffer_len_emg, dtype=np.float64)
-        self.data_rms_ch1 = np.zeros(buffer_len_emg, dtype=np.float64)
-        self.data_emg_ch1 = np.zeros(buffer_len_emg, dtype=np.float64)
-        self.time_imu = np.zeros(buffer_len_imu, dtype=np.float64)
-        self.data_angle = np.zeros(buffer_len_imu, dtype=np.float64)
-
-        self.idx_emg_ch0 = 0
-        self.idx_emg_ch1 = 0
-        self.idx_imu = 0
+        self.emg_ring = RingBuffer(buffer_len_emg, ("time", "filtered_ch0", "filtered_ch1", "rms_ch0", "rms_ch1"))
+        self.imu_ring = RingBuffer(buffer_len_imu, ("time", "angle"))
+
         self.current_time_emg = 0.0
         self.current_time_imu = 0.0
-        self.t0_emg: Optional[int] = None
-        self.t0_imu: Optional[int] = None
+        self.rep_detector = RepetitionDetector()
+        # Velocidad, aceleración, ROM instantáneo y marcadores de repetición que se graban en "derived"
+        self.derived_stage = DerivedSignalStage(detector=self.rep_detector)
+        # Sin niveles de calidad: aquí solo se adapta el intervalo de la vista previa
+        self.frame_rate = FrameRateController(max_quality_level=0)
+        self._plotted_time_emg = 0.0
+        self.diagnostics = DiagnosticsCounters()
 
         self.event_counter = 0
         self.last_stats_update = QtCore.QTime.currentTime()
         self.emg_count = 0
         self.imu_count = 0
         self.last_angle = 0.0
-        self.current_raw_angle = 0.0
+        self.current_raw_angle = self.engine.current_raw_angle
         self.current_rms_values = {0: 0.0, 1: 0.0}
         self._record_wallclock_start = None  # type: Optional[datetime]
         self._loading_patient_ids = False
@@ -104,6 +109,26 @@ class SessionRecordingWindow(QMainWindow):
         self._build_ui()
         self._load_patient_profiles()
 
+        self.metrics = MetricsPresenter(self)
+        self.metrics.bind("rms_ch0", self.label_rms_ch0,
+                          lambda: self.current_rms_values[0] if len(self.emg_ring) else None,
+                          lambda value: self._format_rms_label(0, value))
+        self.metrics.bind("rms_ch1", self.label_rms_ch1,
+                          lambda: self.current_rms_values[1] if len(self.emg_ring) else None,
+                          lambda value: self._format_rms_label(1, value))
+        self.metrics.bind("angle", self.label_angle,
+                          lambda: self.last_angle if len(self.imu_ring) else None,
+                          lambda value: f"Ángulo: {value:.1f}°")
+        self.metrics.bind("reps", self.label_reps, lambda: self.rep_detector.count, lambda value: f"Reps: {value}")
+        self.metrics.start()
+
+        self.diagnostics_overlay = DiagnosticsOverlay(
+            self.centralWidget(),
+            self.diagnostics,
+            lambda: (self.engine.decoder, self.session_recorder),
+        )
+        self.label_frames.setToolTip("F3: diagnóstico de rendimiento")
+
         self.preview_timer = QTimer(self)
         self.preview_timer.setInterval(int(1000 / max(1, cfg.UPDATE_FPS)))
         self.preview_timer.timeout.connect(self._update_plots)
@@ -331,11 +356,13 @@ class SessionRecordingWindow(QMainWindow):
         self.label_rms_ch0 = QLabel("RMS CH0: -- mV")
         self.label_rms_ch1 = QLabel("RMS CH1: -- mV")
         self.label_angle = QLabel("Ángulo: --°")
-        for lbl in (self.label_rms_ch0, self.label_rms_ch1, self.label_angle):
+        self.label_reps = QLabel("Reps: 0")
+        for lbl in (self.label_rms_ch0, self.label_rms_ch1, self.label_angle, self.label_reps):
             lbl.setStyleSheet("color: #D9E4E4")
         indicators_row.addWidget(self.label_rms_ch0)
         indicators_row.addWidget(self.label_rms_ch1)
         indicators_row.addWidget(self.label_angle)
+        indicators_row.addWidget(self.label_reps)
         indicators_row.addStretch(1)
         preview_layout.addLayout(indicators_row)
 
@@ -375,6 +402,7 @@ class SessionRecordingWindow(QMainWindow):
         self.label_data_rate = QLabel("Tasa: 0 KB/s")
         self.label_frames = QLabel("Frames EMG/IMU: 0 / 0")
         self.label_events = QLabel("Eventos: 0")
+        self.label_saving = QLabel("")
 
         for lbl in (
             self.label_status,
@@ -383,6 +411,7 @@ class SessionRecordingWindow(QMainWindow):
             self.label_data_rate,
             self.label_frames,
             self.label_events,
+            self.label_saving,
         ):
             lbl.setStyleSheet("color: #D9E4E4")
             status_layout.addWidget(lbl)
@@ -499,17 +528,30 @@ class SessionRecordingWindow(QMainWindow):
         if not port_device:
             QMessageBox.warning(self, "Conexión", "Selecciona un puerto serial disponible.")
             return
-        self.serial_thread = SerialReaderThread(port_device)
-        self.serial_thread.frame_received.connect(self._on_frame_received)
-        self.serial_thread.connection_status.connect(self._on_connection_status)
-        self.serial_thread.start()
-        self.btn_toggle_connection.setEnabled(False)
+        self.frame_rate.reset()
+        self.preview_timer.setInterval(int(round(self.frame_rate.interval_ms)))
+        if not self.engine.acquire(self, port_device):
+            QMessageBox.warning(self, "Conexión", f"El puerto {self.engine.port} ya está en uso por otra vista.")
+            return
+        self.engine.batch_ready.connect(self._on_batch_received)
+        self.engine.connection_status.connect(self._on_connection_status)
+        if self.engine.is_connected:
+            self._on_connection_status(True, self.engine.status_message)
+        else:
+            self.btn_toggle_connection.setEnabled(False)
+
+    def _detach_engine(self) -> None:
+        """Deja de recibir lotes y libera el puerto compartido."""
+        for signal, slot in ((self.engine.batch_ready, self._on_batch_received),
+                             (self.engine.connection_status, self._on_connection_status)):
+            try:
+                signal.disconnect(slot)
+            except TypeError:
+                pass
+        self.engine.release(self)
 
     def _disconnect_serial(self) -> None:
-        if self.serial_thread:
-            self.serial_thread.stop()
-            self.serial_thread.wait(2000)
-            self.serial_thread = None
+        self._detach_engine()
         self.is_connected = False
         self.btn_toggle_connection.setText("Conectar")
         self.label_status.setText("Estado: Desconectado")
@@ -521,114 +563,71 @@ class SessionRecordingWindow(QMainWindow):
             self.btn_toggle_connection.setText("Desconectar")
             self.btn_toggle_connection.setEnabled(True)
         else:
+            self._detach_engine()
             self.btn_toggle_connection.setText("Conectar")
             self.btn_toggle_connection.setEnabled(True)
 
     # ------------------------------------------------------------------
     # Frame processing
     # ------------------------------------------------------------------
-    def _on_frame_received(self, frame: Dict) -> None:
-        if frame["type"] == "EMG":
-            if self.t0_emg is None:
-                self.t0_emg = frame["timestamp_us"]
-            t_sec = (frame["timestamp_us"] - self.t0_emg) / 1e6
-            self.current_time_emg = t_sec
-
-            filtered_ch0, rms_ch0 = self.emg_ch0_processor.process_sample(frame["ch0"])
-            filtered_ch1, rms_ch1 = self.emg_ch1_processor.process_sample(frame["ch1"])
-
-            self.time_emg_ch0[self.idx_emg_ch0] = t_sec
-            self.data_emg_ch0[self.idx_emg_ch0] = filtered_ch0
-            self.data_rms_ch0[self.idx_emg_ch0] = rms_ch0
-            self.idx_emg_ch0 = (self.idx_emg_ch0 + 1) % len(self.time_emg_ch0)
-
-            self.time_emg_ch1[self.idx_emg_ch1] = t_sec
-            self.data_emg_ch1[self.idx_emg_ch1] = filtered_ch1
-            self.data_rms_ch1[self.idx_emg_ch1] = rms_ch1
-            self.idx_emg_ch1 = (self.idx_emg_ch1 + 1) % len(self.time_emg_ch1)
-
-            self.label_rms_ch0.setText(self._format_rms_label(0, rms_ch0))
-            self.label_rms_ch1.setText(self._format_rms_label(1, rms_ch1))
-            self.current_rms_values[0] = float(rms_ch0)
-            self.current_rms_values[1] = float(rms_ch1)
-
-            if self.recording_state == RecordingState.RECORDING and self.session_recorder:
-                self.session_recorder.record_emg(
-                    frame["timestamp_us"],
-                    frame.get("seq", 0),
-                    frame["ch0"],
-                    frame["ch1"],
-                    filtered_ch0,
-                    filtered_ch1,
-                    rms_ch0,
-                    rms_ch1,
-                )
-
-            self.emg_count += 1
-
-        elif frame["type"] == "IMU":
-            if self.t0_imu is None:
-                self.t0_imu = frame["timestamp_us"]
-            t_sec = (frame["timestamp_us"] - self.t0_imu) / 1e6
-            self.current_time_imu = t_sec
-
-            angle = self.angle_calculator.update(
-                frame["ax"], frame["ay"], frame["az"],
-                frame["gx"], frame["gy"], frame["gz"],
-                frame["timestamp_us"],
-            )
-            self.last_angle = angle
-            self.current_raw_angle = float(self.angle_calculator.last_uncalibrated_angle)
-
-            self.time_imu[self.idx_imu] = t_sec
-            self.data_angle[self.idx_imu] = angle
-            self.idx_imu = (self.idx_imu + 1) % len(self.time_imu)
-            self.label_angle.setText(f"Ángulo: {angle:.1f}°")
-
-            if self.recording_state == RecordingState.RECORDING and self.session_recorder:
-                self.session_recorder.record_imu(
-                    frame["timestamp_us"],
-                    frame.get("seq", 0),
-                    frame["ax"],
-                    frame["ay"],
-                    frame["az"],
-                    frame["gx"],
-                    frame["gy"],
-                    frame["gz"],
-                    angle,
-                )
-
-            self.imu_count += 1
+    def _on_batch_received(self, batch: ProcessedBatch) -> None:
+        started = time.perf_counter()
+        recording = self.recording_state == RecordingState.RECORDING and self.session_recorder is not None
+        emg = batch.emg
+        if len(emg):
+            self.current_time_emg = float(emg.time[-1])
+            self.emg_ring.extend(np.vstack((emg.time, emg.filtered, emg.rms)))
+            self.current_rms_values[0] = float(emg.rms[0, -1])
+            self.current_rms_values[1] = float(emg.rms[1, -1])
 
-        self._update_stats_rate()
+            if recording:
+                self.session_recorder.record_emg_block(emg.timestamps_us, emg.sequence, emg.raw, emg.filtered, emg.rms,
+                                                       emg.counts)
+
+            self.emg_count += len(emg)
+
+        imu = batch.imu
+        if len(imu):
+            self.current_time_imu = float(imu.time[-1])
+            self.last_angle = float(imu.angle[-1])
+            self.current_raw_angle = self.engine.current_raw_angle
+
+            self.imu_ring.extend(np.vstack((imu.time, imu.angle)))
+
+            if recording:
+                self.session_recorder.record_imu_block(imu.timestamps_us, imu.sequence, imu.accel, imu.gyro, imu.angle,
+                                                       imu.counts)
+                rom, velocity, acceleration, markers = self.derived_stage.process(imu.time, imu.angle)
+                self.session_recorder.record_derived_block(imu.timestamps_us, rom, velocity, acceleration, markers)
+
+            self.imu_count += len(imu)
+
+        self.diagnostics.add_frames(len(batch), batch.dsp_sec + time.perf_counter() - started)
 
     def _update_plots(self) -> None:
+        self.frame_rate.begin()
         window = cfg.WINDOW_TIME_SEC
-        if self.idx_emg_ch0 > 0:
-            t_data = np.roll(self.time_emg_ch0, -self.idx_emg_ch0)
-            y_data = np.roll(self.data_emg_ch0, -self.idx_emg_ch0)
-            rms_data = np.roll(self.data_rms_ch0, -self.idx_emg_ch0)
-            mask = (t_data >= self.current_time_emg - window) & (t_data <= self.current_time_emg)
-            self.curve_ch0.setData(t_data[mask], y_data[mask])
-            self.curve_rms_ch0.setData(t_data[mask], rms_data[mask])
+        if self.current_time_emg != self._plotted_time_emg:
+            self.frame_rate.observe_stream(self.current_time_emg)
+            self._plotted_time_emg = self.current_time_emg
+        if len(self.emg_ring):
+            data = self.emg_ring.window(self.current_time_emg - window, self.current_time_emg)
+            self.curve_ch0.setData(data[0], data[1])
+            self.curve_rms_ch0.setData(data[0], data[3])
             self.plot_ch0.setXRange(max(0, self.current_time_emg - window), self.current_time_emg, padding=0)
-
-        if self.idx_emg_ch1 > 0:
-            t_data = np.roll(self.time_emg_ch1, -self.idx_emg_ch1)
-            y_data = np.roll(self.data_emg_ch1, -self.idx_emg_ch1)
-            rms_data = np.roll(self.data_rms_ch1, -self.idx_emg_ch1)
-            mask = (t_data >= self.current_time_emg - window) & (t_data <= self.current_time_emg)
-            self.curve_ch1.setData(t_data[mask], y_data[mask])
-            self.curve_rms_ch1.setData(t_data[mask], rms_data[mask])
+            self.curve_ch1.setData(data[0], data[2])
+            self.curve_rms_ch1.setData(data[0], data[4])
             self.plot_ch1.setXRange(max(0, self.current_time_emg - window), self.current_time_emg, padding=0)
 
-        if self.idx_imu > 0:
-            t_data = np.roll(self.time_imu, -self.idx_imu)
-            angle_data = np.roll(self.data_angle, -self.idx_imu)
-            mask = (t_data >= self.current_time_imu - window) & (t_data <= self.current_time_imu)
-            self.curve_angle.setData(t_data[mask], angle_data[mask])
+        if len(self.imu_ring):
+            data = self.imu_ring.window(self.current_time_imu - window, self.current_time_imu)
+            self.curve_angle.setData(data[0], data[1])
             self.plot_angle.setXRange(max(0, self.current_time_imu - window), self.current_time_imu, padding=0)
 
+        if self.frame_rate.end():
+            self.preview_timer.setInterval(int(round(self.frame_rate.interval_ms)))
+        self.diagnostics.close_refresh(self.frame_rate.last_cost_ms)
+
     def _update_stats_rate(self) -> None:
         current_time = QtCore.QTime.currentTime()
         elapsed = self.last_stats_update.msecsTo(current_time)
@@ -653,7 +652,7 @@ class SessionRecordingWindow(QMainWindow):
         if not self.is_connected:
             QMessageBox.warning(self, "Grabación", "Conecta el dispositivo antes de grabar.")
             return
-        if not self.angle_calculator.calibrated:
+        if not self.engine.angle_calculator.calibrated:
             if QMessageBox.question(self, "Calibración", "¿Deseas calibrar el IMU antes de grabar?", QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No) == QMessageBox.StandardButton.Yes:
                 self._open_calibration()
                 return
@@ -670,7 +669,8 @@ class SessionRecordingWindow(QMainWindow):
         session_number = self.input_session_number.value()
         timestamp = datetime.now()
         self.current_session_id = f"session_{session_number:03d}_{timestamp.strftime('%Y%m%d_%H%M%S')}"
-        self.session_recorder = SessionRecorder(patient_id, session_number, self.current_session_id)
+        self.session_recorder = SessionRecorder(patient_id, session_number, self.current_session_id,
+                                                writer_thread=self.writer)
 
     def _start_countdown(self) -> None:
         self.recording_state = RecordingState.COUNTDOWN
@@ -695,9 +695,10 @@ class SessionRecordingWindow(QMainWindow):
         self.btn_pause.setEnabled(True)
         self.btn_stop.setEnabled(True)
         self.btn_record.setEnabled(False)
-        if self.session_recorder:
-            self.session_recorder.start(emg_start_us=self.t0_emg, imu_start_us=self.t0_imu)
         self._record_wallclock_start = datetime.now()
+        if self.session_recorder:
+            self.session_recorder.start(emg_start_us=self.engine.t0_emg_us, imu_start_us=self.engine.t0_imu_us,
+                                        metadata=self._collect_metadata())
 
     def _on_pause_clicked(self) -> None:
         if self.recording_state != RecordingState.RECORDING:
@@ -720,9 +721,8 @@ class SessionRecordingWindow(QMainWindow):
 
     def _reset_session(self) -> None:
         if self.session_recorder:
-            session_dir = self.session_recorder.session_dir
-            if session_dir.exists() and not any(session_dir.iterdir()):
-                shutil.rmtree(session_dir, ignore_errors=True)
+            # Tras finalize no queda nada que borrar; si no, se eliminan el archivo y la carpeta vacía
+            self.session_recorder.discard()
         self.recording_state = RecordingState.IDLE
         self.label_status.setText("Estado: Inactivo")
         self.btn_record.setEnabled(True)
@@ -734,6 +734,8 @@ class SessionRecordingWindow(QMainWindow):
         self.events_list.clear()
         self.event_counter = 0
         self.label_events.setText("Eventos: 0")
+        self.derived_stage.reset()
+        self.metrics.refresh("reps")
         self.label_timer.setText("Tiempo: 00:00")
         self.label_file_size.setText("Archivo: 0.0 MB")
         self.label_data_rate.setText("Tasa: 0 KB/s")
@@ -746,7 +748,15 @@ class SessionRecordingWindow(QMainWindow):
         metadata = self._collect_metadata()
         calibration = self._collect_calibration_snapshot()
         notes = self.notes_field.toPlainText()
-        paths = self.session_recorder.finalize(metadata, calibration, notes)
+        recorder = self.session_recorder
+        if recorder.finalize_async(metadata, calibration, notes):
+            # El hilo de escritura se queda con el grabador; la ventana queda libre para otra sesión
+            self._saving_sessions[recorder.session_id] = str(recorder.session_dir)
+            self.session_recorder = None
+            self._reset_session()
+            self._refresh_saving_label()
+            return
+        paths = recorder.finalize(metadata, calibration, notes)
         QMessageBox.information(
             self,
             "Sesión guardada",
@@ -754,6 +764,44 @@ class SessionRecordingWindow(QMainWindow):
         )
         self._reset_session()
 
+    # ------------------------------------------------------------------
+    # Background writing
+    # ------------------------------------------------------------------
+    def _refresh_saving_label(self, progress: str = "") -> None:
+        pending = len(self._saving_sessions)
+        if not pending:
+            self.label_saving.setText("")
+            return
+        text = f"Guardando: {pending} sesión(es)"
+        self.label_saving.setText(f"{text} {progress}".rstrip())
+
+    def _on_write_progress(self, session_id: str, done: int, total: int) -> None:
+        if session_id in self._saving_sessions:
+            self._refresh_saving_label(f"({done}/{total})")
+
+    def _on_session_saved(self, session_id: str, paths: Dict[str, object]) -> None:
+        if self._saving_sessions.pop(session_id, None) is None:
+            return
+        self._write_errors.discard(session_id)
+        self._refresh_saving_label()
+        self.label_status.setText(f"Estado: Sesión guardada en {paths['data']}")
+
+    def _on_write_failed(self, session_id: str, message: str) -> None:
+        session_dir = self._saving_sessions.pop(session_id, None)
+        self._refresh_saving_label()
+        if session_dir is None:
+            # Bloque de la grabación en curso: un solo aviso por sesión, los siguientes fallan igual
+            if self.session_recorder is None or session_id != self.current_session_id or session_id in self._write_errors:
+                return
+            self._write_errors.add(session_id)
+            session_dir = str(self.session_recorder.session_dir)
+        QMessageBox.warning(
+            self,
+            "Error al guardar",
+            f"No se pudo escribir la sesión {session_id}:\n{message}\n\n"
+            f"Los archivos ya escritos se conservan en:\n{session_dir}",
+        )
+
     # ------------------------------------------------------------------
     # Metadata helpers
     # ------------------------------------------------------------------
@@ -820,9 +868,9 @@ class SessionRecordingWindow(QMainWindow):
     def _collect_calibration_snapshot(self) -> Dict[str, object]:
         return {
             "imu_calibration": {
-                "calibrated": self.angle_calculator.calibrated,
-                "offset": getattr(self.angle_calculator, "offset", 0.0),
-                "scale": getattr(self.angle_calculator, "scale", 1.0),
+                "calibrated": self.engine.angle_calculator.calibrated,
+                "offset": getattr(self.engine.angle_calculator, "offset", 0.0),
+                "scale": getattr(self.engine.angle_calculator, "scale", 1.0),
             },
             "emg_calibration": {
                 "mvc_ch0": self.mvc_values.get(0),
@@ -839,7 +887,7 @@ class SessionRecordingWindow(QMainWindow):
             return
         if not self.session_recorder:
             return
-        timestamp_us = int((self.t0_emg or 0) + self.session_recorder.emg_sample_count * 1e6 / max(1, cfg.EMG_FS))
+        timestamp_us = int((self.engine.t0_emg_us or 0) + self.session_recorder.emg_sample_count * 1e6 / max(1, cfg.EMG_FS))
         timestamp_sec = self.session_recorder.elapsed_seconds()
         event_type = self.event_type_combo.currentText()
         description = self.custom_event_input.text().strip() if event_type == "Personalizado" else event_type
@@ -870,6 +918,8 @@ class SessionRecordingWindow(QMainWindow):
         if ok:
             event.description = new_desc
             current_item.setText(f"#{self.events_list.row(current_item)+1:02d} | {event.timestamp_relative_sec:05.2f}s | {event.description}")
+            # Mismos objetos que tiene el grabador; se reenvían para que el journal guarde la edición
+            self.session_recorder.set_events(self._listed_events())
 
     def _on_remove_event(self) -> None:
         current_row = self.events_list.currentRow()
@@ -879,19 +929,23 @@ class SessionRecordingWindow(QMainWindow):
             return
         self.events_list.takeItem(current_row)
         if self.session_recorder:
-            # Simple rebuild of event list from QListWidget
-            events: List[EventMarker] = []
-            for idx in range(self.events_list.count()):
-                item = self.events_list.item(idx)
-                evt = item.data(QtCore.Qt.ItemDataRole.UserRole)
-                events.append(evt)
-            self.session_recorder._events = events  # Internal reassignment
+            self.session_recorder.set_events(self._listed_events())
         self.label_events.setText(f"Eventos: {self.events_list.count()}")
 
+    def _listed_events(self) -> List[EventMarker]:
+        """Simple rebuild of event list from QListWidget."""
+        events: List[EventMarker] = []
+        for idx in range(self.events_list.count()):
+            item = self.events_list.item(idx)
+            evt = item.data(QtCore.Qt.ItemDataRole.UserRole)
+            events.append(evt)
+        return events
+
     # ------------------------------------------------------------------
     # Status bar calculations
     # ------------------------------------------------------------------
     def _update_status_bar(self) -> None:
+        self._update_stats_rate()
         if self.recording_state == RecordingState.RECORDING and self.session_recorder:
             elapsed = self.session_recorder.elapsed_seconds()
             mins = int(elapsed // 60)
@@ -915,19 +969,14 @@ class SessionRecordingWindow(QMainWindow):
             return
 
         dialog = CalibrationDialog(self)
-        angle_timer = QTimer(self)
 
-        def push_angle() -> None:
-            if dialog.isVisible():
-                dialog.set_current_angle(self.current_raw_angle)
-            else:
-                angle_timer.stop()
+        def push_angle(batch: ProcessedBatch) -> None:
+            if len(batch.imu):
+                dialog.set_current_angle(self.engine.current_raw_angle)
 
-        angle_timer.setInterval(100)
-        angle_timer.timeout.connect(push_angle)
-        angle_timer.start()
+        self.engine.batch_ready.connect(push_angle)
         result = dialog.exec()
-        angle_timer.stop()
+        self.engine.batch_ready.disconnect(push_angle)
 
         if result != QDialog.DialogCode.Accepted or not getattr(dialog, "calibration_done", False):
             return
@@ -936,27 +985,15 @@ class SessionRecordingWindow(QMainWindow):
         if not calib_data:
             return
 
-        mode = calib_data.get("mode")
-        if mode == 1:
-            raw_point = calib_data.get("angle_raw_point1")
-            if raw_point is not None:
-                self.angle_calculator.angle = float(raw_point)
-                self.angle_calculator.last_uncalibrated_angle = float(raw_point)
-            self.angle_calculator.calibrate_one_point(float(calib_data.get("angle_ref_point1", 0.0)))
-        elif mode == 2:
-            self.angle_calculator.calibrate_two_points(
-                float(calib_data.get("angle_raw_point1", 0.0)),
-                float(calib_data.get("angle_ref_point1", 0.0)),
-                float(calib_data.get("angle_raw_point2", 90.0)),
-                float(calib_data.get("angle_ref_point2", 90.0)),
-            )
+        if not self.engine.apply_calibration(calib_data):
+            return
 
-        self.current_raw_angle = float(self.angle_calculator.last_uncalibrated_angle)
+        self.current_raw_angle = self.engine.current_raw_angle
         try:
-            self.last_angle = float(self.angle_calculator.angle)
+            self.last_angle = float(self.engine.angle_calculator.angle)
         except AttributeError:
             pass
-        self.label_angle.setText(f"Ángulo: {self.last_angle:.1f}°")
+        self.metrics.refresh("angle", force=True)
 
         QMessageBox.information(
             self,
@@ -965,7 +1002,7 @@ class SessionRecordingWindow(QMainWindow):
         )
 
     def _open_emg_normalization(self) -> None:
-        if self.idx_emg_ch0 == 0 and self.idx_emg_ch1 == 0:
+        if len(self.emg_ring) == 0:
             QMessageBox.information(
                 self,
                 "Sin datos EMG",
@@ -975,36 +1012,28 @@ class SessionRecordingWindow(QMainWindow):
         dialog = EMGNormalizationDialog(dict(self.mvc_values), self)
         dialog.mvc_computed.connect(self._on_mvc_computed)
 
-        rms_timer = QTimer(self)
-
-        def push_rms(force: bool = False) -> None:
-            if not dialog.isVisible() and not force:
-                return
-            dialog.set_current_rms(
-                self.current_rms_values.get(0, 0.0),
-                self.current_rms_values.get(1, 0.0),
-            )
+        def push_rms(batch: ProcessedBatch) -> None:
+            # El diálogo se queda con el máximo: basta el pico de cada lote
+            if len(batch.emg):
+                peaks = np.max(np.abs(batch.emg.rms), axis=1)
+                dialog.set_current_rms(float(peaks[0]), float(peaks[1]))
 
-        rms_timer.setInterval(100)
-        rms_timer.timeout.connect(push_rms)
-        rms_timer.start()
-        push_rms(True)
+        dialog.set_current_rms(self.current_rms_values.get(0, 0.0), self.current_rms_values.get(1, 0.0))
+        self.engine.batch_ready.connect(push_rms)
         dialog.exec()
-        rms_timer.stop()
+        self.engine.batch_ready.disconnect(push_rms)
 
     def _on_mvc_computed(self, channel: int, value: float) -> None:
-        self.mvc_values[channel] = value
-        current_rms = self.current_rms_values.get(channel, 0.0)
-        if channel == 0:
-            self.label_rms_ch0.setText(self._format_rms_label(channel, current_rms))
-        else:
-            self.label_rms_ch1.setText(self._format_rms_label(channel, current_rms))
+        self.engine.set_mvc(channel, value)
         QMessageBox.information(
             self,
             "MVC registrada",
             f"Canal {channel}: {value * 1000:.3f} mV",
         )
 
+    def _on_mvc_changed(self, channel: int, _value: float) -> None:
+        self.metrics.refresh(f"rms_ch{channel}", force=True)
+
     # ------------------------------------------------------------------
     def _format_rms_label(self, channel: int, rms_value: float) -> str:
         text = f"RMS CH{channel}: {rms_value * 1000:.3f} mV"
@@ -1016,7 +1045,18 @@ class SessionRecordingWindow(QMainWindow):
 
     # ------------------------------------------------------------------
     def closeEvent(self, event):  # pragma: no cover - UI lifecycle hook
-        if self.serial_thread:
-            self.serial_thread.stop()
-            self.serial_thread.wait(1500)
+        self._detach_engine()
+        try:
+            self.engine.mvc_changed.disconnect(self._on_mvc_changed)
+        except TypeError:
+            pass
+        for signal, slot in (
+            (self.writer.progress, self._on_write_progress),
+            (self.writer.session_saved, self._on_session_saved),
+            (self.writer.failed, self._on_write_failed),
+        ):
+            try:
+                signal.disconnect(slot)
+            except TypeError:
+                pass
         super().closeEvent(event)
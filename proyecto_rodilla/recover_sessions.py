@@ -0,0 +1,34 @@
+"""
+Recupera sesiones interrumpidas a partir de su journal.bin
+
+Uso:
+    python recover_sessions.py                 # todas las interrumpidas en data/patients
+    python recover_sessions.py <carpeta> ...   # carpetas de sesión concretas
+"""
+import argparse
+from pathlib import Path
+
+from core.session_journal import find_interrupted_sessions, recover_session
+
+
+def main():
+    """Reconstruye raw_data.h5, events.json y metadata.json de cada sesión."""
+    parser = argparse.ArgumentParser(description="Recupera sesiones interrumpidas a partir de journal.bin")
+    parser.add_argument("sessions", nargs="*", type=Path,
+                        help="Carpetas de sesión (por defecto, todas las interrumpidas en data/patients)")
+    args = parser.parse_args()
+    targets = args.sessions or find_interrupted_sessions()
+    if not targets:
+        print("No hay sesiones interrumpidas.")
+    for session_dir in targets:
+        try:
+            summary = recover_session(session_dir)
+        except (OSError, ValueError, RuntimeError, KeyError) as exc:
+            print(f"✗ {session_dir}: {exc}")
+        else:
+            print(f"✓ {session_dir}: {summary['blocks']} bloques, {summary['samples']} muestras,"
+                  f" {summary['bad_records']} registros dañados")
+
+
+if __name__ == '__main__':
+    main()